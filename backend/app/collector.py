@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+클러스터 수집 프로세스 (production 모드)
+노드/파드/이벤트 watch를 이 프로세스 하나만 유지하고 변경된 상태를 스냅샷으로 발행하면
+API 워커들이 같은 스냅샷을 읽어 응답 (워커 수와 무관하게 upstream watch는 한 세트)
+
+실행: python -m app.collector
+"""
+
+import sys
+import os
+import time
+import signal
+import threading
+from collections import deque
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+
+# 기존 스크립트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../"))
+from tools.kube_watch import KubeWatch
+from tools.snapshot_store import SnapshotWriter
+
+from app.core.config import settings
+from app.stores.event_store import event_store
+from app.routers.monitoring import to_monitoring_event
+
+def pick(obj, keys):
+    """obj에 있는 키만 복사 (없는 키는 읽는 쪽 기본값이 적용되도록 생략)"""
+    return {key: obj[key] for key in keys if key in obj}
+
+def slim_pod(pod):
+    """API 응답과 격리 타임라인에 쓰는 필드만 남긴 파드 (스냅샷 크기 축소)"""
+    metadata = pod.get("metadata", {})
+    status = pod.get("status", {})
+    return {
+        "metadata": {
+            **pick(metadata, ("name", "namespace", "uid", "resourceVersion", "creationTimestamp", "deletionTimestamp")),
+            "ownerReferences": [
+                pick(owner, ("kind", "uid", "controller")) for owner in metadata.get("ownerReferences", [])
+            ],
+        },
+        "spec": pick(pod.get("spec", {}), ("nodeName", "readinessGates")),
+        "status": {
+            **pick(status, ("phase", "reason", "podIP", "nominatedNodeName", "conditions")),
+            "containerStatuses": [
+                pick(cs, ("ready", "restartCount")) for cs in status.get("containerStatuses", [])
+            ],
+        },
+    }
+
+def slim_node(node):
+    """노드 응답 필드만 남긴 노드 (이미지 목록 등 제외)"""
+    return {
+        "metadata": pick(node.get("metadata", {}), ("name", "uid", "resourceVersion", "labels", "creationTimestamp")),
+        "spec": pick(node.get("spec", {}), ("unschedulable",)),
+        "status": pick(node.get("status", {}), ("conditions", "addresses", "nodeInfo", "capacity")),
+    }
+
+class ClusterCollector:
+    """클러스터 watch를 소유하고 스냅샷을 발행
+    - nodes, pods: 객체 전체 목록을 변경이 있을 때만 최대 interval초마다 한 번 다시 기록
+      (watch가 다시 연결되면 목록 조회 결과로 교체하여 끊긴 사이 삭제된 객체를 제거)
+    - received_at: 객체별 마지막 watch 수신 시각 (워커의 격리 타임라인이 스냅샷 비교 시 수신 시각으로 사용)
+    - events: 이벤트 스토어에서 순번을 붙인 최근 이벤트를 기록 (워커가 같은 순번으로 SSE/Socket.IO 전송)
+    - collector: 매 주기 상태(pid, 마지막 발행 시각)를 기록해 워커가 수집 프로세스 동작 여부를 확인
+    """
+
+    def __init__(self, directory=settings.SNAPSHOT_DIR, interval=settings.SNAPSHOT_INTERVAL):
+        self.writer = SnapshotWriter(directory)
+        self.interval = interval
+        self.objects = {"nodes": {}, "pods": {}} # 스냅샷 이름 -> uid -> 객체
+        self.received = {"nodes": {}, "pods": {}} # 스냅샷 이름 -> uid -> 수신 시각 (삭제된 객체는 다음 발행까지 유지)
+        self.dirty = set()
+        self.event_entries = deque(maxlen=settings.EVENT_STREAM_BUFFER) # 직렬화된 (순번, 이벤트)
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.started_at = time.time()
+        self.watches = [
+            KubeWatch(
+                "nodes", lambda et, obj, ts: self.handle_object("nodes", slim_node, et, obj, ts),
+                on_resync=lambda items, ts: self.resync_objects("nodes", slim_node, items, ts)
+            ),
+            KubeWatch(
+                "pods", lambda et, obj, ts: self.handle_object("pods", slim_pod, et, obj, ts),
+                all_namespaces=True,
+                on_resync=lambda items, ts: self.resync_objects("pods", slim_pod, items, ts)
+            ),
+            KubeWatch("events", self.handle_event, all_namespaces=True),
+        ]
+
+    @staticmethod
+    def object_key(obj):
+        return obj.get("metadata", {}).get("uid") or obj.get("metadata", {}).get("name")
+
+    def handle_object(self, name, slim, event_type, obj, received_at):
+        uid = self.object_key(obj)
+        with self.lock:
+            if event_type == "DELETED":
+                self.objects[name].pop(uid, None)
+            else:
+                self.objects[name][uid] = slim(obj)
+            self.received[name][uid] = received_at
+            self.dirty.add(name)
+
+    def resync_objects(self, name, slim, items, received_at):
+        """watch 재연결 시 목록 조회 결과로 객체 전체 교체 (바뀌지 않은 객체는 수신 시각 유지)"""
+        objects = {self.object_key(obj): slim(obj) for obj in items}
+        with self.lock:
+            previous = self.objects[name]
+            for uid, obj in objects.items():
+                old = previous.get(uid)
+                if old is None or old["metadata"].get("resourceVersion") != obj["metadata"].get("resourceVersion"):
+                    self.received[name][uid] = received_at
+            for uid in previous:
+                if uid not in objects:
+                    self.received[name][uid] = received_at
+            self.objects[name] = objects
+            self.dirty.add(name)
+
+    def handle_event(self, event_type, obj, received_at):
+        if event_type in ("ADDED", "MODIFIED") and event_store.add_events([to_monitoring_event(obj)]):
+            with self.lock:
+                self.dirty.add("events")
+
+    def publish(self):
+        """변경된 스냅샷만 발행"""
+        with self.lock:
+            dirty, self.dirty = self.dirty, set()
+            snapshots = {}
+            for name in dirty & self.objects.keys():
+                snapshots[name] = (list(self.objects[name].values()), self.received[name])
+                # 삭제된 객체의 수신 시각은 이번 발행에만 포함
+                self.received[name] = {uid: ts for uid, ts in self.received[name].items() if uid in self.objects[name]}
+        published_at = time.time()
+        for name, (items, received) in snapshots.items():
+            self.writer.publish(name, {"items": items, "received_at": received, "published_at": published_at})
+        if "events" in dirty:
+            # 새 이벤트만 직렬화해 보관 목록에 추가
+            last_published = self.event_entries[-1][0] if self.event_entries else 0
+            for seq, event in event_store.events_since(last_published, limit=settings.EVENT_STREAM_BUFFER):
+                self.event_entries.append([seq, jsonable_encoder(event)])
+            self.writer.publish("events", {
+                "last_seq": event_store.last_seq,
+                "entries": list(self.event_entries),
+                "published_at": published_at,
+            })
+        self.writer.publish("collector", {
+            "pid": os.getpid(),
+            "started_at": self.started_at,
+            "published_at": published_at,
+            "interval": self.interval,
+        })
+
+    def run(self):
+        print(f"수집 프로세스 시작 (pid {os.getpid()}, 스냅샷: {self.writer.directory}, 간격 {self.interval}초)")
+        for watch in self.watches:
+            watch.start()
+        try:
+            while not self.stopped.wait(self.interval):
+                try:
+                    self.publish()
+                except Exception as e:
+                    print(f"스냅샷 발행 실패: {e}")
+        finally:
+            for watch in self.watches:
+                watch.stop()
+            print(f"수집 프로세스 종료 ({datetime.now().isoformat()})")
+
+    def stop(self, *args):
+        self.stopped.set()
+
+def main():
+    collector = ClusterCollector()
+    signal.signal(signal.SIGTERM, collector.stop)
+    signal.signal(signal.SIGINT, collector.stop)
+    collector.run()
+
+if __name__ == "__main__":
+    main()
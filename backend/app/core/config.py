@@ -16,6 +16,12 @@ class Settings(BaseSettings):
     VERSION: str = "1.0.0"
     API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
     API_PORT: int = int(os.getenv("API_PORT", "8000"))
+    # 실행 모드 (development: 단일 프로세스 자동 리로드, production: 수집 프로세스 + API 워커 여러 개)
+    APP_MODE: str = os.getenv("APP_MODE", "development")
+    API_WORKERS: int = int(os.getenv("API_WORKERS", "0")) # 0이면 CPU 코어 수
+    # production 모드에서 수집 프로세스가 스냅샷을 발행하는 디렉토리 (공유 메모리)와 최소 발행 간격(초)
+    SNAPSHOT_DIR: str = os.getenv("SNAPSHOT_DIR", "/dev/shm/iso-control")
+    SNAPSHOT_INTERVAL: float = float(os.getenv("SNAPSHOT_INTERVAL", "1.0"))
     
     # URL 설정
     FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:3000")
@@ -43,8 +49,27 @@ class Settings(BaseSettings):
     SSH_USER: str = os.getenv("SSH_USER", "")
     SSH_PORT: int = int(os.getenv("SSH_PORT", "22"))
     
+    # 격리 백엔드 설정 (ssh: 실제 노드, simulated: 가상 클러스터)
+    ISOLATION_BACKEND: str = os.getenv("ISOLATION_BACKEND", "ssh")
+    ISOLATION_MAX_WORKERS: int = int(os.getenv("ISOLATION_MAX_WORKERS", "256"))
+    # 완료 후 결과 저장소에 기록된 작업 중 메모리에 남겨 둘 최근 작업 수 (그 이전 작업은 결과 저장소에서 조회)
+    ISOLATION_RECENT_TASKS: int = int(os.getenv("ISOLATION_RECENT_TASKS", "100"))
+    
+    # 시뮬레이션 백엔드 설정
+    SIMULATION_NODES: str = os.getenv("SIMULATION_NODES", "worker1,worker2,worker3")
+    SIMULATION_PODS_PER_NODE: int = int(os.getenv("SIMULATION_PODS_PER_NODE", "10"))
+    SIMULATION_TIME_SCALE: float = float(os.getenv("SIMULATION_TIME_SCALE", "1.0")) # 0.01이면 100배 빠르게 진행
+    
     # 모니터링 설정
     MONITORING_INTERVAL: int = int(os.getenv("MONITORING_INTERVAL", "10"))
+    # 격리 종료 후 노드/대체 파드 복구를 기다리는 최대 시간(초)
+    TIMELINE_SETTLE_TIMEOUT: int = int(os.getenv("TIMELINE_SETTLE_TIMEOUT", "600"))
+    # 노드 지표 저장소 메모리 예산(MB)
+    METRIC_STORE_BUDGET_MB: int = int(os.getenv("METRIC_STORE_BUDGET_MB", "16"))
+    # 이벤트 스트림(SSE) 재연결 시 이어받을 수 있는 최근 이벤트 수
+    EVENT_STREAM_BUFFER: int = int(os.getenv("EVENT_STREAM_BUFFER", "5000"))
+    # 테스트 결과 저장소 파일 (비우면 프로젝트 루트의 results/test_results.db)
+    RESULT_DB_PATH: str = os.getenv("RESULT_DB_PATH", "")
     
     # 로그 설정
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+응답 필드 선택
+fields=nodes.name,nodes.status,total_pods 또는 view=summary 형태의 요청을 필드 트리로 바꾸고
+요청한 필드의 값만 계산해 응답 딕셔너리를 구성
+"""
+
+class FieldSelection:
+    """요청한 응답 필드 트리
+    - tree가 None이면 해당 단계 아래 전체, 딕셔너리면 {필드: 하위 트리}
+    - 점으로 구분한 경로(nodes.name)는 목록/객체 필드의 하위 필드를 뜻함
+    """
+
+    def __init__(self, tree=None):
+        self.tree = tree
+
+    @classmethod
+    def parse(cls, schema, fields=None, view=None, views=None):
+        """fields가 있으면 fields, 없으면 view 프로필(views[view]), 둘 다 없으면 전체
+        - schema: {필드: 하위 스키마 딕셔너리 또는 단말 값}, 없는 필드를 요청하면 ValueError
+        """
+        if fields:
+            paths = [path.strip() for path in fields.split(",") if path.strip()]
+        elif view:
+            if view not in (views or {}):
+                raise ValueError(f"지원하지 않는 view: {view} (가능: {', '.join(views or {})})")
+            paths = views[view]
+        else:
+            paths = None
+        if paths is None:
+            return cls(None)
+
+        tree = {}
+        for path in paths:
+            node, allowed = tree, schema
+            parts = path.split(".")
+            for depth, part in enumerate(parts):
+                if not isinstance(allowed, dict) or part not in allowed:
+                    raise ValueError(f"지원하지 않는 필드: {'.'.join(parts[:depth + 1])}")
+                allowed = allowed[part]
+                if depth == len(parts) - 1:
+                    node[part] = None
+                elif node.get(part, {}) is None:
+                    break # 상위 필드 전체가 이미 선택됨
+                else:
+                    node = node.setdefault(part, {})
+        return cls(tree)
+
+    @property
+    def is_full(self):
+        return self.tree is None
+
+    def wants(self, name):
+        return self.tree is None or name in self.tree
+
+    def select(self, available):
+        """available 중 요청한 필드 이름 목록 (스키마 순서 유지)"""
+        if self.tree is None:
+            return list(available)
+        return [name for name in available if name in self.tree]
+
+    def child(self, name):
+        return FieldSelection(None if self.tree is None else self.tree.get(name))
+
+def project(source, extractors, selection):
+    """extractors(필드 -> 값 계산 함수) 중 선택된 필드만 계산한 딕셔너리"""
+    return {name: extractors[name](source) for name in selection.select(extractors)}
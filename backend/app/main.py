@@ -5,17 +5,29 @@ FastAPI 메인 애플리케이션
 """
 
 from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
+import os
+import subprocess
+import sys
+import time
 import socketio
 import uvicorn
 
 from app.core.config import settings
-from app.routers import nodes, pods, isolation, monitoring
+from app.routers import nodes, pods, isolation, monitoring, metrics, tests
+from app.stores.event_store import event_store
+from app.stores.subscription_store import topic_index, parse_topic, event_topics, task_topics
+from app.stores.snapshot_store import snapshot_reader, snapshot_writer
 
 # Socket.IO 서버 생성
+# production 모드는 여러 워커가 세션을 공유하지 않으므로 요청마다 다른 워커로 갈 수 있는
+# 폴링 전송을 받지 않고, 연결 하나가 한 워커에 유지되는 websocket 전송만 허용
 sio = socketio.AsyncServer(
     async_mode='asgi',
     cors_allowed_origins="*",
+    transports=['websocket'] if settings.APP_MODE == "production" else ['polling', 'websocket'],
     logger=True,
     engineio_logger=True
 )
@@ -44,6 +56,8 @@ app.include_router(nodes.router, prefix="/api/v1", tags=["nodes"])
 app.include_router(pods.router, prefix="/api/v1", tags=["pods"])
 app.include_router(isolation.router, prefix="/api/v1/isolation", tags=["isolation"])
 app.include_router(monitoring.router, prefix="/api/v1", tags=["monitoring"])
+app.include_router(metrics.router, prefix="/api/v1/metrics", tags=["metrics"])
+app.include_router(tests.router, prefix="/api/v1", tags=["tests"])
 
 @app.get("/")
 async def root():
@@ -52,8 +66,67 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """헬스 체크 엔드포인트"""
-    return {"status": "healthy"}
+    """헬스 체크 엔드포인트 (production 모드는 수집 프로세스의 마지막 발행 경과 시간 포함)"""
+    if not snapshot_reader:
+        return {"status": "healthy"}
+    collector = snapshot_reader.get("collector")
+    if collector is None:
+        return {"status": "degraded", "mode": settings.APP_MODE, "collector": None}
+    age = time.time() - collector["published_at"]
+    return {
+        "status": "healthy" if age <= max(10 * collector["interval"], 10) else "degraded",
+        "mode": settings.APP_MODE,
+        "worker_pid": os.getpid(),
+        "collector": {"pid": collector["pid"], "last_publish_age": round(age, 3)},
+    }
+
+# 토픽 구독 전송
+async def publish_events(entries):
+    """새 이벤트를 해당 토픽 구독자에게 한 번씩 전송"""
+    for seq, event in entries:
+        targets = topic_index.match(event_topics(event))
+        if not targets:
+            continue
+        payload = {'seq': seq, 'event': jsonable_encoder(event)}
+        for sid, topics in targets.items():
+            await sio.emit('monitoring_event', {**payload, 'topics': topics}, to=sid)
+
+async def publish_task(task):
+    """격리 작업 상태를 작업/대상 노드 토픽 구독자에게 전송"""
+    targets = topic_index.match(task_topics(task))
+    if not targets:
+        return
+    payload = jsonable_encoder(task)
+    for sid, topics in targets.items():
+        await sio.emit('isolation_task', {**payload, 'topics': topics}, to=sid)
+
+# 이벤트 watch가 필요한 구독자 (task: 토픽만 구독하면 필요 없음)
+event_feed_clients = set()
+
+async def update_event_feed(sid, topics):
+    """이벤트 토픽 구독 여부에 따라 공유 이벤트 watch 참조 수 조정"""
+    wants_events = any(not topic.startswith("task:") for topic in topics)
+    if wants_events and sid not in event_feed_clients:
+        event_feed_clients.add(sid)
+        # watch 시작(kubectl 실행)과 중지는 이벤트 루프를 막지 않도록 스레드에서 처리
+        await asyncio.get_running_loop().run_in_executor(None, monitoring.event_feed.acquire)
+    elif not wants_events and sid in event_feed_clients:
+        event_feed_clients.discard(sid)
+        await asyncio.get_running_loop().run_in_executor(None, monitoring.event_feed.release)
+
+@app.on_event("startup")
+async def start_topic_publisher():
+    """이벤트 스토어/격리 작업 변경을 토픽 전송으로 연결 (다른 스레드에서 호출되어도 이벤트 루프에서 전송)"""
+    loop = asyncio.get_running_loop()
+    event_store.subscribe(
+        "events_added",
+        lambda entries: asyncio.run_coroutine_threadsafe(publish_events(entries), loop)
+    )
+    isolation.task_listeners.append(
+        lambda task: asyncio.run_coroutine_threadsafe(publish_task(task), loop)
+    )
+    if snapshot_writer:
+        isolation.start_worker_sync()
 
 # Socket.IO 이벤트 핸들러
 @sio.event
@@ -65,18 +138,72 @@ async def connect(sid, environ):
 async def disconnect(sid):
     """클라이언트 연결 해제"""
     print(f"Client disconnected: {sid}")
+    topic_index.remove(sid)
+    await update_event_feed(sid, [])
+
+@sio.event
+async def subscribe(sid, data):
+    """토픽 구독 (data: {"topics": ["node:worker1", "namespace:default", "task:<id>", "warnings", "events"]})"""
+    try:
+        topics = [parse_topic(topic) for topic in (data or {}).get('topics', [])]
+    except ValueError as e:
+        await sio.emit('subscription_error', {'error': str(e)}, to=sid)
+        return
+    subscribed = topic_index.subscribe(sid, topics)
+    await update_event_feed(sid, subscribed)
+    await sio.emit('subscribed', {'topics': subscribed}, to=sid)
+    # 작업 토픽은 현재 상태를 바로 전송
+    for topic in topics:
+        task = isolation.find_task(topic[len("task:"):]) if topic.startswith("task:") else None
+        if task:
+            await sio.emit('isolation_task', {**jsonable_encoder(task), 'topics': [topic]}, to=sid)
+
+@sio.event
+async def unsubscribe(sid, data):
+    """토픽 구독 해제 (data: {"topics": [...]})"""
+    remaining = topic_index.unsubscribe(sid, (data or {}).get('topics', []))
+    await update_event_feed(sid, remaining)
+    await sio.emit('subscribed', {'topics': remaining}, to=sid)
 
 @sio.event
 async def join_room(sid, data):
-    """룸 참가"""
+    """룸 참가 (룸 이름이 토픽 형식이면 토픽 구독도 함께 등록)"""
     room = data.get('room', 'default')
     await sio.enter_room(sid, room)
+    try:
+        topic = parse_topic(room)
+    except ValueError:
+        topic = None
+    if topic:
+        await update_event_feed(sid, topic_index.subscribe(sid, [topic]))
     await sio.emit('joined_room', {'room': room}, room=sid)
 
-if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:socket_app",
-        host=settings.API_HOST,
-        port=settings.API_PORT,
-        reload=True # 변경 시 자동 리로드
+def run_production():
+    """수집 프로세스 하나와 API 워커 여러 개로 실행 (워커는 수집 프로세스가 발행한 스냅샷을 공유)"""
+    # 이전 실행의 작업 목록/중지 요청 스냅샷만 정리 (SNAPSHOT_DIR의 다른 파일은 지우지 않음)
+    snapshot_writer.clear(["tasks-", "stop-"])
+    collector = subprocess.Popen(
+        [sys.executable, "-m", "app.collector"],
+        cwd=os.path.join(os.path.dirname(__file__), "..")
     )
+    try:
+        uvicorn.run(
+            "app.main:socket_app",
+            host=settings.API_HOST,
+            port=settings.API_PORT,
+            workers=settings.API_WORKERS or os.cpu_count()
+        )
+    finally:
+        collector.terminate()
+        collector.wait(timeout=10)
+
+if __name__ == "__main__":
+    if settings.APP_MODE == "production":
+        run_production()
+    else:
+        uvicorn.run(
+            "app.main:socket_app",
+            host=settings.API_HOST,
+            port=settings.API_PORT,
+            reload=True # 변경 시 자동 리로드
+        )
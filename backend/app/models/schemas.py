@@ -131,6 +131,18 @@ class IsolationStatus(str, Enum):
     COMPLETED = "completed"
     FAILED = "failed"
 
+class IsolationTimeline(BaseModel):
+    """격리 작업 장애 감지/복구 타임라인"""
+    fault_injected: Optional[datetime] = None
+    node_not_ready: Optional[datetime] = None
+    first_eviction: Optional[datetime] = None
+    last_replacement_ready: Optional[datetime] = None
+    fault_removed: Optional[datetime] = None
+    node_ready: Optional[datetime] = None
+    evicted_pods: int = 0
+    replaced_pods: int = 0
+    durations: Dict[str, Optional[float]] = {} # 구간별 소요 시간(초)
+
 class IsolationResponse(BaseModel):
     """격리 응답"""
     task_id: str
@@ -141,6 +153,12 @@ class IsolationResponse(BaseModel):
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     message: str
+    timeline: Optional[IsolationTimeline] = None
+
+class TimelineSummaryResponse(BaseModel):
+    """격리 타임라인 구간별 백분위수 요약"""
+    runs: int
+    phases: Dict[str, Dict[str, Optional[float]]] # 구간 -> count/min/max/mean/p50/p90/p99
 
 class IsolationStopRequest(BaseModel):
     """격리 중지 요청"""
@@ -161,25 +179,60 @@ class MonitoringResponse(BaseModel):
     cluster_status: ClusterStatus
     recent_events: List[MonitoringEvent]
 
+# 지표 관련 모델
+class MetricSamplesRequest(BaseModel):
+    """노드 지표 샘플 전송 요청"""
+    samples: List[Dict[str, Optional[float]]] # 지표명 -> 값 (timestamp 포함)
+
+class NodeMetricsResponse(BaseModel):
+    """노드 지표 구간 조회 응답"""
+    node: str
+    resolution: str # raw, 10s, 1m
+    timestamps: List[float]
+    series: Dict[str, List[Optional[float]]]
+
 # 테스트 관련 모델
 class TestResult(BaseModel):
     """테스트 결과"""
     test_id: str
+    kind: str # isolation(API 격리 작업), integrated(통합 테스트), matrix(매트릭스 실험)
     node_name: str
-    method: IsolationMethod
-    duration: int
+    method: str # 격리 방법 또는 stress
+    duration: Optional[int] = None
     started_at: datetime
     completed_at: Optional[datetime] = None
     success: bool
     migration_count: int
     migration_time: Optional[float] = None  # 초
+    detection_time: Optional[float] = None  # 초
+    recovery_time: Optional[float] = None  # 초
+    convergence_time: Optional[float] = None  # 초
     error_message: Optional[str] = None
+    details: Optional[Dict[str, Any]] = None # 단건 조회에서만 포함
 
 class TestResultsResponse(BaseModel):
     """테스트 결과 목록 응답"""
     results: List[TestResult]
     total_count: int
 
+class TestStatsGroup(BaseModel):
+    """집계 그룹 하나의 실행 수와 지표별 통계"""
+    method: Optional[str] = None
+    node: Optional[str] = None
+    kind: Optional[str] = None
+    window: Optional[datetime] = None # 시간 구간 시작 시각
+    runs: int
+    success: int
+    first_started: datetime
+    last_started: datetime
+    metrics: Dict[str, Dict[str, Optional[float]]] # 지표 -> count/mean/min/max/p50/p90
+
+class TestStatsResponse(BaseModel):
+    """테스트 결과 집계 응답"""
+    group_by: List[str]
+    window: Optional[int] = None # 초
+    groups: List[TestStatsGroup]
+
 # 공통 응답 모델
 class SuccessResponse(BaseModel):
     """성공 응답"""
@@ -4,54 +4,301 @@
 """
 
 from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi.encoders import jsonable_encoder
 import asyncio
+import functools
+import threading
 import uuid
 import sys
 import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict
+from typing import Callable, Dict, List, Optional
 
 # 기존 스크립트 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), "../../../"))
-from scripts.stress.node_isolation import isolate_node
+from scripts.stress.isolation_backends import get_backend, FakeClusterState, SimulatedIsolationBackend
+from scripts.monitoring.isolation_timeline import IsolationTimeline, summarize_timelines
+from tools.result_store import timeline_metrics
 
+from app.core.config import settings
 from app.models.schemas import (
     IsolationRequest, IsolationResponse, IsolationStatus, 
-    IsolationStopRequest, SuccessResponse
+    IsolationStopRequest, SuccessResponse, TimelineSummaryResponse
 )
+from app.stores.result_store import result_store
+from app.stores.snapshot_store import snapshot_reader, snapshot_writer
+from app.stores.cluster_feed import cluster_feed
 
 router = APIRouter()
 
 # 실행 중인 격리 작업 추적
 running_tasks: Dict[str, dict] = {}
+# 작업별 장애/복구 타임라인
+timelines: Dict[str, IsolationTimeline] = {}
+# 작업별 중지 요청 신호
+stop_events: Dict[str, threading.Event] = {}
+# 종료되어 결과 저장까지 끝난 작업 ID (오래된 순, ISOLATION_RECENT_TASKS개를 넘으면 메모리에서 제거)
+finished_tasks: deque = deque()
+# 종료된 작업의 발행용 직렬화 결과 (종료 후에는 바뀌지 않으므로 발행할 때마다 다시 직렬화하지 않음)
+finished_payloads: Dict[str, dict] = {}
+# 작업 상태가 바뀔 때 호출할 함수 (작업 정보와 타임라인 전달)
+task_listeners: List[Callable[[dict], None]] = []
+
+def create_backend():
+    """설정에 따른 격리 백엔드 생성"""
+    if settings.ISOLATION_BACKEND == "simulated":
+        cluster = FakeClusterState(
+            nodes=[name.strip() for name in settings.SIMULATION_NODES.split(",") if name.strip()],
+            pods_per_node=settings.SIMULATION_PODS_PER_NODE,
+            time_scale=settings.SIMULATION_TIME_SCALE
+        )
+        return get_backend("simulated", cluster=cluster, time_scale=settings.SIMULATION_TIME_SCALE)
+    return get_backend(settings.ISOLATION_BACKEND)
+
+isolation_backend = create_backend()
+# 격리 작업 전용 스레드 풀 (작업마다 복구 완료까지 스레드를 점유)
+isolation_executor = ThreadPoolExecutor(
+    max_workers=settings.ISOLATION_MAX_WORKERS,
+    thread_name_prefix="isolation"
+)
 
 class IsolationService:
     async def run_isolation(self, task_id: str, request: IsolationRequest):
         """격리 작업 실행"""
+        loop = asyncio.get_running_loop()
+        stop_event = stop_events[task_id]
         try:
+            # 시작 전에 중지 요청이 들어온 경우
+            if stop_event.is_set():
+                running_tasks[task_id]["status"] = IsolationStatus.COMPLETED
+                running_tasks[task_id]["completed_at"] = datetime.now()
+                running_tasks[task_id]["message"] = "격리 작업이 시작 전에 중지되었습니다."
+                return
+            
             # 작업 상태 업데이트
             running_tasks[task_id]["status"] = IsolationStatus.RUNNING
             running_tasks[task_id]["started_at"] = datetime.now()
             
-            # 격리 실행
-            isolate_node(
-                node=request.node_name,
-                method=request.method,
-                duration=request.duration
+            # 타임라인 기록 시작 후 격리 실행 (블로킹 작업은 스레드에서 실행)
+            # 노드/파드 변경은 작업마다 watch를 띄우지 않고 워커 공유 피드(또는 시뮬레이션 클러스터)에서 구독
+            timeline = IsolationTimeline(request.node_name, source=isolation_backend.watch_source() or cluster_feed)
+            timelines[task_id] = timeline
+            await loop.run_in_executor(isolation_executor, timeline.start)
+            notify_task_update(task_id)
+            await loop.run_in_executor(
+                isolation_executor,
+                functools.partial(
+                    isolation_backend.isolate,
+                    request.node_name,
+                    request.method.value,
+                    request.duration,
+                    on_event=timeline.on_fault_event,
+                    stop_event=stop_event
+                )
             )
             
             # 작업 완료
             running_tasks[task_id]["status"] = IsolationStatus.COMPLETED
             running_tasks[task_id]["completed_at"] = datetime.now()
-            running_tasks[task_id]["message"] = "격리 작업이 완료되었습니다."
+            running_tasks[task_id]["message"] = (
+                "격리 작업이 중지되었습니다." if stop_event.is_set()
+                else "격리 작업이 완료되었습니다."
+            )
+            notify_task_update(task_id)
+            
+            # 노드 복귀 및 대체 파드 Ready까지 타임라인 기록 계속
+            await loop.run_in_executor(
+                isolation_executor,
+                timeline.wait_settled,
+                settings.TIMELINE_SETTLE_TIMEOUT
+            )
             
         except Exception as e:
             running_tasks[task_id]["status"] = IsolationStatus.FAILED
             running_tasks[task_id]["completed_at"] = datetime.now()
             running_tasks[task_id]["message"] = f"격리 작업 중 오류 발생: {str(e)}"
+        finally:
+            if task_id in timelines:
+                await loop.run_in_executor(isolation_executor, timelines[task_id].stop)
+                await loop.run_in_executor(isolation_executor, save_task_result, task_id)
+            # 실패 또는 복구 관찰 종료 (최종 타임라인 포함)
+            notify_task_update(task_id)
+            retire_task(task_id)
+
+def notify_task_update(task_id: str):
+    """작업 상태 변경을 등록된 함수에 전달 (전달 실패는 작업 진행에 영향 없음)"""
+    if not task_listeners:
+        return
+    task = {**running_tasks[task_id], "timeline": get_task_timeline(task_id)}
+    for listener in list(task_listeners):
+        try:
+            listener(task)
+        except Exception as e:
+            print(f"작업 상태 알림 실패 ({task_id}): {e}")
+
+def save_task_result(task_id: str):
+    """실행된 격리 작업의 결과와 타임라인 구간을 결과 저장소에 기록"""
+    task_info = running_tasks[task_id]
+    timeline = timelines[task_id].to_dict()
+    try:
+        result_store.save({
+            'test_id': task_id,
+            'kind': "isolation",
+            'node_name': task_info["node_name"],
+            'method': task_info["method"].value,
+            'duration': task_info["duration"],
+            'started_at': task_info["started_at"],
+            'completed_at': task_info["completed_at"],
+            'success': task_info["status"] == IsolationStatus.COMPLETED,
+            'error_message': task_info["message"] if task_info["status"] == IsolationStatus.FAILED else None,
+            **timeline_metrics(timeline),
+            'details': {'timeline': timeline},
+        })
+    except Exception as e:
+        print(f"격리 결과 저장 실패 ({task_id}): {e}")
+
+def retire_task(task_id: str):
+    """종료된 작업을 최근 작업 목록에 넣고 한도를 넘은 오래된 작업은 메모리에서 제거 (결과 저장소에는 남음)"""
+    finished_tasks.append(task_id)
+    if snapshot_writer:
+        finished_payloads[task_id] = jsonable_encoder({**running_tasks[task_id], "timeline": get_task_timeline(task_id)})
+    while len(finished_tasks) > settings.ISOLATION_RECENT_TASKS:
+        old_task_id = finished_tasks.popleft()
+        running_tasks.pop(old_task_id, None)
+        timelines.pop(old_task_id, None)
+        stop_events.pop(old_task_id, None)
+        finished_payloads.pop(old_task_id, None)
+
+def stored_task(task_id: str) -> Optional[dict]:
+    """메모리에서 제거된 격리 작업을 결과 저장소에서 조회"""
+    result = result_store.get(task_id)
+    if result is None or result["kind"] != "isolation":
+        return None
+    return {
+        "task_id": task_id,
+        "node_name": result["node_name"],
+        "method": result["method"],
+        "status": IsolationStatus.COMPLETED if result["success"] else IsolationStatus.FAILED,
+        "duration": result["duration"],
+        "started_at": result["started_at"],
+        "completed_at": result["completed_at"],
+        "message": result["error_message"] or "격리 작업이 완료되었습니다.",
+        "timeline": (result["details"] or {}).get("timeline"),
+    }
 
 isolation_service = IsolationService()
 
+def get_task_timeline(task_id: str) -> Optional[dict]:
+    """작업 타임라인 조회 (진행 중이면 현재까지 기록된 시점)"""
+    if task_id in timelines:
+        return timelines[task_id].to_dict()
+    return None
+
+def worker_alive(pid: int) -> bool:
+    """워커 프로세스가 살아 있는지 (같은 호스트의 워커끼리만 스냅샷을 공유)"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def worker_tasks() -> List[dict]:
+    """production 모드에서 살아 있는 다른 API 워커가 발행한 작업 목록
+    - 종료된 워커의 스냅샷은 그 작업을 더 이상 진행하거나 중지할 수 없으므로 삭제
+    """
+    if not snapshot_reader:
+        return []
+    tasks = []
+    for name in snapshot_reader.names("tasks-"):
+        pid = int(name[len("tasks-"):])
+        if pid == os.getpid():
+            continue
+        if not worker_alive(pid):
+            snapshot_writer.remove(name)
+            continue
+        tasks.extend(snapshot_reader.get(name, {}).get("tasks", {}).values())
+    return tasks
+
+def find_task(task_id: str) -> Optional[dict]:
+    """이 워커의 작업 또는 다른 워커가 발행한 작업 (타임라인 포함)"""
+    if task_id in running_tasks:
+        return {**running_tasks[task_id], "timeline": get_task_timeline(task_id)}
+    return next((task for task in worker_tasks() if task["task_id"] == task_id), None)
+
+def publish_worker_tasks(task: dict):
+    """이 워커의 작업 목록을 스냅샷으로 발행 (다른 워커의 상태 조회/중지 요청용)
+    - 진행 중인 작업과 메모리에 남은 최근 종료 작업(ISOLATION_RECENT_TASKS개)만 포함
+    """
+    snapshot_writer.publish(f"tasks-{os.getpid()}", {
+        "pid": os.getpid(),
+        "tasks": {
+            task_id: finished_payloads.get(task_id) or jsonable_encoder({**task_info, "timeline": get_task_timeline(task_id)})
+            for task_id, task_info in list(running_tasks.items())
+        },
+    })
+
+def notify_remote_tasks(seen: Dict[str, dict]):
+    """다른 워커가 발행한 작업 중 바뀐 것을 이 워커의 구독자에게 전달 (seen: 작업 ID -> 마지막으로 전달한 상태)
+    - 더 이상 발행되지 않는 작업(종료된 워커, 메모리에서 제거된 작업)은 seen에서도 제거
+    - 실행 중인 작업이 없는 중지 요청 스냅샷은 적용할 워커가 없으므로 삭제
+    """
+    tasks = worker_tasks()
+    published = {task["task_id"] for task in tasks}
+    for task_id in [task_id for task_id in seen if task_id not in published]:
+        del seen[task_id]
+    active = {
+        task["task_id"]
+        for task in tasks + list(running_tasks.values())
+        if task["status"] in [IsolationStatus.IDLE, IsolationStatus.RUNNING]
+    }
+    for name in snapshot_reader.names("stop-"):
+        if name[len("stop-"):] not in active:
+            snapshot_writer.remove(name)
+    for task in tasks:
+        if seen.get(task["task_id"]) == task:
+            continue
+        seen[task["task_id"]] = task
+        for listener in list(task_listeners):
+            if listener is publish_worker_tasks:
+                continue
+            try:
+                listener(task)
+            except Exception as e:
+                print(f"작업 상태 알림 실패 ({task['task_id']}): {e}")
+
+def watch_worker_snapshots(interval: float = 1.0):
+    """다른 워커와의 작업 동기화
+    - 다른 워커가 받은 중지 요청(stop-<작업 ID> 스냅샷)을 이 워커의 실행 중 작업에 적용
+    - 다른 워커의 작업 변경을 이 워커에 연결된 Socket.IO 구독자에게 전달
+    """
+    seen: Dict[str, dict] = {}
+    while True:
+        time.sleep(interval)
+        for task_id, task_info in list(running_tasks.items()):
+            if task_info["status"] not in [IsolationStatus.IDLE, IsolationStatus.RUNNING]:
+                continue
+            if snapshot_reader.version(f"stop-{task_id}") is None:
+                continue
+            stop_events[task_id].set()
+            task_info["status"] = IsolationStatus.STOPPING
+            task_info["message"] = "격리 작업이 중지되었습니다."
+            snapshot_writer.remove(f"stop-{task_id}")
+            notify_task_update(task_id)
+        try:
+            notify_remote_tasks(seen)
+        except Exception as e:
+            print(f"워커 작업 동기화 실패: {e}")
+
+def start_worker_sync():
+    """production 모드 워커: 작업 목록 발행과 다른 워커의 작업 동기화 시작"""
+    task_listeners.append(publish_worker_tasks)
+    threading.Thread(target=watch_worker_snapshots, daemon=True, name="worker-sync").start()
+
 @router.post("/start", response_model=IsolationResponse)
 async def start_isolation(request: IsolationRequest, background_tasks: BackgroundTasks):
     """노드 격리 시작"""
@@ -73,6 +320,8 @@ async def start_isolation(request: IsolationRequest, background_tasks: Backgroun
             "completed_at": None,
             "message": "격리 작업이 대기 중입니다."
         }
+        stop_events[task_id] = threading.Event()
+        notify_task_update(task_id)
         
         # 백그라운드에서 격리 작업 실행
         background_tasks.add_task(
@@ -99,15 +348,16 @@ async def start_isolation(request: IsolationRequest, background_tasks: Backgroun
 
 @router.get("/status/{task_id}", response_model=IsolationResponse)
 async def get_isolation_status(task_id: str):
-    """격리 작업 상태 조회"""
-    if task_id not in running_tasks:
+    """격리 작업 상태 조회 (메모리에서 제거된 작업은 결과 저장소에서 조회)"""
+    task_info = find_task(task_id)
+    if task_info is None:
+        task_info = await asyncio.get_running_loop().run_in_executor(None, stored_task, task_id)
+    if task_info is None:
         raise HTTPException(
             status_code=404,
             detail="격리 작업을 찾을 수 없습니다."
         )
     
-    task_info = running_tasks[task_id]
-    
     return IsolationResponse(
         task_id=task_id,
         node_name=task_info["node_name"],
@@ -116,30 +366,39 @@ async def get_isolation_status(task_id: str):
         duration=task_info["duration"],
         started_at=task_info["started_at"],
         completed_at=task_info["completed_at"],
-        message=task_info["message"]
+        message=task_info["message"],
+        timeline=task_info["timeline"]
     )
 
 @router.post("/stop", response_model=SuccessResponse)
 async def stop_isolation(request: IsolationStopRequest):
     """격리 작업 중지"""
     try:
-        if request.task_id not in running_tasks:
+        task_info = find_task(request.task_id)
+        if task_info is None:
             raise HTTPException(
                 status_code=404,
                 detail="격리 작업을 찾을 수 없습니다."
             )
         
-        task_info = running_tasks[request.task_id]
-        
         if task_info["status"] not in [IsolationStatus.IDLE, IsolationStatus.RUNNING]:
             raise HTTPException(
                 status_code=400,
                 detail="중지할 수 있는 상태가 아닙니다."
             )
         
-        # 상태 업데이트
+        if request.task_id not in running_tasks:
+            # 다른 워커가 실행 중인 작업: 중지 요청을 발행하면 해당 워커가 적용
+            snapshot_writer.publish(f"stop-{request.task_id}", {"requested_at": datetime.now().isoformat()})
+            return SuccessResponse(
+                message="격리 작업 중지 요청이 전달되었습니다."
+            )
+        
+        # 상태 업데이트 후 실행 중인 격리를 즉시 복구 단계로 전환
+        stop_events[request.task_id].set()
         running_tasks[request.task_id]["status"] = IsolationStatus.STOPPING
         running_tasks[request.task_id]["message"] = "격리 작업이 중지되었습니다."
+        notify_task_update(request.task_id)
         
         return SuccessResponse(
             message="격리 작업이 중지되었습니다."
@@ -156,7 +415,40 @@ async def stop_isolation(request: IsolationStopRequest):
 @router.get("/tasks")
 async def get_all_tasks():
     """모든 격리 작업 목록 조회"""
+    tasks = [
+        {**task, "timeline": get_task_timeline(task_id)}
+        for task_id, task in running_tasks.items()
+    ] + worker_tasks()
+    return {
+        "tasks": tasks,
+        "total_count": len(tasks)
+    }
+
+@router.get("/timelines/summary", response_model=TimelineSummaryResponse)
+async def get_timeline_summary(method: Optional[str] = None, node_name: Optional[str] = None):
+    """격리 실행별 장애 감지/복구 구간의 백분위수 요약"""
+    selected = [
+        timelines[task_id]
+        for task_id, task in running_tasks.items()
+        if task_id in timelines
+        and (method is None or task["method"] == method)
+        and (node_name is None or task["node_name"] == node_name)
+    ]
+    return TimelineSummaryResponse(
+        runs=len(selected),
+        phases=summarize_timelines(selected)
+    )
+
+@router.get("/simulation")
+async def get_simulation_state():
+    """시뮬레이션 백엔드의 가상 클러스터 상태 조회"""
+    if not isinstance(isolation_backend, SimulatedIsolationBackend):
+        raise HTTPException(
+            status_code=404,
+            detail="시뮬레이션 백엔드가 활성화되어 있지 않습니다."
+        )
     return {
-        "tasks": list(running_tasks.values()),
-        "total_count": len(running_tasks)
-    } 
\ No newline at end of file
+        "backend": isolation_backend.name,
+        "time_scale": isolation_backend.time_scale,
+        **isolation_backend.cluster.snapshot()
+    }
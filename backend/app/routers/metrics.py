@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+노드 지표 관련 API 라우터
+"""
+
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+
+from app.models.schemas import MetricSamplesRequest, NodeMetricsResponse, SuccessResponse
+from app.stores.metric_store import metric_store
+
+router = APIRouter()
+
+@router.get("/nodes")
+async def get_metric_nodes():
+    """지표가 저장된 노드 목록과 저장소 사용량"""
+    return metric_store.stats()
+
+@router.get("/nodes/{node_name}", response_model=NodeMetricsResponse)
+async def get_node_metrics(
+    node_name: str,
+    start: Optional[float] = Query(None, description="시작 시각 (epoch 초)"),
+    end: Optional[float] = Query(None, description="종료 시각 (epoch 초)"),
+    metrics: Optional[str] = Query(None, description="조회할 지표 (쉼표 구분, 기본: 전체)"),
+    resolution: Optional[str] = Query(None, description="raw, 10s, 1m (기본: 자동 선택)"),
+    max_points: int = Query(1000, ge=1, le=100000, description="자동 선택 시 최대 점 개수")
+):
+    """노드 지표 구간 조회"""
+    try:
+        result = metric_store.query(
+            node_name,
+            start=start,
+            end=end,
+            metrics=metrics.split(",") if metrics else None,
+            resolution=resolution,
+            max_points=max_points
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"노드 지표를 찾을 수 없습니다: {node_name}")
+    return result
+
+@router.post("/nodes/{node_name}", response_model=SuccessResponse)
+async def ingest_node_metrics(node_name: str, request: MetricSamplesRequest):
+    """스크립트에서 수집한 노드 지표 샘플 저장"""
+    for sample in request.samples:
+        metric_store.record(node_name, sample)
+    return SuccessResponse(message=f"{len(request.samples)}개 샘플이 저장되었습니다")
@@ -3,17 +3,31 @@
 모니터링 관련 API 라우터
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import List
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Request, Header
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Optional
+import asyncio
 import subprocess
+import threading
 import json
+import sys
+import os
 from datetime import datetime
 
+# 기존 스크립트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../"))
+from tools.kube_watch import KubeWatch
+
 from app.models.schemas import (
-    MonitoringResponse, ClusterStatus, MonitoringEvent,
-    Node, PodDistribution
+    MonitoringResponse, ClusterStatus, MonitoringEvent
 )
 from app.stores.event_store import event_store
+from app.stores.metric_store import metric_store
+from app.core.projection import FieldSelection, project
+from app.routers.pods import list_pod_phases
+from app.routers.nodes import list_node_items
+from app.stores.snapshot_store import snapshot_reader
 
 router = APIRouter()
 
@@ -29,6 +43,29 @@ def run_kubectl_command(command: List[str]) -> str:
     except subprocess.CalledProcessError as e:
         raise HTTPException(status_code=500, detail=f"kubectl 명령 실행 실패: {e.stderr}")
 
+def to_monitoring_event(event) -> MonitoringEvent:
+    """kubectl 이벤트 항목을 MonitoringEvent로 변환"""
+    metadata = event.get("metadata", {})
+    involved_object = event.get("involvedObject", {})
+    source = event.get("source", {})
+    
+    return MonitoringEvent(
+        id=metadata.get("uid", metadata.get("name", "")),
+        type=event.get("type", "Normal"),
+        reason=event.get("reason", ""),
+        message=event.get("message", ""),
+        timestamp=event.get("lastTimestamp") or event.get("firstTimestamp") or datetime.utcnow().isoformat(),
+        source={
+            "component": source.get("component", ""),
+            "host": source.get("host")
+        },
+        involved_object={
+            "kind": involved_object.get("kind", ""),
+            "name": involved_object.get("name", ""),
+            "namespace": involved_object.get("namespace", "")
+        }
+    )
+
 async def fetch_events():
     """이벤트 데이터 가져오기"""
     try:
@@ -36,141 +73,324 @@ async def fetch_events():
         output = run_kubectl_command(cmd)
         data = json.loads(output)
         
-        events = []
-        for event in data.get("items", []):
-            metadata = event.get("metadata", {})
-            involved_object = event.get("involvedObject", {})
-            source = event.get("source", {})
-            
-            events.append(MonitoringEvent(
-                id=metadata.get("uid", metadata.get("name", "")),
-                type=event.get("type", "Normal"),
-                reason=event.get("reason", ""),
-                message=event.get("message", ""),
-                timestamp=event.get("lastTimestamp", event.get("firstTimestamp", datetime.utcnow().isoformat())),
-                source={
-                    "component": source.get("component", ""),
-                    "host": source.get("host")
-                },
-                involved_object={
-                    "kind": involved_object.get("kind", ""),
-                    "name": involved_object.get("name", ""),
-                    "namespace": involved_object.get("namespace", "")
-                }
-            ))
+        events = [to_monitoring_event(event) for event in data.get("items", [])]
         
         event_store.update_events(events)
     except Exception as e:
         print(f"이벤트 가져오기 실패: {str(e)}")
 
+class EventFeed:
+    """스트림 구독자가 있는 동안 클러스터 이벤트를 kubectl watch로 받아 이벤트 스토어에 기록
+    - 첫 구독자가 연결되면 watch 시작, 마지막 구독자가 끊긴 뒤 linger초 동안 재연결이 없으면 중지
+    - 전체 목록을 반복 조회하지 않고 변경된 이벤트만 수신
+    """
+
+    def __init__(self, linger: float = 30):
+        self.linger = linger
+        self.clients = 0
+        self.watch = None
+        self.idle_timer = None
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            self.clients += 1
+            if self.idle_timer:
+                self.idle_timer.cancel()
+                self.idle_timer = None
+            if self.watch is None:
+                self.watch = KubeWatch("events", self.handle_event, all_namespaces=True)
+                self.watch.start()
+
+    def release(self):
+        with self.lock:
+            self.clients -= 1
+            if self.clients == 0 and self.watch:
+                self.idle_timer = threading.Timer(self.linger, self._stop_if_idle)
+                self.idle_timer.daemon = True
+                self.idle_timer.start()
+
+    def _stop_if_idle(self):
+        with self.lock:
+            if self.clients > 0 or self.watch is None:
+                return
+            watch, self.watch, self.idle_timer = self.watch, None, None
+        watch.stop()
+
+    def handle_event(self, event_type, item, received_at):
+        if event_type in ("ADDED", "MODIFIED"):
+            event_store.add_events([to_monitoring_event(item)])
+
+class SnapshotEventFeed:
+    """production 모드: 수집 프로세스가 발행한 이벤트 스냅샷을 이벤트 스토어에 같은 순번으로 반영
+    - 구독자가 있는 동안 poll_interval초마다 스냅샷 파일 버전만 확인하고 바뀌었을 때만 읽음
+    - 워커마다 kubectl watch를 띄우지 않으므로 워커 수와 무관하게 upstream watch는 하나
+    """
+
+    def __init__(self, reader, poll_interval: float = 0.5):
+        self.reader = reader
+        self.poll_interval = poll_interval
+        self.clients = 0
+        self.version = None
+        self.stopped = None # 실행 중인 폴링 스레드의 중지 신호 (스레드마다 새로 만듦)
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        """스냅샷이 바뀌었으면 새 이벤트 반영"""
+        version = self.reader.version("events")
+        if version is None or version == self.version:
+            return
+        data = self.reader.get("events", {})
+        self.version = version
+        last_seq = data.get("last_seq", 0)
+        # 수집 프로세스가 재시작해 순번이 줄었으면 처음부터 반영
+        since = event_store.last_seq if last_seq >= event_store.last_seq else 0
+        event_store.ingest(
+            last_seq,
+            [(seq, MonitoringEvent(**event)) for seq, event in data.get("entries", []) if seq > since]
+        )
+
+    def run(self, stopped):
+        while not stopped.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"이벤트 스냅샷 반영 실패: {e}")
+
+    def acquire(self):
+        with self.lock:
+            self.clients += 1
+            if self.stopped is None:
+                # 중지 직후 다시 시작해도 이전 스레드는 자기 중지 신호를 보고 종료되므로 폴러가 둘이 되지 않음
+                self.stopped = threading.Event()
+                threading.Thread(target=self.run, args=(self.stopped,), daemon=True).start()
+
+    def release(self):
+        with self.lock:
+            self.clients -= 1
+            if self.clients == 0 and self.stopped:
+                self.stopped.set()
+                self.stopped = None
+
+event_feed = SnapshotEventFeed(snapshot_reader) if snapshot_reader else EventFeed()
+
+def request_event_refresh(background_tasks: Optional[BackgroundTasks]):
+    """이벤트 목록 갱신 (production 모드는 스냅샷 반영, 그 외에는 주기적으로 kubectl 전체 조회)"""
+    if isinstance(event_feed, SnapshotEventFeed):
+        event_feed.refresh()
+    elif background_tasks and event_store.should_update():
+        background_tasks.add_task(fetch_events)
+
+# SSE 전송 시 이벤트 스토어에서 한 번에 읽는 이벤트 수
+STREAM_BATCH = 1000
+
+def event_matches(event: MonitoringEvent, event_type: Optional[str], namespace: Optional[str], node: Optional[str]) -> bool:
+    """스트림 필터 (노드는 이벤트를 보고한 호스트 또는 대상 노드 객체 기준)"""
+    if event_type and event.type != event_type:
+        return False
+    if namespace and event.involved_object.get("namespace") != namespace:
+        return False
+    if node and event.source.get("host") != node and not (
+        event.involved_object.get("kind") == "Node" and event.involved_object.get("name") == node
+    ):
+        return False
+    return True
+
+def node_ready_status(item) -> str:
+    """Ready 조건 상태 (True, False, Unknown)"""
+    conditions = item.get("status", {}).get("conditions", [])
+    ready_condition = next(
+        (c for c in conditions if c.get("type") == "Ready"),
+        {"status": "Unknown"}
+    )
+    return ready_condition.get("status", "Unknown")
+
+def node_address(item, address_type: str) -> str:
+    return next(
+        (addr["address"] for addr in item.get("status", {}).get("addresses", [])
+         if addr["type"] == address_type),
+        ""
+    )
+
+# 노드 응답 필드 -> kubectl 노드 항목에서 값을 계산하는 함수 (요청한 필드만 호출)
+NODE_FIELDS = {
+    "name": lambda item: item.get("metadata", {}).get("name", ""),
+    "status": node_ready_status,
+    "roles": lambda item: [item.get("metadata", {}).get("labels", {}).get("kubernetes.io/role", "worker")],
+    "age": lambda item: item.get("metadata", {}).get("creationTimestamp", ""),
+    "version": lambda item: item.get("status", {}).get("nodeInfo", {}).get("kubeletVersion", ""),
+    "internal_ip": lambda item: node_address(item, "InternalIP"),
+    "external_ip": lambda item: node_address(item, "ExternalIP"),
+    "os": lambda item: item.get("status", {}).get("nodeInfo", {}).get("os", ""),
+    "kernel": lambda item: item.get("status", {}).get("nodeInfo", {}).get("kernelVersion", ""),
+    "container_runtime": lambda item: item.get("status", {}).get("nodeInfo", {}).get("containerRuntimeVersion", ""),
+    "architecture": lambda item: item.get("status", {}).get("nodeInfo", {}).get("architecture", ""),
+    "cpu": lambda item: item.get("status", {}).get("capacity", {}).get("cpu", "0"),
+    "memory": lambda item: item.get("status", {}).get("capacity", {}).get("memory", "0"),
+    "pods": lambda item: item.get("status", {}).get("capacity", {}).get("pods", "0"),
+    "unschedulable": lambda item: item.get("spec", {}).get("unschedulable", False),
+}
+
+# 노드별 분포 필드 (클러스터 상태에서는 파드 목록을 채우지 않음)
+DISTRIBUTION_FIELDS = ["node_name", "pod_count", "ready_count", "pods"]
+
+# 필드 선택 스키마와 이름 있는 view 프로필 (full은 전체)
+CLUSTER_SCHEMA = {
+    "timestamp": None,
+    "nodes": NODE_FIELDS,
+    "pod_distribution": dict.fromkeys(DISTRIBUTION_FIELDS),
+    "total_nodes": None,
+    "ready_nodes": None,
+    "total_pods": None,
+    "running_pods": None,
+}
+CLUSTER_VIEWS = {
+    "summary": ["timestamp", "total_nodes", "ready_nodes", "total_pods", "running_pods",
+                "nodes.name", "nodes.status", "nodes.roles",
+                "pod_distribution.node_name", "pod_distribution.pod_count", "pod_distribution.ready_count"],
+    "full": None,
+}
+
 @router.get("/monitoring/cluster", response_model=ClusterStatus)
-async def get_cluster_status():
-    """클러스터 상태 조회"""
+async def get_cluster_status(
+    fields: Optional[str] = Query(None, description="응답 필드 (쉼표 구분, 예: total_pods,nodes.name,nodes.status)"),
+    view: Optional[str] = Query(None, description="필드 프로필: summary, full (기본: full)")
+):
+    """클러스터 상태 조회 (요청한 필드만 계산해 응답)"""
+    try:
+        selection = FieldSelection.parse(CLUSTER_SCHEMA, fields, view, CLUSTER_VIEWS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     try:
         # 노드 정보 조회
-        nodes_cmd = ["kubectl", "get", "nodes", "-o", "json"]
-        nodes_output = run_kubectl_command(nodes_cmd)
-        nodes_data = json.loads(nodes_output)
+        node_items = list_node_items()
         
-        # 파드 정보 조회
-        pods_cmd = ["kubectl", "get", "pods", "-o", "json", "--all-namespaces"]
-        pods_output = run_kubectl_command(pods_cmd)
-        pods_data = json.loads(pods_output)
-        
-        # 노드 정보 파싱
-        nodes = []
-        for item in nodes_data.get("items", []):
-            metadata = item.get("metadata", {})
-            status = item.get("status", {})
-            spec = item.get("spec", {})
-            
-            # 노드 상태 파싱
-            conditions = status.get("conditions", [])
-            ready_condition = next(
-                (c for c in conditions if c.get("type") == "Ready"),
-                {"status": "Unknown"}
-            )
-            
-            # 노드 정보 구성
-            node = Node(
-                name=metadata.get("name", ""),
-                status=ready_condition.get("status", "Unknown"),
-                roles=[metadata.get("labels", {}).get("kubernetes.io/role", "worker")],
-                age=metadata.get("creationTimestamp", ""),
-                version=status.get("nodeInfo", {}).get("kubeletVersion", ""),
-                internal_ip=next(
-                    (addr["address"] for addr in status.get("addresses", [])
-                     if addr["type"] == "InternalIP"),
-                    ""
-                ),
-                external_ip=next(
-                    (addr["address"] for addr in status.get("addresses", [])
-                     if addr["type"] == "ExternalIP"),
-                    ""
-                ),
-                os=status.get("nodeInfo", {}).get("os", ""),
-                kernel=status.get("nodeInfo", {}).get("kernelVersion", ""),
-                container_runtime=status.get("nodeInfo", {}).get("containerRuntimeVersion", ""),
-                architecture=status.get("nodeInfo", {}).get("architecture", ""),
-                cpu=status.get("capacity", {}).get("cpu", "0"),
-                memory=status.get("capacity", {}).get("memory", "0"),
-                pods=status.get("capacity", {}).get("pods", "0"),
-                unschedulable=spec.get("unschedulable", False)
-            )
-            nodes.append(node)
-        
-        # 노드별 파드 분포 계산
+        # 노드별 파드 분포 계산 (노드/phase 두 열만 조회)
         node_pods = {}
-        for pod in pods_data.get("items", []):
-            node_name = pod["spec"].get("nodeName", "unknown")
+        for node_name, phase in list_pod_phases():
             if node_name not in node_pods:
                 node_pods[node_name] = {"total": 0, "ready": 0}
             
             node_pods[node_name]["total"] += 1
-            if pod["status"].get("phase") == "Running":
+            if phase == "Running":
                 node_pods[node_name]["ready"] += 1
         
-        # 파드 분포 정보 구성
-        pod_distribution = [
-            PodDistribution(
-                node_name=node,
-                pod_count=info["total"],
-                ready_count=info["ready"],
-                pods=[]  # 필요한 경우 파드 상세 정보 추가
-            )
-            for node, info in node_pods.items()
-        ]
+        # 노드별 상태/파드 수를 지표 저장소에 기록 (응답 필드와 무관하게 이름과 Ready만 계산)
+        recorded_at = datetime.now().timestamp()
+        node_ready = {NODE_FIELDS["name"](item): node_ready_status(item) == "True" for item in node_items}
+        for name, ready in node_ready.items():
+            info = node_pods.get(name, {"total": 0, "ready": 0})
+            metric_store.record(name, {
+                "node_ready": 1.0 if ready else 0.0,
+                "pod_count": info["total"],
+                "ready_pods": info["ready"],
+            }, timestamp=recorded_at)
         
-        # 클러스터 상태 구성
-        return ClusterStatus(
-            timestamp=datetime.utcnow(),
-            nodes=nodes,
-            pod_distribution=pod_distribution,
-            total_nodes=len(nodes),
-            ready_nodes=sum(1 for node in nodes if node.status == "True"),
-            total_pods=sum(info["total"] for info in node_pods.values()),
-            running_pods=sum(info["ready"] for info in node_pods.values())
-        )
+        # 클러스터 상태 구성 (요청한 필드만)
+        distribution_values = {
+            "node_name": lambda node_name, info: node_name,
+            "pod_count": lambda node_name, info: info["total"],
+            "ready_count": lambda node_name, info: info["ready"],
+            "pods": lambda node_name, info: [],  # 필요한 경우 파드 상세 정보 추가
+        }
+        values = {
+            "timestamp": lambda: datetime.utcnow(),
+            "nodes": lambda: [project(item, NODE_FIELDS, selection.child("nodes")) for item in node_items],
+            "pod_distribution": lambda: [
+                {
+                    name: distribution_values[name](node_name, info)
+                    for name in selection.child("pod_distribution").select(DISTRIBUTION_FIELDS)
+                }
+                for node_name, info in node_pods.items()
+            ],
+            "total_nodes": lambda: len(node_items),
+            "ready_nodes": lambda: sum(1 for ready in node_ready.values() if ready),
+            "total_pods": lambda: sum(info["total"] for info in node_pods.values()),
+            "running_pods": lambda: sum(info["ready"] for info in node_pods.values()),
+        }
+        data = {name: values[name]() for name in selection.select(CLUSTER_SCHEMA)}
+        
+        if selection.is_full:
+            return ClusterStatus(**data)
+        # 일부 필드만 요청한 경우 응답 모델 검증 없이 그대로 직렬화
+        return JSONResponse(content=jsonable_encoder(data))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/monitoring/events", response_model=List[MonitoringEvent])
 async def get_monitoring_events(background_tasks: BackgroundTasks, limit: int = 50):
     """모니터링 이벤트 조회"""
-    if event_store.should_update():
-        background_tasks.add_task(fetch_events)
+    request_event_refresh(background_tasks)
     return event_store.get_events(limit)
 
+@router.get("/monitoring/events/stream")
+async def stream_monitoring_events(
+    request: Request,
+    event_type: Optional[str] = Query(None, alias="type", description="이벤트 타입 (Normal, Warning)"),
+    namespace: Optional[str] = Query(None, description="대상 객체 네임스페이스"),
+    node: Optional[str] = Query(None, description="노드명"),
+    backlog: int = Query(0, ge=0, le=1000, description="처음 연결 시 함께 보낼 최근 이벤트 수"),
+    last_event_id: Optional[int] = Header(None, description="마지막으로 받은 이벤트 순번 (재연결 시 브라우저가 전송)")
+):
+    """새 모니터링 이벤트를 Server-Sent Events로 전달
+    - 각 메시지의 id는 이벤트 순번이며 Last-Event-ID로 재연결하면 그 이후부터 이어서 전송
+    - 필터는 서버에서 적용하고 일정 시간 이벤트가 없으면 연결 유지용 주석을 전송
+    """
+    loop = asyncio.get_running_loop()
+    wake = asyncio.Event()
+    
+    def on_added(entries):
+        loop.call_soon_threadsafe(wake.set)
+    
+    async def stream():
+        event_store.subscribe("events_added", on_added)
+        try:
+            # watch 시작(kubectl 실행)과 스냅샷 읽기는 이벤트 루프를 막지 않도록 스레드에서 처리
+            await loop.run_in_executor(None, event_feed.acquire)
+            # 다른 워커에서 받은 순번으로 재연결할 수 있으므로 최신 스냅샷을 먼저 반영
+            await loop.run_in_executor(None, request_event_refresh, None)
+            # 서버 재시작 등으로 순번이 앞선 Last-Event-ID는 무시하고 새로 시작
+            if last_event_id is not None and last_event_id <= event_store.last_seq:
+                cursor = last_event_id
+            else:
+                cursor = max(0, event_store.last_seq - backlog)
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                wake.clear()
+                # 밀린 이벤트가 한 번의 조회 한도보다 많으면 다 보낼 때까지 이어서 조회
+                while True:
+                    entries = event_store.events_since(cursor, limit=STREAM_BATCH)
+                    for seq, event in entries:
+                        cursor = seq
+                        if event_matches(event, event_type, namespace, node):
+                            yield f"id: {seq}\nevent: monitoring_event\ndata: {json.dumps(jsonable_encoder(event), ensure_ascii=False)}\n\n"
+                    if len(entries) < STREAM_BATCH:
+                        break
+                try:
+                    await asyncio.wait_for(wake.wait(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+        finally:
+            event_store.unsubscribe("events_added", on_added)
+            # watch 중지는 프로세스 종료를 기다리므로 스레드에서 처리
+            await loop.run_in_executor(None, event_feed.release)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/", response_model=MonitoringResponse)
 async def get_monitoring_data(background_tasks: BackgroundTasks):
     """전체 모니터링 데이터 조회"""
     try:
         # 클러스터 상태 조회
-        cluster_status = await get_cluster_status()
+        cluster_status = await get_cluster_status(fields=None, view=None)
         
         # 이벤트 업데이트 필요시 백그라운드에서 실행
-        if event_store.should_update():
-            background_tasks.add_task(fetch_events)
+        request_event_refresh(background_tasks)
         
         return MonitoringResponse(
             cluster_status=cluster_status,
@@ -10,6 +10,7 @@ import json
 import logging
 
 from app.models.schemas import Node, NodeList
+from app.stores.snapshot_store import snapshot_reader
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -27,16 +28,19 @@ def run_kubectl_command(command: List[str]) -> str:
     except subprocess.CalledProcessError as e:
         raise HTTPException(status_code=500, detail=f"kubectl 명령 실행 실패: {e.stderr}")
 
+def list_node_items() -> List[dict]:
+    """노드 항목 전체 (production 모드에서는 수집 프로세스 스냅샷)"""
+    if snapshot_reader:
+        return snapshot_reader.get("nodes", {}).get("items", [])
+    nodes_cmd = ["kubectl", "get", "nodes", "-o", "json"]
+    return json.loads(run_kubectl_command(nodes_cmd)).get("items", [])
+
 @router.get("/nodes", response_model=NodeList)
 async def get_nodes():
     """노드 목록 조회"""
     try:
-        cmd = ["kubectl", "get", "nodes", "-o", "json"]
-        output = run_kubectl_command(cmd)
-        data = json.loads(output)
-        
         nodes = []
-        for item in data.get("items", []):
+        for item in list_node_items():
             metadata = item.get("metadata", {})
             status = item.get("status", {})
             spec = item.get("spec", {})
@@ -3,8 +3,9 @@
 파드 관련 API 라우터
 """
 
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
+from typing import List, Optional, Tuple
 import subprocess
 import json
 import logging
@@ -12,9 +13,10 @@ from datetime import datetime
 
 from app.models.schemas import (
     PodInfo, PodListResponse, PodDistribution,
-    PodDistributionResponse, IntegratedPodData,
-    MonitoringEvent
+    PodDistributionResponse, IntegratedPodData
 )
+from app.core.projection import FieldSelection, project
+from app.stores.snapshot_store import snapshot_reader
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -36,12 +38,8 @@ def run_kubectl_command(command: List[str]) -> str:
 async def get_pods():
     """파드 목록 조회"""
     try:
-        cmd = ["kubectl", "get", "pods", "-o", "json", "--all-namespaces"]
-        output = run_kubectl_command(cmd)
-        data = json.loads(output)
-        
         pods = []
-        for item in data.get("items", []):
+        for item in list_pod_items():
             metadata = item.get("metadata", {})
             spec = item.get("spec", {})
             status = item.get("status", {})
@@ -78,13 +76,9 @@ async def get_pods():
 async def get_pod_distribution():
     """파드 분포 조회"""
     try:
-        cmd = ["kubectl", "get", "pods", "-o", "json", "--all-namespaces"]
-        output = run_kubectl_command(cmd)
-        data = json.loads(output)
-        
         # 노드별 파드 분포 계산
         node_pods = {}
-        for item in data.get("items", []):
+        for item in list_pod_items():
             node_name = item["spec"].get("nodeName", "unknown")
             if node_name not in node_pods:
                 node_pods[node_name] = {
@@ -144,112 +138,167 @@ async def get_pod_distribution():
         logger.error(f"파드 분포 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def container_ready(item) -> str:
+    """준비된 컨테이너 수 (예: 1/2)"""
+    container_statuses = item.get("status", {}).get("containerStatuses", [])
+    ready_count = sum(1 for cs in container_statuses if cs.get("ready", False))
+    return f"{ready_count}/{len(container_statuses)}"
+
+def pod_node_name(item) -> str:
+    return item.get("spec", {}).get("nodeName", "unknown")
+
+# 파드 응답 필드 -> kubectl 파드 항목에서 값을 계산하는 함수 (요청한 필드만 호출)
+POD_FIELDS = {
+    "name": lambda item: item.get("metadata", {}).get("name", ""),
+    "namespace": lambda item: item.get("metadata", {}).get("namespace", ""),
+    "status": lambda item: item.get("status", {}).get("phase", "Unknown"),
+    "ready": container_ready,
+    "restarts": lambda item: sum(cs.get("restartCount", 0) for cs in item.get("status", {}).get("containerStatuses", [])),
+    "age": lambda item: item.get("metadata", {}).get("creationTimestamp", ""),
+    "ip": lambda item: item.get("status", {}).get("podIP"),
+    "node": pod_node_name,
+    "nominated_node": lambda item: item.get("status", {}).get("nominatedNodeName"),
+    "readiness_gates": lambda item: ",".join(gate.get("conditionType", "") for gate in item.get("spec", {}).get("readinessGates", [])),
+}
+
+# 이벤트 응답 필드 -> kubectl 이벤트 항목에서 값을 계산하는 함수
+EVENT_FIELDS = {
+    "id": lambda event: event.get("metadata", {}).get("uid", ""),
+    "type": lambda event: event.get("type", "Normal"),
+    "reason": lambda event: event.get("reason", ""),
+    "message": lambda event: event.get("message", ""),
+    "timestamp": lambda event: event.get("lastTimestamp", datetime.now().isoformat()),
+    "source": lambda event: {
+        "component": event.get("source", {}).get("component", ""),
+        "host": event.get("source", {}).get("host")
+    },
+    "involved_object": lambda event: {
+        "kind": event.get("involvedObject", {}).get("kind", ""),
+        "name": event.get("involvedObject", {}).get("name", ""),
+        "namespace": event.get("involvedObject", {}).get("namespace", "")
+    },
+}
+
+# 노드별 분포 필드 (파드 목록은 요청 시에만 구성)
+DISTRIBUTION_FIELDS = ["node_name", "pod_count", "ready_count", "pods"]
+
+# 필드 선택 스키마와 이름 있는 view 프로필 (full은 전체)
+INTEGRATED_SCHEMA = {
+    "timestamp": None,
+    "pod_distribution": {**dict.fromkeys(DISTRIBUTION_FIELDS), "pods": POD_FIELDS},
+    "events": EVENT_FIELDS,
+    "summary": None,
+}
+INTEGRATED_VIEWS = {
+    "summary": ["timestamp", "summary", "pod_distribution.node_name", "pod_distribution.pod_count",
+                "pod_distribution.ready_count"],
+    "full": None,
+}
+
+def list_pod_items() -> List[dict]:
+    """파드 항목 전체 (production 모드에서는 수집 프로세스 스냅샷)"""
+    if snapshot_reader:
+        return snapshot_reader.get("pods", {}).get("items", [])
+    pods_cmd = ["kubectl", "get", "pods", "-o", "json", "--all-namespaces"]
+    return json.loads(run_kubectl_command(pods_cmd)).get("items", [])
+
+def list_pod_phases() -> List[Tuple[str, str]]:
+    """파드별 (노드, phase)만 조회 (전체 JSON 대신 두 열만 받음)"""
+    if snapshot_reader:
+        return [(pod_node_name(item), item.get("status", {}).get("phase", "Unknown")) for item in list_pod_items()]
+    cmd = [
+        "kubectl", "get", "pods", "--all-namespaces", "--no-headers",
+        "-o", "custom-columns=NODE:.spec.nodeName,PHASE:.status.phase"
+    ]
+    phases = []
+    for line in run_kubectl_command(cmd).splitlines():
+        parts = line.split()
+        if len(parts) == 2:
+            node_name, phase = parts
+            phases.append(("unknown" if node_name == "<none>" else node_name, phase))
+    return phases
+
 @router.get("/pods/integrated", response_model=IntegratedPodData)
-async def get_integrated_pod_data():
-    """통합 파드 데이터 조회"""
+async def get_integrated_pod_data(
+    fields: Optional[str] = Query(None, description="응답 필드 (쉼표 구분, 예: summary,pod_distribution.node_name,events.reason)"),
+    view: Optional[str] = Query(None, description="필드 프로필: summary, full (기본: full)")
+):
+    """통합 파드 데이터 조회 (요청한 필드만 계산해 응답)"""
     try:
-        # 파드 정보 조회
-        pods_cmd = ["kubectl", "get", "pods", "-o", "json", "--all-namespaces"]
-        pods_output = run_kubectl_command(pods_cmd)
-        pods_data = json.loads(pods_output)
-        
-        # 이벤트 정보 조회
-        events_cmd = ["kubectl", "get", "events", "-o", "json", "--all-namespaces"]
-        events_output = run_kubectl_command(events_cmd)
-        events_data = json.loads(events_output)
+        selection = FieldSelection.parse(INTEGRATED_SCHEMA, fields, view, INTEGRATED_VIEWS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        distribution_selection = selection.child("pod_distribution")
+        pod_selection = distribution_selection.child("pods")
+        with_pods = selection.wants("pod_distribution") and distribution_selection.wants("pods")
         
-        # 노드별 파드 분포 계산
+        # 노드별 파드 분포 계산 (파드 상세가 필요 없으면 노드/phase만 조회)
         node_pods = {}
         total_pods = 0
         running_pods = 0
         active_nodes = set()
         
-        for item in pods_data.get("items", []):
-            node_name = item["spec"].get("nodeName", "unknown")
+        if with_pods:
+            items = list_pod_items()
+            placements = [(pod_node_name(item), item.get("status", {}).get("phase"), item) for item in items]
+        else:
+            placements = [(node_name, phase, None) for node_name, phase in list_pod_phases()]
+        
+        for node_name, phase, item in placements:
             if node_name not in node_pods:
                 node_pods[node_name] = {
                     "pod_count": 0,
                     "ready_count": 0,
                     "pods": []
                 }
-            
-            # 파드 정보 파싱
-            metadata = item.get("metadata", {})
-            spec = item.get("spec", {})
-            status = item.get("status", {})
-            
-            # 컨테이너 상태 파싱
-            container_statuses = status.get("containerStatuses", [])
-            ready_count = sum(1 for cs in container_statuses if cs.get("ready", False))
-            total_count = len(container_statuses)
-            ready = f"{ready_count}/{total_count}" if total_count > 0 else "0/0"
-            
-            # 재시작 횟수 계산
-            restarts = sum(cs.get("restartCount", 0) for cs in container_statuses)
-            
-            pod = PodInfo(
-                name=metadata.get("name", ""),
-                namespace=metadata.get("namespace", ""),
-                status=status.get("phase", "Unknown"),
-                ready=ready,
-                restarts=restarts,
-                age=metadata.get("creationTimestamp", ""),
-                ip=status.get("podIP"),
-                node=node_name,
-                nominated_node=status.get("nominatedNodeName"),
-                readiness_gates=",".join(gate.get("conditionType", "") for gate in spec.get("readinessGates", []))
-            )
-            
-            node_pods[node_name]["pods"].append(pod)
+            if item is not None:
+                node_pods[node_name]["pods"].append(project(item, POD_FIELDS, pod_selection))
             node_pods[node_name]["pod_count"] += 1
-            if status.get("phase") == "Running":
+            if phase == "Running":
                 node_pods[node_name]["ready_count"] += 1
                 running_pods += 1
                 active_nodes.add(node_name)
             total_pods += 1
         
-        # 파드 분포 리스트 생성
-        pod_distribution = [
-            PodDistribution(
-                node_name=node_name,
-                pod_count=data["pod_count"],
-                ready_count=data["ready_count"],
-                pods=data["pods"]
-            )
-            for node_name, data in node_pods.items()
-        ]
-        
-        # 이벤트 정보 파싱
-        events = []
-        for event in events_data.get("items", []):
-            events.append(MonitoringEvent(
-                id=event.get("metadata", {}).get("uid", ""),
-                type=event.get("type", "Normal"),
-                reason=event.get("reason", ""),
-                message=event.get("message", ""),
-                timestamp=event.get("lastTimestamp", datetime.now().isoformat()),
-                source={
-                    "component": event.get("source", {}).get("component", ""),
-                    "host": event.get("source", {}).get("host")
-                },
-                involved_object={
-                    "kind": event.get("involvedObject", {}).get("kind", ""),
-                    "name": event.get("involvedObject", {}).get("name", ""),
-                    "namespace": event.get("involvedObject", {}).get("namespace", "")
+        data = {}
+        if selection.wants("timestamp"):
+            data["timestamp"] = datetime.now().isoformat()
+        if selection.wants("pod_distribution"):
+            data["pod_distribution"] = [
+                {
+                    name: node_name if name == "node_name" else info[name]
+                    for name in distribution_selection.select(DISTRIBUTION_FIELDS)
                 }
-            ))
-        
-        return IntegratedPodData(
-            timestamp=datetime.now().isoformat(),
-            pod_distribution=pod_distribution,
-            events=events,
-            summary={
+                for node_name, info in node_pods.items()
+            ]
+        if selection.wants("events"):
+            # 이벤트는 요청했을 때만 조회
+            event_selection = selection.child("events")
+            if snapshot_reader:
+                # 수집 프로세스가 변환해 둔 이벤트에서 필드만 선택
+                entries = snapshot_reader.get("events", {}).get("entries", [])
+                data["events"] = [
+                    {name: event[name] for name in event_selection.select(EVENT_FIELDS)}
+                    for _, event in entries
+                ]
+            else:
+                events_cmd = ["kubectl", "get", "events", "-o", "json", "--all-namespaces"]
+                events_data = json.loads(run_kubectl_command(events_cmd))
+                data["events"] = [project(event, EVENT_FIELDS, event_selection) for event in events_data.get("items", [])]
+        if selection.wants("summary"):
+            data["summary"] = {
                 "total_pods": total_pods,
                 "running_pods": running_pods,
                 "total_nodes": len(node_pods),
                 "active_nodes": len(active_nodes)
             }
-        )
+        
+        if selection.is_full:
+            return IntegratedPodData(**data)
+        # 일부 필드만 요청한 경우 응답 모델 검증 없이 그대로 직렬화
+        return JSONResponse(content=data)
     except Exception as e:
         logger.error(f"통합 파드 데이터 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
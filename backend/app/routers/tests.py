@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+테스트 결과 관련 API 라우터
+"""
+
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+
+from app.models.schemas import TestResult, TestResultsResponse, TestStatsResponse
+from app.stores.result_store import result_store
+
+router = APIRouter()
+
+# SQLite 조회는 블로킹이므로 async가 아닌 함수로 선언해 스레드 풀에서 실행
+
+@router.get("/tests", response_model=TestResultsResponse)
+def get_test_results(
+    method: Optional[str] = Query(None, description="격리 방법"),
+    node: Optional[str] = Query(None, description="대상 노드"),
+    kind: Optional[str] = Query(None, description="isolation, integrated, matrix"),
+    success: Optional[bool] = Query(None, description="성공 여부"),
+    since: Optional[float] = Query(None, description="시작 시각 하한 (epoch 초)"),
+    until: Optional[float] = Query(None, description="시작 시각 상한 (epoch 초)"),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0)
+):
+    """테스트 결과 목록 (최근 순)"""
+    results, total = result_store.query(
+        limit=limit, offset=offset,
+        method=method, node_name=node, kind=kind, success=success, since=since, until=until
+    )
+    return TestResultsResponse(results=[TestResult(**result) for result in results], total_count=total)
+
+@router.get("/tests/stats", response_model=TestStatsResponse)
+def get_test_stats(
+    group_by: str = Query("method", description="집계 기준 (쉼표 구분: method, node, kind, window)"),
+    window: int = Query(3600, ge=1, description="window 집계 구간 크기 (초)"),
+    metrics: Optional[str] = Query(None, description="집계할 지표 (쉼표 구분, 기본: 전체)"),
+    method: Optional[str] = Query(None, description="격리 방법"),
+    node: Optional[str] = Query(None, description="대상 노드"),
+    kind: Optional[str] = Query(None, description="isolation, integrated, matrix"),
+    success: Optional[bool] = Query(None, description="성공 여부"),
+    since: Optional[float] = Query(None, description="시작 시각 하한 (epoch 초)"),
+    until: Optional[float] = Query(None, description="시작 시각 상한 (epoch 초)")
+):
+    """방법/노드/종류/시간 구간별 실행 수, 성공 수, 지표 통계"""
+    keys = [key.strip() for key in group_by.split(",") if key.strip()]
+    options = {'metrics': [m.strip() for m in metrics.split(",") if m.strip()]} if metrics else {}
+    try:
+        groups = result_store.aggregate(
+            group_by=keys, window=window, **options,
+            method=method, node_name=node, kind=kind, success=success, since=since, until=until
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return TestStatsResponse(group_by=keys, window=window if "window" in keys else None, groups=groups)
+
+@router.get("/tests/{test_id}", response_model=TestResult)
+def get_test_result(test_id: str):
+    """테스트 결과 단건 (원본 상세 포함)"""
+    result = result_store.get(test_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"테스트 결과를 찾을 수 없습니다: {test_id}")
+    return result
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+공유 노드/파드 변경 피드 모듈
+격리 작업마다 클러스터 전체 watch를 띄우지 않고 워커당 하나의 피드를 실행 중인 타임라인에 나눠 전달
+"""
+
+import sys
+import os
+import time
+import threading
+from typing import Callable, Dict, List
+
+# 기존 스크립트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../"))
+from tools.kube_watch import KubeWatch
+
+from app.stores.snapshot_store import snapshot_reader
+
+KINDS = ("nodes", "pods")
+
+class ClusterFeed:
+    """구독자 관리 (IsolationTimeline의 source 인터페이스: subscribe/unsubscribe)
+    - 첫 구독자가 생기면 _start, 마지막 구독자가 빠지면 _stop 호출
+    - callback(event_type, obj, received_at) 형태로 전달
+    """
+
+    def __init__(self):
+        self.subscribers: Dict[str, List[Callable]] = {kind: [] for kind in KINDS}
+        self.lock = threading.Lock()
+
+    def subscribe(self, kind, callback):
+        with self.lock:
+            first = not any(self.subscribers.values())
+            self.subscribers[kind].append(callback)
+            if first:
+                self._start()
+
+    def unsubscribe(self, kind, callback):
+        with self.lock:
+            if callback in self.subscribers[kind]:
+                self.subscribers[kind].remove(callback)
+                if not any(self.subscribers.values()):
+                    self._stop()
+
+    def emit(self, kind, event_type, obj, received_at):
+        for callback in list(self.subscribers[kind]):
+            try:
+                callback(event_type, obj, received_at)
+            except Exception as e:
+                print(f"클러스터 피드 이벤트 처리 오류: {e}")
+
+class WatchClusterFeed(ClusterFeed):
+    """development 모드: 노드 watch와 전체 네임스페이스 파드 watch 한 쌍을 모든 타임라인이 공유
+    - watch_only로 시작하므로 구독 이후의 변경만 전달
+    - 마지막 구독자가 빠진 뒤 linger초 동안 새 구독이 없으면 watch 중지 (연속 실행 시 재연결 방지)
+    """
+
+    def __init__(self, linger: float = 30):
+        super().__init__()
+        self.linger = linger
+        self.watches = []
+        self.idle_timer = None
+
+    def _start(self):
+        if self.idle_timer:
+            self.idle_timer.cancel()
+            self.idle_timer = None
+        if self.watches:
+            return
+        self.watches = [
+            KubeWatch("nodes", lambda et, obj, ts: self.emit("nodes", et, obj, ts), watch_only=True),
+            KubeWatch("pods", lambda et, obj, ts: self.emit("pods", et, obj, ts), all_namespaces=True, watch_only=True),
+        ]
+        for watch in self.watches:
+            watch.start()
+
+    def _stop(self):
+        self.idle_timer = threading.Timer(self.linger, self._stop_if_idle)
+        self.idle_timer.daemon = True
+        self.idle_timer.start()
+
+    def _stop_if_idle(self):
+        with self.lock:
+            if any(self.subscribers.values()) or not self.watches:
+                return
+            watches, self.watches, self.idle_timer = self.watches, [], None
+        for watch in watches:
+            watch.stop()
+
+class SnapshotClusterFeed(ClusterFeed):
+    """production 모드: 수집 프로세스가 발행한 nodes/pods 스냅샷을 비교해 변경 이벤트로 전달
+    - 구독자가 있는 동안 poll_interval초마다 스냅샷 파일 버전만 확인하고 바뀌었을 때만 비교
+    - 수신 시각은 수집 프로세스가 watch 이벤트를 받은 시각 (스냅샷 발행 주기만큼 늦어지지 않음)
+    - 워커마다 kubectl watch를 띄우지 않으므로 upstream watch는 수집 프로세스의 한 세트뿐
+    """
+
+    def __init__(self, reader, poll_interval: float = 0.2):
+        super().__init__()
+        self.reader = reader
+        self.poll_interval = poll_interval
+        self.versions = {}
+        self.objects = {} # 종류 -> uid -> 객체 (마지막으로 비교한 스냅샷)
+        self.stopped = None
+        self.refresh_lock = threading.Lock()
+
+    @staticmethod
+    def object_key(obj):
+        return obj.get("metadata", {}).get("uid") or obj.get("metadata", {}).get("name")
+
+    def refresh(self, emit=True):
+        """스냅샷이 바뀌었으면 이전 목록과 비교해 ADDED/MODIFIED/DELETED 전달 (emit=False면 기준 목록만 갱신)"""
+        with self.refresh_lock:
+            for kind in KINDS:
+                self._refresh_kind(kind, emit)
+
+    def _refresh_kind(self, kind, emit):
+        version = self.reader.version(kind)
+        if version is None or version == self.versions.get(kind):
+            return
+        data = self.reader.get(kind, {})
+        self.versions[kind] = version
+        current = {self.object_key(obj): obj for obj in data.get("items", [])}
+        previous, self.objects[kind] = self.objects.get(kind, {}), current
+        if not emit:
+            return
+        received = data.get("received_at", {})
+        published_at = data.get("published_at", time.time())
+        changes = []
+        for uid, obj in current.items():
+            old = previous.get(uid)
+            if old is None:
+                changes.append((received.get(uid, published_at), "ADDED", obj))
+            elif old.get("metadata", {}).get("resourceVersion") != obj.get("metadata", {}).get("resourceVersion"):
+                changes.append((received.get(uid, published_at), "MODIFIED", obj))
+        for uid, obj in previous.items():
+            if uid not in current:
+                changes.append((received.get(uid, published_at), "DELETED", obj))
+        # 수신 순서대로 전달 (마지막 대체 파드 Ready 등 순서에 따라 갱신되는 시점 보존)
+        for received_at, event_type, obj in sorted(changes, key=lambda change: change[0]):
+            self.emit(kind, event_type, obj, received_at)
+
+    def run(self, stopped):
+        while not stopped.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"클러스터 스냅샷 비교 실패: {e}")
+
+    def _start(self):
+        # 구독 시점의 목록을 기준으로 삼아 이후 변경만 전달 (watch_only와 같은 동작)
+        self.versions, self.objects = {}, {}
+        try:
+            self.refresh(emit=False)
+        except Exception as e:
+            print(f"클러스터 스냅샷 읽기 실패: {e}")
+        # 폴링 스레드마다 중지 신호를 따로 두어 재시작 직후 이전 스레드가 계속 돌지 않도록 함
+        self.stopped = threading.Event()
+        threading.Thread(target=self.run, args=(self.stopped,), daemon=True, name="cluster-feed").start()
+
+    def _stop(self):
+        if self.stopped:
+            self.stopped.set()
+            self.stopped = None
+
+# 실행 중인 격리 작업의 타임라인이 함께 구독
+cluster_feed = SnapshotClusterFeed(snapshot_reader) if snapshot_reader else WatchClusterFeed()
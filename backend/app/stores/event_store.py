@@ -3,20 +3,29 @@
 이벤트 스토어 모듈
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+from collections import deque
 import asyncio
+import threading
+from app.core.config import settings
 from app.models.schemas import MonitoringEvent
 
 class EventStore:
     """이벤트 스토어 싱글톤
     - 시스템 전체에서 하나의 인스턴스만 사용
+    - 새로 들어온 이벤트(같은 이벤트라도 발생 시각이 바뀌면 새 발생)에 증가하는 순번을 붙여
+      최근 EVENT_STREAM_BUFFER개를 보관하고, 스트림 구독자는 마지막으로 받은 순번 이후만 읽음
     """
     _instance = None
     _events: List[MonitoringEvent] = [] #저장된 이벤트 목록
     _subscribers: Dict[str, List[callable]] = {}
     _last_update: Optional[datetime] = None
     _update_interval = 30  # 초
+    _log: deque = deque(maxlen=settings.EVENT_STREAM_BUFFER) # (순번, 이벤트)
+    _seen: Dict[tuple, int] = {} # 이벤트 발생 키 -> 순번 (중복 수신 제거)
+    _seq = 0
+    _lock = threading.Lock() # watch 스레드와 API 요청이 함께 기록
 
     def __new__(cls):
     #클래스 첫 인스턴스 생성 시에만 새 인스턴스 생성
@@ -36,14 +45,68 @@ class EventStore:
 
     def notify_subscribers(self, event_type: str, data: Any): # 구독자에게 알림
         if event_type in self._subscribers:
-            for callback in self._subscribers[event_type]:
+            for callback in list(self._subscribers[event_type]): # 알림 중 구독 해제 허용
                 callback(data)
 
     def update_events(self, events: List[MonitoringEvent]): # 이벤트 업데이트
         self._events = events
         self._last_update = datetime.utcnow()
+        self.add_events(events)
         self.notify_subscribers("events_updated", events)
 
+    def add_events(self, events: List[MonitoringEvent]) -> List[Tuple[int, MonitoringEvent]]:
+        """처음 보는 이벤트 발생에 순번을 붙여 기록하고 "events_added" 구독자에게 알림"""
+        added = []
+        with self._lock:
+            for event in events:
+                key = (event.id, event.timestamp, event.message)
+                if key in self._seen:
+                    continue
+                if len(self._log) == self._log.maxlen:
+                    _, oldest = self._log[0]
+                    self._seen.pop((oldest.id, oldest.timestamp, oldest.message), None)
+                self._seq += 1
+                self._seen[key] = self._seq
+                self._log.append((self._seq, event))
+                added.append((self._seq, event))
+        if added:
+            self.notify_subscribers("events_added", added)
+        return added
+
+    def ingest(self, last_seq: int, entries: List[Tuple[int, MonitoringEvent]]) -> List[Tuple[int, MonitoringEvent]]:
+        """다른 프로세스가 순번을 붙인 이벤트 반영 (production 모드 워커, 순번을 그대로 유지)
+        - 발행 측 순번이 줄었으면(수집 프로세스 재시작) 기록을 비우고 새로 시작
+        """
+        with self._lock:
+            if last_seq < self._seq:
+                self._log.clear()
+                self._seen.clear()
+                self._seq = 0
+            added = [(seq, event) for seq, event in entries if seq > self._seq]
+            self._log.extend(added)
+            self._seq = max(self._seq, last_seq)
+            self._events = [event for _, event in self._log]
+            self._last_update = datetime.utcnow()
+        if added:
+            self.notify_subscribers("events_added", added)
+        return added
+
+    def events_since(self, last_seq: int, limit: int = 1000) -> List[Tuple[int, MonitoringEvent]]:
+        """last_seq 이후 순번의 이벤트 (보관 범위를 벗어난 순번이면 남아 있는 가장 오래된 것부터)"""
+        entries = []
+        with self._lock:
+            # 새 이벤트는 끝에 있으므로 뒤에서부터 last_seq까지만 확인
+            for seq, event in reversed(self._log):
+                if seq <= last_seq:
+                    break
+                entries.append((seq, event))
+        entries.reverse()
+        return entries[:limit]
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
     def get_events(self, limit: int = 50) -> List[MonitoringEvent]: # 이벤트 조회
         return self._events[:limit] # 반환할 이벤트 수 제한
 
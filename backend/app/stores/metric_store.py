@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+노드 지표 저장소 모듈
+"""
+
+import sys
+import os
+
+# 기존 스크립트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../"))
+from tools.metric_store import MetricStore
+
+from app.core.config import settings
+
+# 프로세스 전역 지표 저장소 (스크립트 전송분 + 클러스터 상태 조회 결과)
+metric_store = MetricStore(memory_budget=settings.METRIC_STORE_BUDGET_MB * 1024 * 1024)
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+테스트 결과 저장소 모듈
+"""
+
+import sys
+import os
+
+# 기존 스크립트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../"))
+from tools.result_store import TestResultStore
+
+from app.core.config import settings
+
+# 프로세스 전역 결과 저장소 (API 격리 작업 + 스크립트 실행 결과가 같은 파일에 기록됨)
+result_store = TestResultStore(settings.RESULT_DB_PATH or None)
@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+수집 프로세스 스냅샷 모듈
+"""
+
+import sys
+import os
+
+# 기존 스크립트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../"))
+from tools.snapshot_store import SnapshotReader, SnapshotWriter
+
+from app.core.config import settings
+
+# production 모드에서만 사용 (development 모드에서는 None이며 각 라우터가 kubectl을 직접 실행)
+snapshot_reader = SnapshotReader(settings.SNAPSHOT_DIR) if settings.APP_MODE == "production" else None
+# 워커가 자기 작업 목록과 중지 요청을 발행할 때 사용
+snapshot_writer = SnapshotWriter(settings.SNAPSHOT_DIR) if settings.APP_MODE == "production" else None
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Socket.IO 토픽 구독 색인 모듈
+"""
+
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set
+
+from app.models.schemas import MonitoringEvent
+
+# 값이 필요한 토픽 종류 (예: node:worker1) 와 값 없는 토픽
+TOPIC_KINDS = ("node", "namespace", "task")
+GLOBAL_TOPICS = ("events", "warnings") # 전체 이벤트, Warning 이벤트만
+
+def parse_topic(topic: str) -> str:
+    """토픽 문자열 검증 및 정규화 (지원하지 않으면 ValueError)"""
+    topic = str(topic).strip()
+    if topic in GLOBAL_TOPICS:
+        return topic
+    kind, _, value = topic.partition(":")
+    if kind not in TOPIC_KINDS or not value.strip():
+        raise ValueError(
+            f"지원하지 않는 토픽: {topic} "
+            f"(가능: {', '.join(GLOBAL_TOPICS)}, {', '.join(kind + ':<이름>' for kind in TOPIC_KINDS)})"
+        )
+    return f"{kind}:{value.strip()}"
+
+def event_topics(event: MonitoringEvent) -> Set[str]:
+    """이벤트가 해당하는 토픽 (보고한 노드, 대상 노드 객체, 네임스페이스, Warning 여부)"""
+    topics = {"events"}
+    if event.type == "Warning":
+        topics.add("warnings")
+    if event.involved_object.get("namespace"):
+        topics.add(f"namespace:{event.involved_object['namespace']}")
+    if event.source.get("host"):
+        topics.add(f"node:{event.source['host']}")
+    if event.involved_object.get("kind") == "Node" and event.involved_object.get("name"):
+        topics.add(f"node:{event.involved_object['name']}")
+    return topics
+
+def task_topics(task: dict) -> Set[str]:
+    """격리 작업 변경이 해당하는 토픽 (작업, 대상 노드)"""
+    return {f"task:{task['task_id']}", f"node:{task['node_name']}"}
+
+class TopicIndex:
+    """토픽 -> 구독자(sid) 색인
+    - 변경 하나마다 해당 토픽을 한 번 계산하고 색인에서 구독자를 모아 클라이언트별로 한 번만 전송
+    - 여러 토픽을 구독한 클라이언트도 같은 변경을 중복해서 받지 않음
+    """
+
+    def __init__(self):
+        self.subscribers: Dict[str, Set[str]] = defaultdict(set)
+        self.topics: Dict[str, Set[str]] = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def subscribe(self, sid: str, topics: Iterable[str]) -> List[str]:
+        """구독 추가 후 클라이언트의 전체 구독 토픽 반환"""
+        with self.lock:
+            for topic in topics:
+                self.subscribers[topic].add(sid)
+                self.topics[sid].add(topic)
+            return sorted(self.topics.get(sid, ()))
+
+    def unsubscribe(self, sid: str, topics: Iterable[str]) -> List[str]:
+        """구독 해제 후 남은 구독 토픽 반환"""
+        with self.lock:
+            for topic in topics:
+                self._discard(sid, topic)
+            return sorted(self.topics.get(sid, ()))
+
+    def remove(self, sid: str):
+        """연결 종료된 클라이언트의 구독 전체 삭제"""
+        with self.lock:
+            for topic in list(self.topics.get(sid, ())):
+                self._discard(sid, topic)
+
+    def _discard(self, sid: str, topic: str):
+        sids = self.subscribers.get(topic)
+        if sids is not None:
+            sids.discard(sid)
+            if not sids:
+                del self.subscribers[topic]
+        topics = self.topics.get(sid)
+        if topics is not None:
+            topics.discard(topic)
+            if not topics:
+                del self.topics[sid]
+
+    def topics_of(self, sid: str) -> List[str]:
+        with self.lock:
+            return sorted(self.topics.get(sid, ()))
+
+    def match(self, topics: Iterable[str]) -> Dict[str, List[str]]:
+        """변경이 해당하는 토픽의 구독자 -> 그중 구독한 토픽 목록"""
+        targets: Dict[str, List[str]] = defaultdict(list)
+        with self.lock:
+            for topic in topics:
+                for sid in self.subscribers.get(topic, ()):
+                    targets[sid].append(topic)
+        return targets
+
+# 프로세스 전역 구독 색인
+topic_index = TopicIndex()
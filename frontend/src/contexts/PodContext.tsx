@@ -15,7 +15,8 @@ const PodContext = createContext<PodContextType | undefined>(undefined);
 export const PodProvider: React.FC<{ children: ReactNode }> = ({ children }) => {
   const { data, isLoading, error } = useQuery<IntegratedPodData>(
     'integrated-pod-data',
-    podApi.getIntegratedPodData,
+    // 이벤트 목록과 요약만 사용하므로 파드 목록은 받지 않음
+    () => podApi.getIntegratedPodData({ fields: 'timestamp,summary,events' }),
     {
       refetchInterval: 10000, // 10초마다 자동 새로고침
     }
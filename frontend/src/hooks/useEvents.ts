@@ -1,32 +1,51 @@
 import { useState, useEffect, useCallback } from 'react';
 import { MonitoringEvent } from '../types';
+import { monitoringEventStreamUrl } from '../services/api';
 
-export const useEvents = (limit: number = 50) => {
+interface EventFilters {
+  type?: string;
+  namespace?: string;
+  node?: string;
+}
+
+// 서버가 보내는 새 이벤트를 SSE로 받아 최근 limit개 유지
+// 연결이 끊기면 브라우저가 Last-Event-ID로 이어받기 재연결
+export const useEvents = (limit: number = 50, filters: EventFilters = {}) => {
   const [events, setEvents] = useState<MonitoringEvent[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [connection, setConnection] = useState(0);
+  const { type, namespace, node } = filters;
+
+  useEffect(() => {
+    setEvents([]);
+    setLoading(true);
+    const source = new EventSource(
+      monitoringEventStreamUrl({ type, namespace, node, backlog: limit })
+    );
 
-  const fetchEvents = useCallback(async () => {
-    try {
-      const response = await fetch(`/api/monitoring/events?limit=${limit}`);
-      if (!response.ok) {
-        throw new Error('이벤트를 가져오는데 실패했습니다.');
-      }
-      const data = await response.json();
-      setEvents(data);
+    source.onopen = () => {
+      setLoading(false);
       setError(null);
-    } catch (err) {
-      setError(err instanceof Error ? err.message : '알 수 없는 오류가 발생했습니다.');
-    } finally {
+    };
+    source.addEventListener('monitoring_event', (message) => {
+      const event: MonitoringEvent = JSON.parse((message as MessageEvent).data);
+      setEvents((prev) => [event, ...prev].slice(0, limit));
+    });
+    source.onerror = () => {
       setLoading(false);
-    }
-  }, [limit]);
+      setError(
+        source.readyState === EventSource.CLOSED
+          ? '이벤트 스트림 연결이 종료되었습니다.'
+          : '이벤트 스트림에 다시 연결하는 중입니다.'
+      );
+    };
 
-  useEffect(() => {
-    fetchEvents();
-    const interval = setInterval(fetchEvents, 30000); // 30초마다 갱신
-    return () => clearInterval(interval);
-  }, [fetchEvents]);
+    return () => source.close();
+  }, [limit, type, namespace, node, connection]);
+
+  // 연결을 새로 열어 최근 이벤트부터 다시 받음
+  const refetch = useCallback(() => setConnection((value) => value + 1), []);
 
-  return { events, loading, error, refetch: fetchEvents };
-}; 
\ No newline at end of file
+  return { events, loading, error, refetch };
+};
@@ -58,8 +58,9 @@ export const podApi = {
     return response.data.distributions;
   },
 
-  getIntegratedPodData: async (): Promise<IntegratedPodData> => {
-    const response = await api.get<IntegratedPodData>('/pods/integrated');
+  // fields/view를 지정하면 서버가 요청한 필드만 계산해 응답 (view: summary, full)
+  getIntegratedPodData: async (params?: { fields?: string; view?: string }): Promise<IntegratedPodData> => {
+    const response = await api.get<IntegratedPodData>('/pods/integrated', { params });
     return response.data;
   },
 };
@@ -91,11 +92,18 @@ export const isolationApi = {
   },
 };
 
+// 대시보드(개요, 노드 목록, 파드 분포)가 사용하는 클러스터 상태 필드
+const DASHBOARD_CLUSTER_FIELDS = [
+  'timestamp', 'total_nodes', 'ready_nodes', 'total_pods', 'running_pods',
+  'nodes.name', 'nodes.status', 'nodes.roles', 'nodes.version', 'nodes.internal_ip',
+  'pod_distribution',
+].join(',');
+
 // 모니터링 관련 API
 export const monitoringApi = {
-  getClusterStatus: async () => {
+  getClusterStatus: async (params?: { fields?: string; view?: string }) => {
     // 클러스터 전체 상태 조회
-    const response = await api.get('/monitoring/cluster');
+    const response = await api.get('/monitoring/cluster', { params });
     return response.data;
   },
   
@@ -109,7 +117,7 @@ export const monitoringApi = {
     // 통합 조회
     try {
       const [clusterResponse, eventsResponse] = await Promise.all([
-        api.get('/monitoring/cluster'),
+        api.get('/monitoring/cluster', { params: { fields: DASHBOARD_CLUSTER_FIELDS } }),
         api.get('/monitoring/events', { params: { limit: 50 } })
       ]);
       
@@ -135,5 +143,21 @@ export const monitoringApi = {
   },
 };
 
+// 모니터링 이벤트 스트림(SSE) 주소 (필터는 서버에서 적용)
+export const monitoringEventStreamUrl = (params: {
+  type?: string;
+  namespace?: string;
+  node?: string;
+  backlog?: number;
+} = {}) => {
+  const query = new URLSearchParams();
+  Object.entries(params).forEach(([key, value]) => {
+    if (value !== undefined && value !== '') {
+      query.set(key, String(value));
+    }
+  });
+  return `${API_BASE_URL}/api/v1/monitoring/events/stream?${query.toString()}`;
+};
+
 export { api as default };
 export {};
\ No newline at end of file
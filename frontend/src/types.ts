@@ -74,7 +74,7 @@ export interface MonitoringEvent {
 // 통합 파드 데이터 타입
 export interface IntegratedPodData {
   timestamp: string;
-  pod_distribution: PodDistribution[];
+  pod_distribution?: PodDistribution[]; // fields로 제외하면 없음
   events: MonitoringEvent[];
   summary: {
     total_pods: number;
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+격리 API 부하 테스트 스크립트
+시뮬레이션 백엔드(ISOLATION_BACKEND=simulated)로 실행 중인 API에 다수의 격리 작업을 동시에 요청하고
+상태 조회/중지 요청을 섞어 API 지연 시간과 작업 처리량을 측정
+"""
+
+import sys
+import time
+import random
+import asyncio
+import argparse
+from pathlib import Path
+from collections import defaultdict, Counter
+
+import httpx
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+from tools.stats import summarize
+from scripts.stress.node_isolation import ISOLATION_METHODS
+
+class IsolationApiBenchmark:
+    def __init__(self, base_url, nodes, methods, duration, poll_interval, cancel_ratio, seed=None):
+        self.base_url = base_url.rstrip("/") + "/api/v1/isolation"
+        self.nodes = nodes
+        self.methods = methods
+        self.duration = duration
+        self.poll_interval = poll_interval
+        self.cancel_ratio = cancel_ratio
+        self.random = random.Random(seed)
+        self.latencies = defaultdict(list) # 엔드포인트 -> 응답 시간(ms)
+        self.errors = Counter()
+        self.final_status = Counter()
+        self.stop_results = Counter()
+
+    async def request(self, client, name, method, url, **kwargs):
+        """요청 후 응답 시간 기록"""
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.errors[f"{name}: {type(e).__name__}"] += 1
+            return None
+        self.latencies[name].append((time.perf_counter() - started) * 1000)
+        return response
+
+    async def run_task(self, client, semaphore):
+        """작업 하나: 시작 -> (일부는 중지) -> 완료까지 상태 조회"""
+        async with semaphore:
+            payload = {
+                "node_name": self.random.choice(self.nodes),
+                "method": self.random.choice(self.methods),
+                "duration": self.duration,
+            }
+            response = await self.request(client, "start", "POST", f"{self.base_url}/start", json=payload)
+            if response is None or response.status_code != 200:
+                self.errors["start"] += 1
+                return
+            task_id = response.json()["task_id"]
+
+            # 시작 직후 또는 실행 중에 무작위로 중지하여 경쟁 상황을 만듦
+            cancel_after = None
+            if self.random.random() < self.cancel_ratio:
+                cancel_after = self.random.uniform(0, self.poll_interval * 3)
+            started = time.perf_counter()
+
+            while True:
+                if cancel_after is not None and time.perf_counter() - started >= cancel_after:
+                    response = await self.request(
+                        client, "stop", "POST", f"{self.base_url}/stop", json={"task_id": task_id}
+                    )
+                    if response is not None:
+                        self.stop_results[response.status_code] += 1
+                    cancel_after = None
+
+                response = await self.request(client, "status", "GET", f"{self.base_url}/status/{task_id}")
+                if response is not None and response.status_code == 200:
+                    status = response.json()["status"]
+                    if status in ("completed", "failed"):
+                        self.final_status[status] += 1
+                        return
+                await asyncio.sleep(self.poll_interval)
+
+    async def run(self, task_count, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(timeout=30, limits=limits) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(self.run_task(client, semaphore) for _ in range(task_count)))
+            return time.perf_counter() - started
+
+def fetch_simulated_nodes(base_url):
+    """시뮬레이션 클러스터의 노드 목록 조회"""
+    response = httpx.get(base_url.rstrip("/") + "/api/v1/isolation/simulation", timeout=10)
+    if response.status_code != 200:
+        return None
+    return [node["name"] for node in response.json()["nodes"]]
+
+def main():
+    parser = argparse.ArgumentParser(description="격리 API 부하 테스트 (시뮬레이션 백엔드용)")
+    parser.add_argument("--url", default="http://localhost:8000", help="API 서버 주소")
+    parser.add_argument("--tasks", type=int, default=200, help="생성할 격리 작업 수")
+    parser.add_argument("--concurrency", type=int, default=100, help="동시에 진행할 작업 수")
+    parser.add_argument("--duration", type=int, default=60, help="작업별 격리 지속 시간(초, 서버 time_scale 적용 전)")
+    parser.add_argument("--poll-interval", type=float, default=0.2, help="상태 조회 간격(초)")
+    parser.add_argument("--cancel-ratio", type=float, default=0.2, help="중지 요청을 보낼 작업 비율")
+    parser.add_argument("--methods", default=",".join(ISOLATION_METHODS), help="사용할 격리 방법 (쉼표 구분)")
+    parser.add_argument("--nodes", help="대상 노드 (쉼표 구분, 기본: 시뮬레이션 클러스터 노드)")
+    parser.add_argument("--seed", type=int, help="난수 시드")
+
+    args = parser.parse_args()
+
+    nodes = args.nodes.split(",") if args.nodes else fetch_simulated_nodes(args.url)
+    if not nodes:
+        print("시뮬레이션 백엔드가 활성화되어 있지 않습니다. ISOLATION_BACKEND=simulated로 서버를 실행하거나 --nodes를 지정하세요.")
+        sys.exit(1)
+
+    benchmark = IsolationApiBenchmark(
+        args.url, nodes, args.methods.split(","), args.duration,
+        args.poll_interval, args.cancel_ratio, args.seed
+    )
+    print(f"격리 작업 {args.tasks}개 실행 (동시 {args.concurrency}개, 노드 {len(nodes)}개)")
+    elapsed = asyncio.run(benchmark.run(args.tasks, args.concurrency))
+
+    completed = sum(benchmark.final_status.values())
+    print("\n" + "="*80)
+    print(f"소요 시간: {elapsed:.2f}초, 처리량: {completed / elapsed:.1f} 작업/초")
+    print(f"최종 상태: {dict(benchmark.final_status)}")
+    if benchmark.stop_results:
+        print(f"중지 요청 응답: {dict(benchmark.stop_results)}")
+    if benchmark.errors:
+        print(f"오류: {dict(benchmark.errors)}")
+    print("\nAPI 응답 시간 (ms):")
+    for name, values in benchmark.latencies.items():
+        stats = summarize(values)
+        print(f"  {name:<7} n={stats['count']:<6} p50 {stats['p50']:.1f}  p90 {stats['p90']:.1f}  "
+              f"p99 {stats['p99']:.1f}  max {stats['max']:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+클러스터 수렴 감지
+장애 종료 후 파드 분포(노드)와 Ready 상태, 노드 Ready 상태가 일정 시간 동안 변하지 않으면
+복구가 끝난 것으로 보고 마지막 변화까지 걸린 시간을 수렴 시간으로 기록
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+from datetime import datetime
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from tools.kube_watch import KubeWatch
+from scripts.monitoring.isolation_timeline import is_pod_ready, is_node_ready
+from scripts.monitoring.pod_scope import PodScope
+
+def needs_ready(pod):
+    """수렴 판단에서 Ready를 기다려야 하는 파드인지
+    - 완료(Succeeded)/실패(Failed) 파드는 다시 Ready가 되지 않음
+    - CrashLoopBackOff 파드는 장애와 무관하게 Ready가 되지 않으므로 기다리지 않음
+    """
+    status = pod.get('status', {})
+    if status.get('phase') in ("Succeeded", "Failed"):
+        return False
+    return not any(
+        (container.get('state') or {}).get('waiting', {}).get('reason') == "CrashLoopBackOff"
+        for container in status.get('containerStatuses') or []
+    )
+
+class ConvergenceDetector:
+    """파드/노드 상태 변화를 watch로 받아 안정 구간을 감지
+    - 파드는 (노드, phase, Ready), 노드는 Ready 여부가 바뀔 때만 변화로 간주
+    - quiet_period초 동안 변화가 없고 범위 안의 파드와 관련 노드가 Ready면 수렴
+      (완료/실패한 파드와 CrashLoopBackOff 파드는 Ready 판단에서 제외,
+       노드는 범위 안의 파드가 있는 노드와 target_node만 확인)
+    - 장애 주입 전에 start()해야 기준 상태가 잡힘
+    - source를 지정하면 kubectl watch 대신 해당 소스(예: 시뮬레이션 클러스터)의 이벤트를 구독
+    """
+
+    def __init__(self, namespace="default", quiet_period=30, max_wait=600, require_ready=True, source=None,
+                 target_node=None):
+        self.scope = PodScope.parse(namespace)
+        self.target_node = target_node
+        self.quiet_period = quiet_period
+        self.max_wait = max_wait
+        self.require_ready = require_ready
+        self.source = source
+        self.pods = {} # 파드 uid -> (노드, phase, Ready 또는 Ready 판단 제외)
+        self.nodes = {} # 노드명 -> Ready
+        self.last_change = time.time()
+        self.changes = 0
+        self.condition = threading.Condition()
+        self.watches = [] if source else [
+            KubeWatch("pods", self.handle_pod_event, **self.scope.watch_options()),
+            KubeWatch("nodes", self.handle_node_event),
+        ]
+
+    def start(self):
+        if self.source:
+            self.source.subscribe("pods", self.handle_pod_event)
+            self.source.subscribe("nodes", self.handle_node_event)
+        for watch in self.watches:
+            watch.start()
+        return self
+
+    def stop(self):
+        if self.source:
+            self.source.unsubscribe("pods", self.handle_pod_event)
+            self.source.unsubscribe("nodes", self.handle_node_event)
+        for watch in self.watches:
+            watch.stop()
+
+    def _changed(self, ts):
+        self.last_change = max(self.last_change, ts)
+        self.changes += 1
+        self.condition.notify_all()
+
+    def handle_pod_event(self, event_type, pod, received_at):
+        metadata = pod.get('metadata', {})
+        if not self.scope.contains(metadata.get('namespace')):
+            return
+        uid = metadata.get('uid') or metadata.get('name')
+        with self.condition:
+            if event_type == "DELETED":
+                if self.pods.pop(uid, None) is not None:
+                    self._changed(received_at)
+                return
+            state = (
+                pod.get('spec', {}).get('nodeName'),
+                pod.get('status', {}).get('phase'),
+                (is_pod_ready(pod) or not needs_ready(pod)) and not metadata.get('deletionTimestamp'),
+            )
+            if self.pods.get(uid) != state:
+                self.pods[uid] = state
+                self._changed(received_at)
+
+    def handle_node_event(self, event_type, node, received_at):
+        name = node.get('metadata', {}).get('name')
+        with self.condition:
+            if event_type == "DELETED":
+                if self.nodes.pop(name, None) is not None:
+                    self._changed(received_at)
+                return
+            ready = is_node_ready(node)
+            if self.nodes.get(name) != ready:
+                self.nodes[name] = ready
+                if name in self.relevant_nodes():
+                    self._changed(received_at)
+
+    def relevant_nodes(self):
+        """Ready를 확인할 노드 (범위 안의 파드가 있는 노드와 대상 노드)"""
+        nodes = {state[0] for state in self.pods.values() if state[0]}
+        if self.target_node:
+            nodes.add(self.target_node)
+        return nodes
+
+    def all_ready(self):
+        return (all(state[2] for state in self.pods.values())
+                and all(self.nodes.get(name, True) for name in self.relevant_nodes()))
+
+    def wait(self, since=None):
+        """since(기본: 지금, 보통 장애 종료 시각)부터 수렴 또는 max_wait까지 대기하고 결과 반환
+        - time_to_convergence: since부터 마지막 변화까지 걸린 시간 (그 뒤로 quiet_period 동안 변화 없음)
+        """
+        since = time.time() if since is None else since
+        deadline = since + self.max_wait
+        with self.condition:
+            changes_before = self.changes
+            while True:
+                now = time.time()
+                quiet_for = now - self.last_change
+                if quiet_for >= self.quiet_period and (self.all_ready() or not self.require_ready):
+                    converged = True
+                    break
+                if now >= deadline:
+                    converged = False
+                    break
+                # 남은 안정 구간 또는 상한까지 대기 (변화가 생기면 다시 계산)
+                # 안정 구간은 지났지만 Ready가 아닌 파드가 있으면 다음 변화까지 대기
+                remaining = self.quiet_period - quiet_for if quiet_for < self.quiet_period else deadline - now
+                self.condition.wait(max(0.05, min(remaining, deadline - now)))
+
+            return {
+                'converged': converged,
+                'time_to_convergence': round(max(0.0, self.last_change - since), 3) if converged else None,
+                'observed_seconds': round(now - since, 3),
+                'last_change': datetime.fromtimestamp(self.last_change).isoformat(),
+                'changes': self.changes - changes_before,
+                'quiet_period': self.quiet_period,
+                'max_wait': self.max_wait,
+                'pods': len(self.pods),
+                'ready_pods': sum(1 for state in self.pods.values() if state[2]),
+            }
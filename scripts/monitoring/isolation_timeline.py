@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+격리 작업 타임라인 기록
+노드/파드 watch 스트림으로 장애 감지부터 복구까지의 시점을 기록
+"""
+
+import sys
+import math
+import time
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from tools.kube_watch import KubeWatch
+from tools.stats import summarize
+
+# 타임라인 시점 (기록 순서)
+MILESTONES = [
+    "fault_injected", # 장애 주입 명령 실행
+    "node_not_ready", # 노드 NotReady 전환
+    "first_eviction", # 대상 노드의 첫 파드 축출
+    "last_replacement_ready", # 마지막 대체 파드 Ready
+    "fault_removed", # 장애 해제 명령 실행
+    "node_ready", # 노드 Ready 복귀
+]
+
+# 구간 이름 -> (시작 시점, 종료 시점)
+PHASES = {
+    "detection": ("fault_injected", "node_not_ready"),
+    "eviction_start": ("fault_injected", "first_eviction"),
+    "rescheduling": ("first_eviction", "last_replacement_ready"),
+    "recovery": ("fault_injected", "last_replacement_ready"),
+    "node_recovery": ("fault_removed", "node_ready"),
+}
+
+def parse_timestamp(value):
+    """쿠버네티스 시각 문자열(2024-01-01T00:00:00Z)을 epoch 초로 변환"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+
+def is_pod_ready(pod):
+    """파드 Ready 조건 확인"""
+    conditions = pod.get('status', {}).get('conditions') or []
+    return any(c.get('type') == 'Ready' and c.get('status') == 'True' for c in conditions)
+
+def is_node_ready(node):
+    """노드 Ready 조건 확인"""
+    conditions = node.get('status', {}).get('conditions') or []
+    return any(c.get('type') == 'Ready' and c.get('status') == 'True' for c in conditions)
+
+def controller_owner(pod):
+    """파드를 관리하는 컨트롤러 (DaemonSet은 다른 노드로 옮겨지지 않으므로 제외)"""
+    for owner in pod.get('metadata', {}).get('ownerReferences') or []:
+        if owner.get('controller') and owner.get('kind') != 'DaemonSet':
+            return owner.get('uid')
+    return None
+
+class IsolationTimeline:
+    """격리 작업 하나의 장애/복구 타임라인
+    - 노드와 파드 변경 이벤트를 watch로 받아 각 시점을 수신 시각 기준으로 기록
+    - fault_injected/fault_removed는 isolate_node의 on_event 콜백으로 기록
+    - source를 지정하면 kubectl watch 대신 해당 소스(예: 시뮬레이션 클러스터)의 이벤트를 구독
+    """
+
+    def __init__(self, node_name, namespace=None, source=None):
+        self.node_name = node_name
+        self.namespace = namespace
+        self.marks = {}
+        self.evicted = {} # 축출된 파드 uid -> 컨트롤러 uid
+        self.evicted_owners = set()
+        self.replacements = {} # 대체 파드 uid -> Ready 시각
+        self.node_ready = None # 마지막으로 본 노드 Ready 여부 (이벤트를 받기 전에는 None)
+        self.started_at = None
+        self.lock = threading.Lock()
+        self.settled = threading.Event()
+        self.source = source
+        self.watches = [] if source else [
+            KubeWatch(
+                "nodes", self.handle_node_event,
+                field_selector=f"metadata.name={node_name}",
+                watch_only=True
+            ),
+            KubeWatch(
+                "pods", self.handle_pod_event,
+                namespace=namespace,
+                all_namespaces=namespace is None,
+                watch_only=True
+            ),
+        ]
+
+    def start(self):
+        """watch 시작 (장애 주입 직전에 호출)"""
+        self.started_at = time.time()
+        if self.source:
+            self.source.subscribe("nodes", self.handle_node_event)
+            self.source.subscribe("pods", self.handle_pod_event)
+        for watch in self.watches:
+            watch.start()
+
+    def stop(self):
+        """watch 중지"""
+        if self.source:
+            self.source.unsubscribe("nodes", self.handle_node_event)
+            self.source.unsubscribe("pods", self.handle_pod_event)
+        for watch in self.watches:
+            watch.stop()
+
+    def mark(self, milestone, ts=None):
+        """시점 기록 (이미 기록된 시점은 유지)"""
+        with self.lock:
+            if milestone not in self.marks:
+                self.marks[milestone] = ts if ts is not None else time.time()
+            self._check_settled()
+
+    def on_fault_event(self, name, ts=None):
+        """isolate_node 콜백
+        - 장애 해제 시 노드가 NotReady가 된 적이 없으면(extreme, drain, 짧은 장애, 중지된 작업)
+          이후 노드 이벤트가 오지 않으므로 바로 Ready 복귀로 기록
+        """
+        if name == "fault_removed":
+            with self.lock:
+                ready = self.node_ready if self.node_ready is not None else "node_not_ready" not in self.marks
+            if ready:
+                self.mark(name, ts)
+                self.mark("node_ready", self.marks[name])
+                return
+        self.mark(name, ts)
+
+    def handle_node_event(self, event_type, node, received_at):
+        """노드 상태 변경 처리"""
+        if node.get('metadata', {}).get('name') != self.node_name:
+            return
+        ready = is_node_ready(node)
+        with self.lock:
+            self.node_ready = ready
+        if not ready:
+            self.mark("node_not_ready", received_at)
+        elif ready and "fault_removed" in self.marks:
+            self.mark("node_ready", received_at)
+
+    def handle_pod_event(self, event_type, pod, received_at):
+        """파드 변경 처리 (축출 및 대체 파드 Ready 감지)
+        - watch_only로 시작하므로 수신되는 이벤트는 모두 격리 시작 이후의 변경
+        - drain은 명령 실행 중에 축출이 일어나므로 fault_injected 기록 여부와 무관하게 처리
+        - 대체 파드는 장애 주입 이후 생성된 파드만 인정 (기존 형제 파드의 MODIFIED 제외)
+        """
+        metadata = pod.get('metadata', {})
+        uid = metadata.get('uid')
+        node = pod.get('spec', {}).get('nodeName')
+        owner = controller_owner(pod)
+
+        with self.lock:
+            if node == self.node_name:
+                evicted = (
+                    event_type == "DELETED"
+                    or metadata.get('deletionTimestamp')
+                    or pod.get('status', {}).get('reason') == "Evicted"
+                )
+                if evicted and uid not in self.evicted:
+                    self.evicted[uid] = owner
+                    if owner:
+                        self.evicted_owners.add(owner)
+                    self.marks.setdefault("first_eviction", received_at)
+            elif (owner and uid not in self.replacements
+                  and owner in self.evicted_owners
+                  and event_type != "DELETED" and is_pod_ready(pod)
+                  and self._created_after_fault(pod)):
+                self.replacements[uid] = received_at
+                # 축출된 파드 수만큼 대체 파드가 Ready가 되면 마지막 시점 갱신
+                if len(self.replacements) >= self.expected_replacements():
+                    self.marks["last_replacement_ready"] = received_at
+            self._check_settled()
+
+    def _created_after_fault(self, pod):
+        """파드가 장애 주입(기록 전이면 타임라인 시작) 이후 생성되었는지
+        - creationTimestamp는 초 단위로 잘리므로 기준 시각도 초 단위로 내림해 비교
+        """
+        created = parse_timestamp(pod.get('metadata', {}).get('creationTimestamp'))
+        since = self.marks.get("fault_injected", self.started_at)
+        if created is None or since is None:
+            return True
+        return created >= math.floor(since)
+
+    def expected_replacements(self):
+        """컨트롤러가 있어 다시 생성되어야 하는 축출 파드 수"""
+        return sum(1 for owner in self.evicted.values() if owner)
+
+    def _check_settled(self):
+        """노드 복귀 및 대체 파드가 모두 Ready면 완료 처리"""
+        if "node_ready" not in self.marks:
+            return
+        if self.expected_replacements() and "last_replacement_ready" not in self.marks:
+            return
+        self.settled.set()
+
+    def wait_settled(self, timeout):
+        """복구 완료 또는 타임아웃까지 대기"""
+        return self.settled.wait(timeout)
+
+    def durations(self):
+        """구간별 소요 시간 (초)"""
+        durations = {}
+        for phase, (start, end) in PHASES.items():
+            if start in self.marks and end in self.marks:
+                durations[phase] = round(self.marks[end] - self.marks[start], 3)
+            else:
+                durations[phase] = None
+        return durations
+
+    def to_dict(self):
+        """API 응답/저장용 딕셔너리"""
+        with self.lock:
+            data = {
+                milestone: datetime.fromtimestamp(self.marks[milestone]) if milestone in self.marks else None
+                for milestone in MILESTONES
+            }
+            data["evicted_pods"] = len(self.evicted)
+            data["replaced_pods"] = len(self.replacements)
+            data["durations"] = self.durations()
+        return data
+
+def summarize_timelines(timelines):
+    """여러 실행의 구간별 백분위수 요약"""
+    return {
+        phase: summarize(
+            timeline.durations()[phase] for timeline in timelines
+        )
+        for phase in PHASES
+    }
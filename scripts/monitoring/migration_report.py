@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+마이그레이션 분석 리포트
+대체 소요 시간 분포, 워크로드별 다운타임, 복구 시간 백분위수, 노드별 축출 속도를 증분 집계하고
+장시간 실행 중에도 이벤트를 NDJSON 또는 CSV 파일로 바로 기록
+"""
+
+import os
+import csv
+import sys
+import json
+from pathlib import Path
+from datetime import datetime
+from collections import defaultdict
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from tools.stats import summarize
+
+REPORT_PERCENTILES = (50, 90, 99)
+
+# CSV 파일별 열 (이벤트 종류 -> 열 목록)
+CSV_COLUMNS = {
+    "termination": ["previous_pod", "namespace", "workload", "from_node", "terminated_at"],
+    "replacement": ["workload", "namespace", "previous_pod", "pod_name", "from_node", "to_node",
+                    "terminated_at", "created_at", "scheduled_at", "ready_at"],
+    "migration": ["workload", "namespace", "previous_pod", "pod_name", "from_node", "to_node",
+                  "timestamp", "reschedule_latency", "phase", "ready"],
+    "node": ["node", "ready", "timestamp"],
+}
+
+# CSV에서 다시 읽을 때 변환할 열 (열 이름 -> 변환 함수)
+CSV_TYPES = {
+    "terminated_at": float,
+    "created_at": float,
+    "scheduled_at": float,
+    "ready_at": float,
+    "reschedule_latency": float,
+    "ready": lambda value: value == "True",
+}
+
+def serialize(value):
+    """JSON/CSV 기록용 값 변환"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def merged_length(intervals):
+    """겹치는 구간을 합친 전체 길이"""
+    total = 0.0
+    end = None
+    for start, stop in sorted(intervals):
+        if end is None or start > end:
+            total += stop - start
+            end = stop
+        elif stop > end:
+            total += stop - end
+            end = stop
+    return total
+
+class MigrationReport:
+    """마이그레이션 이벤트 증분 집계
+    - 이벤트가 들어올 때마다 필요한 값만 누적하고 summary()에서 분포를 계산
+    """
+
+    def __init__(self, percentiles=REPORT_PERCENTILES):
+        self.percentiles = percentiles
+        self.latencies = defaultdict(list) # 워크로드 -> 종료부터 대체 파드 Ready까지(초)
+        self.outages = defaultdict(list) # 워크로드 -> (종료 시각, 대체 파드 Ready 시각)
+        self.reschedule_latencies = []
+        self.terminations = defaultdict(list) # 노드 -> 파드 종료 시각
+        self.namespaces = defaultdict(lambda: {'terminations': 0, 'migrations': 0, 'latencies': []})
+        self.migration_count = 0
+        self.from_nodes = defaultdict(int) # 노드 -> 떠난 마이그레이션 수
+        self.to_nodes = defaultdict(int) # 노드 -> 도착한 마이그레이션 수
+        self.node_event_count = 0
+
+    def add(self, kind, record):
+        if kind in ("termination", "migration"):
+            self.namespaces[record['namespace']][kind + "s"] += 1
+        elif kind == "replacement":
+            self.namespaces[record['namespace']]['latencies'].append(record['ready_at'] - record['terminated_at'])
+        
+        if kind == "termination":
+            if record['from_node']:
+                self.terminations[record['from_node']].append(record['terminated_at'])
+        elif kind == "replacement":
+            latency = record['ready_at'] - record['terminated_at']
+            self.latencies[record['workload']].append(latency)
+            self.outages[record['workload']].append((record['terminated_at'], record['ready_at']))
+        elif kind == "migration":
+            self.migration_count += 1
+            self.from_nodes[record['from_node']] += 1
+            self.to_nodes[record['to_node']] += 1
+            self.reschedule_latencies.append(record['reschedule_latency'])
+        elif kind == "node":
+            self.node_event_count += 1
+
+    def node_drain_rates(self):
+        """노드별 축출 속도 (첫 종료부터 마지막 종료까지의 분당 종료 파드 수)"""
+        rates = {}
+        for node, times in sorted(self.terminations.items()):
+            first, last = min(times), max(times)
+            span = last - first
+            rates[node] = {
+                'terminated': len(times),
+                'first': datetime.fromtimestamp(first).isoformat(),
+                'last': datetime.fromtimestamp(last).isoformat(),
+                'drain_seconds': round(span, 3),
+                'per_minute': round(len(times) / span * 60, 2) if span > 0 else None,
+            }
+        return rates
+
+    def summary(self):
+        all_latencies = [value for values in self.latencies.values() for value in values]
+        return {
+            'replacements': len(all_latencies),
+            'migrations': self.migration_count,
+            'from_nodes': dict(sorted(self.from_nodes.items())),
+            'to_nodes': dict(sorted(self.to_nodes.items())),
+            'node_events': self.node_event_count,
+            'recovery_time': summarize(all_latencies, self.percentiles),
+            'reschedule_time': summarize(self.reschedule_latencies, self.percentiles),
+            'workloads': {
+                workload: {
+                    'replacements': len(values),
+                    'recovery_time': summarize(values, self.percentiles),
+                    'pod_downtime_seconds': round(sum(values), 3), # 파드별 공백 시간의 합
+                    'degraded_seconds': round(merged_length(self.outages[workload]), 3), # 레플리카가 하나라도 빠져 있던 시간
+                }
+                for workload, values in sorted(self.latencies.items())
+            },
+            'namespaces': {
+                namespace: {
+                    'terminations': counts['terminations'],
+                    'replacements': len(counts['latencies']),
+                    'migrations': counts['migrations'],
+                    'recovery_time': summarize(counts['latencies'], self.percentiles),
+                }
+                for namespace, counts in sorted(self.namespaces.items())
+            },
+            'nodes': self.node_drain_rates(),
+            'generated_at': datetime.now().isoformat(),
+        }
+
+    def write_summary(self, path):
+        """요약을 임시 파일에 쓴 뒤 교체 (읽는 쪽이 중간 상태를 보지 않도록)"""
+        path = Path(path)
+        temp = path.with_name(path.name + ".tmp")
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2, ensure_ascii=False)
+        os.replace(temp, path)
+
+class NdjsonSink:
+    """이벤트를 한 줄에 하나씩 JSON으로 기록"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, 'a', encoding='utf-8')
+
+    @property
+    def summary_path(self):
+        return self.path.with_name(self.path.stem + ".summary.json")
+
+    def write(self, kind, record):
+        line = {"type": kind, **{key: serialize(value) for key, value in record.items()}}
+        self.file.write(json.dumps(line, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def read(self, kind):
+        """기록된 kind 이벤트를 한 건씩 다시 읽음 (파일 전체를 메모리에 올리지 않음)"""
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                if record.pop("type", None) == kind:
+                    yield record
+
+    def close(self):
+        self.file.close()
+
+class CsvSink:
+    """이벤트 종류별 CSV 파일에 열 단위로 기록 (디렉토리에 <종류>.csv 생성)"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.files = {}
+        self.writers = {}
+
+    @property
+    def summary_path(self):
+        return self.directory / "summary.json"
+
+    def _writer(self, kind):
+        writer = self.writers.get(kind)
+        if writer is None:
+            path = self.directory / f"{kind}.csv"
+            is_new = not path.exists() or path.stat().st_size == 0
+            self.files[kind] = open(path, 'a', encoding='utf-8', newline='')
+            writer = self.writers[kind] = csv.DictWriter(
+                self.files[kind], fieldnames=CSV_COLUMNS[kind], extrasaction='ignore'
+            )
+            if is_new:
+                writer.writeheader()
+        return writer
+
+    def write(self, kind, record):
+        self._writer(kind).writerow({key: serialize(value) for key, value in record.items()})
+        self.files[kind].flush()
+
+    def read(self, kind):
+        """기록된 kind 이벤트를 한 건씩 다시 읽음 (CSV 문자열 중 숫자/불리언 열은 원래 형식으로 변환)"""
+        path = self.directory / f"{kind}.csv"
+        if not path.exists():
+            return
+        with open(path, encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                yield {
+                    key: CSV_TYPES[key](value) if key in CSV_TYPES and value != "" else value
+                    for key, value in row.items()
+                }
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+
+def write_report_json(path, report, streams):
+    """report 항목 뒤에 streams(키 -> 레코드 iterable)를 한 건씩 이어 써서 JSON 파일로 저장
+    - 스트리밍 기록 파일에서 읽은 이벤트 목록을 메모리에 모으지 않고 그대로 옮김
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        separator = "{"
+        for key, value in report.items():
+            value = json.dumps(value, indent=2, ensure_ascii=False, default=serialize)
+            f.write(f"{separator}\n  {json.dumps(key)}: " + value.replace("\n", "\n  "))
+            separator = ","
+        for key, records in streams.items():
+            f.write(f"{separator}\n  {json.dumps(key)}: [")
+            separator = ","
+            item_separator = ""
+            for record in records:
+                record = {name: serialize(value) for name, value in record.items()}
+                f.write(f"{item_separator}\n    " + json.dumps(record, ensure_ascii=False))
+                item_separator = ","
+            f.write("\n  ]" if item_separator else "]")
+        f.write("\n}\n" if separator == "," else "{}\n")
+
+def open_sink(path, fmt="ndjson"):
+    """출력 형식에 맞는 이벤트 기록기 생성"""
+    if fmt == "ndjson":
+        return NdjsonSink(path)
+    if fmt == "csv":
+        return CsvSink(path)
+    raise ValueError(f"지원하지 않는 출력 형식: {fmt}")
+
+def print_report(summary):
+    """리포트 요약 출력"""
+    def line(stats):
+        if not stats['count']:
+            return "-"
+        return (f"p50 {stats['p50']:.1f}초, p90 {stats['p90']:.1f}초, "
+                f"p99 {stats['p99']:.1f}초, 최대 {stats['max']:.1f}초 (n={stats['count']})")
+
+    print(f"  - 대체 완료 {summary['replacements']}개, 마이그레이션 {summary['migrations']}개")
+    print(f"  - 복구 시간 (종료 → 대체 파드 Ready): {line(summary['recovery_time'])}")
+    print(f"  - 재스케줄 시간 (종료 → 다른 노드 배치): {line(summary['reschedule_time'])}")
+    if len(summary.get('namespaces', {})) > 1:
+        print("  - 네임스페이스별:")
+        for namespace, stats in summary['namespaces'].items():
+            print(f"    {namespace}: 종료 {stats['terminations']}개, 대체 {stats['replacements']}개, "
+                  f"마이그레이션 {stats['migrations']}개, {line(stats['recovery_time'])}")
+    if summary['workloads']:
+        print("  - 워크로드별:")
+        for workload, stats in summary['workloads'].items():
+            print(f"    {workload}: {line(stats['recovery_time'])}, "
+                  f"파드 다운타임 합 {stats['pod_downtime_seconds']:.1f}초, "
+                  f"성능 저하 구간 {stats['degraded_seconds']:.1f}초")
+    if summary['nodes']:
+        print("  - 노드별 축출 속도:")
+        for node, stats in summary['nodes'].items():
+            rate = f"{stats['per_minute']:.1f}개/분" if stats['per_minute'] is not None else "-"
+            print(f"    {node}: {stats['terminated']}개, {stats['drain_seconds']:.1f}초 동안 {rate}")
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+소유 컨트롤러 기준 파드 대체 추적
+Deployment/ReplicaSet 파드는 다시 생성되면 이름이 바뀌므로 ownerReferences로 같은 워크로드의
+종료된 파드와 새 파드를 짝지어 마이그레이션과 대체 소요 시간을 계산
+"""
+
+from collections import defaultdict, deque
+
+# 대체 파드가 나타나지 않은 종료 기록을 보관하는 시간(초)
+PENDING_TTL = 900
+
+def controller_reference(metadata):
+    """파드를 관리하는 컨트롤러 ownerReference"""
+    for owner in metadata.get('ownerReferences') or []:
+        if owner.get('controller'):
+            return owner
+    return None
+
+def pod_ordinal(name):
+    """StatefulSet 파드 이름의 순번 (web-2 -> 2)"""
+    suffix = name.rsplit('-', 1)[-1]
+    return int(suffix) if suffix.isdigit() else None
+
+def pod_identity(pod_info):
+    """같은 자리를 차지하는 파드끼리 공유하는 식별 키
+    - StatefulSet: (컨트롤러 uid, 순번) - 한 자리에 파드 하나
+    - 그 외 컨트롤러: 컨트롤러 uid - 레플리카끼리 구분 없이 먼저 종료된 파드부터 대체
+    - 컨트롤러 없음: (네임스페이스, 이름)
+    - DaemonSet: 다른 노드로 옮겨지지 않으므로 None
+    """
+    owner = pod_info.get('owner')
+    if owner is None:
+        return ("Pod", pod_info['namespace'], pod_info['name'])
+    if owner['kind'] == 'DaemonSet':
+        return None
+    if owner['kind'] == 'StatefulSet':
+        return (owner['uid'], pod_ordinal(pod_info['name']))
+    return (owner['uid'],)
+
+def workload_name(pod_info):
+    """보고용 워크로드 이름 (ReplicaSet은 pod-template-hash로 Deployment 이름 복원)"""
+    owner = pod_info.get('owner')
+    if owner is None:
+        return f"Pod/{pod_info['namespace']}/{pod_info['name']}"
+    name = owner['name']
+    template_hash = pod_info.get('template_hash')
+    if owner['kind'] == 'ReplicaSet' and template_hash and name.endswith(f"-{template_hash}"):
+        return f"Deployment/{pod_info['namespace']}/{name[:-len(template_hash) - 1]}"
+    return f"{owner['kind']}/{pod_info['namespace']}/{name}"
+
+class MigrationTracker:
+    """종료된 파드와 대체 파드를 짝지어 마이그레이션 감지
+    - 모든 상태는 uid/식별 키로 색인되어 이벤트 하나당 O(1)로 처리
+    - 장애로 인한 종료(Evicted 또는 NotReady/격리된 노드의 파드)만 대체 대기열에 넣음
+      (정상 노드의 스케일 다운/롤링 업데이트 종료는 이후 생성되는 파드와 짝짓지 않음)
+    - 대체 파드가 종료 전과 다른 노드에 스케줄되면 마이그레이션으로 보고
+    - listener(kind, record)로 종료("termination")와 대체 완료("replacement") 기록을 전달
+      (대체 소요 시간 집계는 listener 쪽 MigrationReport가 담당)
+    """
+
+    def __init__(self, pending_ttl=PENDING_TTL, listener=None, node_failing=None):
+        self.pending_ttl = pending_ttl
+        self.listener = listener
+        self.node_failing = node_failing # 노드 이름 -> 장애/격리 상태 여부 (None이면 모든 종료를 대체 대상으로 봄)
+        self.pods = {} # uid -> {'identity', 'node', 'terminated'}
+        self.pending = defaultdict(deque) # 식별 키 -> 대체 대기 중인 종료 기록 (오래된 순)
+        self.replacements = {} # 대체 파드 uid -> 진행 중인 대체 기록
+
+    def _pop_pending(self, identity, ts):
+        queue = self.pending.get(identity)
+        while queue:
+            termination = queue.popleft()
+            if ts - termination['terminated_at'] <= self.pending_ttl:
+                if not queue:
+                    del self.pending[identity]
+                return termination
+        self.pending.pop(identity, None)
+        return None
+
+    def is_fault_termination(self, pod_info, node):
+        """장애로 인한 종료인지 (축출되었거나 장애/격리 상태인 노드에서 종료)"""
+        if pod_info.get('reason') == 'Evicted' or self.node_failing is None:
+            return True
+        return bool(node) and self.node_failing(node)
+
+    def expire(self, now):
+        """pending_ttl이 지나도록 대체되지 않은 종료 기록과 Ready가 되지 않은 대체 기록 제거"""
+        for identity in list(self.pending):
+            queue = self.pending[identity]
+            while queue and now - queue[0]['terminated_at'] > self.pending_ttl:
+                queue.popleft()
+            if not queue:
+                del self.pending[identity]
+        for uid in [uid for uid, replacement in self.replacements.items()
+                    if now - replacement['terminated_at'] > self.pending_ttl]:
+            del self.replacements[uid]
+
+    def observe(self, event_type, pod_info, ts):
+        """파드 이벤트 반영 (ts: epoch 초), 마이그레이션이면 이벤트 딕셔너리 반환"""
+        identity = pod_identity(pod_info)
+        if identity is None:
+            return None
+
+        uid = pod_info['uid']
+        node = pod_info['node'] if pod_info['node'] != 'Unscheduled' else None
+        terminated = event_type == "DELETED" or pod_info.get('deleting', False)
+        state = self.pods.get(uid)
+
+        if state is None:
+            if terminated:
+                return None # 살아 있는 상태를 본 적 없는 파드
+            state = self.pods[uid] = {'identity': identity, 'node': node, 'terminated': False}
+            termination = self._pop_pending(identity, ts)
+            if termination:
+                self.replacements[uid] = {
+                    **termination,
+                    'pod_name': pod_info['name'],
+                    'created_at': ts,
+                    'to_node': None,
+                    'scheduled_at': None,
+                    'ready_at': None,
+                }
+
+        if node:
+            state['node'] = node
+
+        if terminated:
+            if not state['terminated']:
+                state['terminated'] = True
+                replacement = self.replacements.pop(uid, None)
+                if replacement:
+                    # 대체 파드가 Ready 전에 종료되면 원래 종료 기록을 다시 대기열 앞에 둠
+                    original = {key: replacement[key] for key in
+                                ('previous_pod', 'namespace', 'workload', 'from_node', 'terminated_at')}
+                    self.pending[identity].appendleft(original)
+                elif self.is_fault_termination(pod_info, state['node']):
+                    termination = {
+                        'previous_pod': pod_info['name'],
+                        'namespace': pod_info['namespace'],
+                        'workload': workload_name(pod_info),
+                        'from_node': state['node'],
+                        'terminated_at': ts,
+                    }
+                    self.pending[identity].append(termination)
+                    self._notify("termination", termination)
+            if event_type == "DELETED":
+                del self.pods[uid]
+            return None
+
+        replacement = self.replacements.get(uid)
+        if replacement is None:
+            return None
+
+        migration = None
+        if replacement['to_node'] is None and node:
+            replacement['to_node'] = node
+            replacement['scheduled_at'] = ts
+            if replacement['from_node'] and node != replacement['from_node']:
+                migration = {
+                    'pod_name': pod_info['name'],
+                    'previous_pod': replacement['previous_pod'],
+                    'namespace': pod_info['namespace'],
+                    'workload': replacement['workload'],
+                    'from_node': replacement['from_node'],
+                    'to_node': node,
+                    'timestamp': ts,
+                    'reschedule_latency': round(ts - replacement['terminated_at'], 3),
+                    'phase': pod_info['phase'],
+                    'ready': pod_info['ready'],
+                }
+
+        if pod_info['ready'] and replacement['to_node']:
+            replacement['ready_at'] = ts
+            self._notify("replacement", self.replacements.pop(uid))
+        return migration
+
+    def _notify(self, kind, record):
+        if self.listener:
+            self.listener(kind, record)
+
+    def pending_count(self):
+        """아직 대체 파드가 Ready가 되지 않은 종료 파드 수"""
+        return sum(len(queue) for queue in self.pending.values()) + len(self.replacements)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+파드 상태 이력 저장소
+파드별 상태 변화를 고정 크기 바이트 링 버퍼에 16바이트 레코드로 저장하고
+노드/phase 문자열은 정수 id로 치환하여 수만 개 파드를 장기간 모니터링해도 메모리가 제한되도록 함
+"""
+
+import sys
+import struct
+from datetime import datetime
+
+# 레코드: 시각(epoch 초), 노드 id, phase id, Ready 여부, 재시작 횟수
+RECORD = struct.Struct("<dIBBH")
+MAX_RESTART_COUNT = 0xFFFF
+
+class StringTable:
+    """문자열 <-> 정수 id 매핑 (노드명, phase처럼 반복되는 값을 한 번만 보관)"""
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def id(self, value):
+        index = self.ids.get(value)
+        if index is None:
+            index = self.ids[value] = len(self.values)
+            self.values.append(sys.intern(value))
+        return index
+
+    def value(self, index):
+        return self.values[index]
+
+class PodRing:
+    """파드 하나의 레코드 링 버퍼"""
+    __slots__ = ("buffer", "head", "count", "last_seen")
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.head = 0 # 가득 찬 뒤 다음에 덮어쓸 레코드 위치
+        self.count = 0
+        self.last_seen = 0.0
+
+class PodHistory:
+    """파드별 상태 변화 이력
+    - 노드/phase/Ready/재시작 횟수가 바뀔 때만 레코드를 추가하고 파드당 capacity개까지 보관
+    - 사라진 지 ttl초가 지난 파드는 evict()에서 제거
+    """
+
+    def __init__(self, capacity=32, ttl=3600):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.node_ids = StringTable()
+        self.phase_ids = StringTable() # phase는 종류가 적어 1바이트 id 사용
+        self.pods = {} # 파드명 -> PodRing
+        self.gone = {} # 목록에서 사라진 파드명 -> 사라진 시각
+
+    def append(self, name, timestamp, node, phase, ready, restart_count):
+        """상태 기록 (직전 레코드와 같으면 마지막 확인 시각만 갱신), 추가 여부 반환"""
+        ring = self.pods.get(name)
+        if ring is None:
+            ring = self.pods[sys.intern(name)] = PodRing()
+        ring.last_seen = timestamp
+        if self.gone:
+            self.gone.pop(name, None)
+
+        node_id = self.node_ids.id(node)
+        phase_id = self.phase_ids.id(phase)
+        restart_count = min(restart_count, MAX_RESTART_COUNT)
+        if ring.count:
+            _, last_node, last_phase, last_ready, last_restart = self._unpack(ring, ring.count - 1)
+            if (last_node, last_phase, last_ready, last_restart) == (node_id, phase_id, int(ready), restart_count):
+                return False
+
+        record = RECORD.pack(timestamp, node_id, phase_id, int(ready), restart_count)
+        if ring.count < self.capacity:
+            ring.buffer += record
+            ring.count += 1
+        else:
+            offset = ring.head * RECORD.size
+            ring.buffer[offset:offset + RECORD.size] = record
+            ring.head = (ring.head + 1) % self.capacity
+        return True
+
+    def _unpack(self, ring, index):
+        """오래된 순서 기준 index번째 레코드"""
+        position = (ring.head + index) % ring.count if ring.count == self.capacity else index
+        return RECORD.unpack_from(ring.buffer, position * RECORD.size)
+
+    def _to_dict(self, record):
+        timestamp, node_id, phase_id, ready, restart_count = record
+        return {
+            'timestamp': datetime.fromtimestamp(timestamp),
+            'node': self.node_ids.value(node_id),
+            'phase': self.phase_ids.value(phase_id),
+            'ready': bool(ready),
+            'restart_count': restart_count,
+        }
+
+    def records(self, name):
+        """파드의 이력 (오래된 순)"""
+        ring = self.pods.get(name)
+        if ring is None:
+            return []
+        return [self._to_dict(self._unpack(ring, i)) for i in range(ring.count)]
+
+    def last(self, name):
+        ring = self.pods.get(name)
+        if ring is None or not ring.count:
+            return None
+        return self._to_dict(self._unpack(ring, ring.count - 1))
+
+    def mark_gone(self, name, timestamp):
+        """파드가 사라진 시각 기록 (같은 이름으로 다시 나타나면 해제)"""
+        if name in self.pods:
+            self.gone.setdefault(name, timestamp)
+
+    def evict(self, now):
+        """사라진 지 ttl이 지난 파드 제거 (사라진 파드만 확인), 제거한 수 반환"""
+        expired = [name for name, gone_at in self.gone.items() if now - gone_at >= self.ttl]
+        for name in expired:
+            del self.gone[name]
+            del self.pods[name]
+        return len(expired)
+
+    def memory_usage(self):
+        """이력이 사용하는 메모리 추정치(바이트, 파드명 문자열 제외)"""
+        total = sys.getsizeof(self.pods) + sys.getsizeof(self.gone)
+        for ring in list(self.pods.values()): # watch 스레드가 갱신 중이어도 안전하게 순회
+            total += sys.getsizeof(ring) + sys.getsizeof(ring.buffer)
+        for table in (self.node_ids, self.phase_ids):
+            total += sys.getsizeof(table.ids) + sys.getsizeof(table.values)
+            total += sum(sys.getsizeof(value) for value in table.values)
+        return total
+
+    def __contains__(self, name):
+        return name in self.pods
+
+    def __len__(self):
+        return len(self.pods)
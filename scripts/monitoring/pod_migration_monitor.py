@@ -17,14 +17,37 @@ from collections import defaultdict
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from tools.env_loader import EnvLoader
+from tools.metric_store import MetricStore, MetricPublisher
+from tools.kube_watch import KubeWatch
+from tools.stream_log import StreamRecorder, replay_stream_log, read_meta
+from scripts.monitoring.isolation_timeline import is_node_ready, is_pod_ready
+from scripts.monitoring.migration_tracker import MigrationTracker, controller_reference
+from scripts.monitoring.pod_history import PodHistory
+from scripts.monitoring.migration_report import MigrationReport, open_sink, print_report, write_report_json
+from scripts.monitoring.pod_scope import PodScope, namespace_summary
+from scripts.monitoring.status_view import create_view, status_lines
 
 class PodMigrationMonitor:
     def __init__(self):
         self.env_loader = EnvLoader()
         self.monitoring_active = False
-        self.pod_history = defaultdict(list) # 파드 이력 추적
+        self.pod_history = PodHistory() # 파드별 상태 변화 이력 (사라진 파드는 TTL 후 제거)
         self.node_status = {} # 노드 상태 추적
-        self.migration_events = [] # 마이그레이션 이벤트 기록
+        self.migration_events = [] # 마이그레이션 이벤트 기록 (스트리밍 출력 중에는 파일에만 기록)
+        self.node_events = [] # 노드 Ready/NotReady 전환 기록 (스트리밍 출력 중에는 파일에만 기록)
+        self.scope = PodScope.parse("default") # 모니터링 범위 (네임스페이스/레이블 셀렉터)
+        self.current_pods = {} # watch 모드의 현재 파드 상태 ((네임스페이스, 파드명) -> 파드 정보)
+        self.last_seen_pods = {} # 주기 조회 모드의 직전 파드 목록 (uid -> 파드 정보)
+        self.tracker = MigrationTracker(listener=self.record_event, node_failing=self.node_failing) # 종료된 파드와 대체 파드 매칭
+        self.report = MigrationReport() # 대체/마이그레이션 증분 집계
+        self.sink = None # 이벤트 스트리밍 기록기 (선택)
+        self.recorder = None # 원본 노드/파드/이벤트 스트림 기록기 (선택)
+        self.view = None # 라이브/조용한 출력 화면 (None이면 매 주기 전체 출력)
+        self.version = 0 # 상태가 바뀔 때마다 증가 (라이브 화면 갱신 판단용)
+        self.watches = []
+        self.lock = threading.RLock()
+        self.metric_store = MetricStore() # 노드별 상태/파드 수 시계열
+        self.metric_publisher = None # API 서버로 샘플 전송 (선택)
     
     def run_kubectl_command(self, command):
         """kubectl 명령 실행"""
@@ -44,8 +67,9 @@ class PodMigrationMonitor:
             return None
     
     def get_all_pods(self, namespace="default"):
-        """모든 파드 정보 조회"""
-        cmd = f"get pods -n {namespace} -o json"
+        """모든 파드 정보 조회 (namespace: 네임스페이스, 쉼표 구분 목록 또는 PodScope)"""
+        scope = PodScope.parse(namespace)
+        cmd = f"get pods {' '.join(scope.kubectl_args())} -o json"
         result = self.run_kubectl_command(cmd)
         
         if not result or result.returncode != 0:
@@ -54,7 +78,13 @@ class PodMigrationMonitor:
         
         try:
             pods_data = json.loads(result.stdout)
-            return pods_data.get('items', [])
+            items = pods_data.get('items', [])
+            if self.recorder:
+                self.recorder.record_list("pods", items, time.time())
+            return [
+                pod for pod in items
+                if scope.contains(pod.get('metadata', {}).get('namespace'))
+            ]
         except json.JSONDecodeError as e:
             print(f"JSON 파싱 오류: {e}")
             return []
@@ -65,7 +95,10 @@ class PodMigrationMonitor:
         spec = pod.get('spec', {})
         status = pod.get('status', {})
         
+        owner = controller_reference(metadata)
+        
         pod_info = {
+            'uid': metadata.get('uid') or metadata.get('name', 'Unknown'),
             'name': metadata.get('name', 'Unknown'),
             'namespace': metadata.get('namespace', 'default'),
             'node': spec.get('nodeName', 'Unscheduled'),
@@ -75,11 +108,17 @@ class PodMigrationMonitor:
                 container.get('restartCount', 0) 
                 for container in status.get('containerStatuses', [])
             ),
-            'ready': all(
-                container.get('ready', False) 
-                for container in status.get('containerStatuses', [])
-            ),
-            'conditions': status.get('conditions', [])
+            # 컨테이너 상태가 아직 없는 Pending 파드가 Ready로 잡히지 않도록 Ready 조건으로 판단
+            'ready': is_pod_ready(pod),
+            'conditions': status.get('conditions', []),
+            'owner': {
+                'kind': owner.get('kind', ''),
+                'name': owner.get('name', ''),
+                'uid': owner.get('uid', '')
+            } if owner else None,
+            'template_hash': metadata.get('labels', {}).get('pod-template-hash'),
+            'deleting': 'deletionTimestamp' in metadata,
+            'reason': status.get('reason')
         }
         
         return pod_info
@@ -95,75 +134,223 @@ class PodMigrationMonitor:
         
         try:
             nodes_data = json.loads(result.stdout)
-            node_status = {}
-            
-            for node in nodes_data.get('items', []):
-                name = node['metadata']['name']
-                conditions = node.get('status', {}).get('conditions', [])
-                
-                # Ready 상태 확인
-                ready_condition = next(
-                    (c for c in conditions if c['type'] == 'Ready'), 
-                    None
-                )
-                
-                node_status[name] = {
-                    'ready': ready_condition['status'] == 'True' if ready_condition else False,
-                    'conditions': conditions,
-                    'addresses': node.get('status', {}).get('addresses', [])
-                }
-            
-            return node_status
+            items = nodes_data.get('items', [])
+            if self.recorder:
+                self.recorder.record_list("nodes", items, time.time())
+            return self.node_status_from_items(items)
         except json.JSONDecodeError as e:
             print(f"JSON 파싱 오류: {e}")
             return {}
     
-    def detect_pod_migration(self, current_pods):
-        """파드 마이그레이션 감지"""
-        current_time = datetime.now()
+    @staticmethod
+    def node_tainted(node):
+        """격리 상태 여부 (cordon/drain 또는 NotReady/unreachable 등 NoExecute taint)"""
+        spec = node.get('spec', {})
+        return bool(spec.get('unschedulable')) or any(
+            taint.get('effect') == 'NoExecute' for taint in spec.get('taints') or []
+        )
+    
+    def node_failing(self, name):
+        """노드가 NotReady이거나 격리 상태인지 (이 노드에서 종료된 파드는 장애로 인한 종료로 봄)"""
+        status = self.node_status.get(name)
+        return status is not None and (not status['ready'] or status.get('tainted', False))
+    
+    @classmethod
+    def node_status_from_items(cls, items):
+        """노드 목록에서 이름별 Ready/격리 상태 추출"""
+        node_status = {}
+        
+        for node in items:
+            name = node['metadata']['name']
+            conditions = node.get('status', {}).get('conditions', [])
+            
+            # Ready 상태 확인
+            ready_condition = next(
+                (c for c in conditions if c['type'] == 'Ready'), 
+                None
+            )
+            
+            node_status[name] = {
+                'ready': ready_condition['status'] == 'True' if ready_condition else False,
+                'tainted': cls.node_tainted(node),
+                'conditions': conditions,
+                'addresses': node.get('status', {}).get('addresses', [])
+            }
+        
+        return node_status
+    
+    @staticmethod
+    def history_key(pod_info):
+        """이력 키 (여러 네임스페이스에 같은 이름의 파드가 있을 수 있음)"""
+        return f"{pod_info['namespace']}/{pod_info['name']}"
+    
+    def observe_pod(self, pod_info, ts):
+        """파드 상태 하나를 이름별 이력에 반영 (상태가 바뀐 경우에만 레코드 추가)"""
+        key = self.history_key(pod_info)
+        known = key in self.pod_history
+        changed = self.pod_history.append(
+            key, ts, pod_info['node'], pod_info['phase'],
+            pod_info['ready'], pod_info['restart_count']
+        )
+        if changed:
+            self.version += 1
+            if known and self.view:
+                self.emit(f"[{datetime.fromtimestamp(ts).strftime('%H:%M:%S')}] 파드 {key}: "
+                          f"{pod_info['node']} {pod_info['phase']} {'Ready' if pod_info['ready'] else 'NotReady'}")
+        return changed
+    
+    def emit(self, message):
+        """상태 전환 메시지 출력 (라이브 화면이면 최근 이벤트 영역에 표시)"""
+        if self.view:
+            self.view.transition(message)
+        else:
+            print(message)
+    
+    def record_event(self, kind, record):
+        """리포트 집계에 반영하고 스트리밍 출력이 있으면 바로 기록"""
+        self.report.add(kind, record)
+        if self.sink:
+            self.sink.write(kind, record)
+    
+    def flush_summary(self):
+        """스트리밍 출력 중이면 현재까지의 요약 파일 갱신"""
+        if self.sink:
+            with self.lock:
+                self.report.write_summary(self.sink.summary_path)
+    
+    def track_pod(self, event_type, pod_info, ts):
+        """소유 컨트롤러 기준으로 대체 파드를 추적하고 다른 노드로 옮겨졌으면 마이그레이션 이벤트 반환"""
+        migration = self.tracker.observe(event_type, pod_info, ts)
+        if migration:
+            migration['timestamp'] = datetime.fromtimestamp(migration['timestamp'])
+            if self.sink is None:
+                self.migration_events.append(migration)
+            self.record_event("migration", migration)
+        return migration
+    
+    def detect_pod_migration(self, current_pods, ts=None):
+        """파드 마이그레이션 감지 (직전 조회에 있었는데 사라진 파드는 종료로 처리, ts: 조회 시각 epoch 초)"""
+        ts = time.time() if ts is None else ts
+        current = {pod_info['uid']: pod_info for pod_info in current_pods}
         migrations = []
         
+        for uid, pod_info in self.last_seen_pods.items():
+            if uid not in current:
+                self.track_pod("DELETED", pod_info, ts)
+                self.pod_history.mark_gone(self.history_key(pod_info), ts)
+        
         for pod_info in current_pods:
-            pod_name = pod_info['name']
-            current_node = pod_info['node']
-            
-            # 이전 기록과 비교
-            if pod_name in self.pod_history:
-                last_record = self.pod_history[pod_name][-1]
-                last_node = last_record['node']
-                
-                # 노드가 변경되었고, 둘 다 실제 노드인 경우 (Unscheduled 제외)
-                if (current_node != last_node and 
-                    current_node != 'Unscheduled' and 
-                    last_node != 'Unscheduled'):
-                    
-                    migration = {
-                        'pod_name': pod_name,
-                        'namespace': pod_info['namespace'],
-                        'from_node': last_node,
-                        'to_node': current_node,
-                        'timestamp': current_time,
-                        'phase': pod_info['phase'],
-                        'ready': pod_info['ready']
-                    }
+            migration = self.track_pod("MODIFIED", pod_info, ts)
+            if migration:
+                migrations.append(migration)
+            self.observe_pod(pod_info, ts)
+        
+        self.last_seen_pods = current
+        self.pod_history.evict(ts)
+        self.tracker.expire(ts)
+        return migrations
+    
+    def handle_pod_event(self, event_type, pod, ts):
+        """파드 변경 이벤트 처리 (watch 모드, ts: 수신 시각 epoch 초)"""
+        if not self.scope.contains(pod.get('metadata', {}).get('namespace')):
+            return None # 전체 네임스페이스 세션에서 받은 범위 밖 파드
+        pod_info = self.get_pod_info(pod)
+        key = (pod_info['namespace'], pod_info['name'])
+        
+        with self.lock:
+            migration = self.track_pod(event_type, pod_info, ts)
+            if event_type == "DELETED":
+                self.current_pods.pop(key, None)
+                self.version += 1
+                self.pod_history.mark_gone(self.history_key(pod_info), ts)
+            else:
+                self.current_pods[key] = pod_info
+                self.observe_pod(pod_info, ts)
+        
+        if migration:
+            self.print_migration_events([migration])
+        return migration
+    
+    def resync_pods(self, items, ts):
+        """watch 재연결 시 목록 조회 결과로 현재 파드 정리 (연결이 끊긴 사이 삭제된 파드를 종료로 처리)
+        - 목록에 있는 파드는 이어지는 watch의 ADDED 이벤트로 갱신됨
+        """
+        listed = {
+            (pod.get('metadata', {}).get('namespace', 'default'), pod.get('metadata', {}).get('name', 'Unknown'))
+            for pod in items
+            if self.scope.contains(pod.get('metadata', {}).get('namespace'))
+        }
+        migrations = []
+        with self.lock:
+            for key, pod_info in list(self.current_pods.items()):
+                if key in listed:
+                    continue
+                migration = self.track_pod("DELETED", pod_info, ts)
+                if migration:
                     migrations.append(migration)
-                    self.migration_events.append(migration)
+                del self.current_pods[key]
+                self.version += 1
+                self.pod_history.mark_gone(self.history_key(pod_info), ts)
+        if migrations:
+            self.print_migration_events(migrations)
+    
+    def resync_nodes(self, items, ts):
+        """watch 재연결 시 목록에 없는 노드 제거"""
+        listed = {node.get('metadata', {}).get('name') for node in items}
+        with self.lock:
+            for name in [name for name in self.node_status if name not in listed]:
+                del self.node_status[name]
+                self.version += 1
+    
+    def handle_node_event(self, event_type, node, ts):
+        """노드 변경 이벤트 처리 (watch 모드, Ready 전환만 기록)"""
+        name = node.get('metadata', {}).get('name')
+        status = node.get('status', {})
+        ready = is_node_ready(node)
+        
+        with self.lock:
+            if event_type == "DELETED":
+                self.node_status.pop(name, None)
+                return None
             
-            # 현재 상태 기록
-            pod_record = {
-                'timestamp': current_time,
-                'node': current_node,
-                'phase': pod_info['phase'],
-                'ready': pod_info['ready'],
-                'restart_count': pod_info['restart_count']
+            previous = self.node_status.get(name)
+            self.node_status[name] = {
+                'ready': ready,
+                'tainted': self.node_tainted(node),
+                'conditions': status.get('conditions', []),
+                'addresses': status.get('addresses', [])
             }
-            self.pod_history[pod_name].append(pod_record)
+            if previous is None or previous['ready'] == ready:
+                return None
             
-            # 기록 제한 (최근 100개만 유지)
-            if len(self.pod_history[pod_name]) > 100:
-                self.pod_history[pod_name] = self.pod_history[pod_name][-100:]
+            event = {
+                'node': name,
+                'ready': ready,
+                'timestamp': datetime.fromtimestamp(ts)
+            }
+            if self.sink is None:
+                self.node_events.append(event)
+            self.record_event("node", event)
+            self.version += 1
         
-        return migrations
+        transition = "NotReady → Ready" if ready else "Ready → NotReady"
+        self.emit(f"{'' if self.view else chr(10)}[{event['timestamp'].strftime('%H:%M:%S.%f')[:-3]}] 노드 {name}: {transition}")
+        return event
+    
+    def record_node_metrics(self, pods, nodes):
+        """노드별 Ready 여부와 파드 수를 지표 저장소에 기록"""
+        timestamp = time.time()
+        counts = {name: {'pod_count': 0, 'ready_pods': 0} for name in nodes}
+        for pod in pods:
+            if pod['node'] in counts:
+                counts[pod['node']]['pod_count'] += 1
+                counts[pod['node']]['ready_pods'] += int(pod['ready'])
+        
+        for node_name, status in nodes.items():
+            sample = {'timestamp': timestamp, 'node_ready': 1.0 if status['ready'] else 0.0, **counts[node_name]}
+            self.metric_store.record(node_name, sample)
+            if self.metric_publisher:
+                self.metric_publisher.add(node_name, sample)
     
     def print_cluster_status(self, pods, nodes):
         """클러스터 상태 출력"""
@@ -177,6 +364,14 @@ class PodMigrationMonitor:
             status_icon = "정상" if status['ready'] else "비정상"
             print(f"  {status_icon} {node_name}: {'Ready' if status['ready'] else 'NotReady'}")
         
+        # 네임스페이스별 집계 (여러 네임스페이스를 볼 때만)
+        multi_namespace = self.scope.single_namespace is None
+        if multi_namespace:
+            print("\n네임스페이스별 파드:")
+            for namespace, counts in namespace_summary(pods).items():
+                unscheduled = f", 미스케줄 {counts['unscheduled']}개" if counts['unscheduled'] else ""
+                print(f"  {namespace}: {counts['ready']}/{counts['pods']} 파드 Ready{unscheduled}")
+        
         # 파드 분포
         print("\n파드 분포:")
         pod_by_node = defaultdict(list)
@@ -193,28 +388,60 @@ class PodMigrationMonitor:
             print(f"  🖥️  {node_name}: {ready_count}/{total_count} 파드 Ready")
             for pod in pods_on_node:
                 status_icon = "정상" if pod['ready'] else "비정상"
-                print(f"    {status_icon} {pod['name']} ({pod['phase']})")
+                name = self.history_key(pod) if multi_namespace else pod['name']
+                print(f"    {status_icon} {name} ({pod['phase']})")
         
         # 스케줄되지 않은 파드
         unscheduled_pods = [p for p in pods if p['node'] == 'Unscheduled']
         if unscheduled_pods:
             print(f"\n스케줄되지 않은 파드: {len(unscheduled_pods)}개")
             for pod in unscheduled_pods:
-                print(f"    {pod['name']} ({pod['phase']})")
+                name = self.history_key(pod) if multi_namespace else pod['name']
+                print(f"    {name} ({pod['phase']})")
     
     def print_migration_events(self, migrations):
         """마이그레이션 이벤트 출력"""
-        if migrations:
+        if migrations and self.view:
+            for migration in migrations:
+                self.emit(f"[{migration['timestamp'].strftime('%H:%M:%S')}] 마이그레이션 {migration['workload']}: "
+                          f"{migration['previous_pod']} → {migration['pod_name']} "
+                          f"({migration['from_node']} → {migration['to_node']}, {migration['reschedule_latency']:.1f}초)")
+        elif migrations:
             print("\n파드 마이그레이션 감지:")
             for migration in migrations:
                 timestamp = migration['timestamp'].strftime('%H:%M:%S')
-                print(f"  [{timestamp}] {migration['pod_name']}: "
-                      f"{migration['from_node']} → {migration['to_node']} "
-                      f"({migration['phase']})")
+                print(f"  [{timestamp}] {migration['workload']}: {migration['previous_pod']} → {migration['pod_name']} "
+                      f"({migration['from_node']} → {migration['to_node']}, "
+                      f"{migration['reschedule_latency']:.1f}초, {migration['phase']})")
+    
+    def status_footer(self):
+        """상태 출력 하단의 누적 통계"""
+        lines = []
+        if self.report.migration_count:
+            lines.append(f"📈 총 마이그레이션 이벤트: {self.report.migration_count}개")
+        lines.append(f"파드 이력: {len(self.pod_history)}개 파드, {self.pod_history.memory_usage() / 1024:.0f}KB")
+        with self.lock:
+            pending = self.tracker.pending_count()
+        if pending:
+            lines.append(f"대체 대기 중인 종료 파드: {pending}개")
+        return lines
+    
+    def show_status(self, pods, nodes, footer):
+        """출력 모드에 맞게 상태 표시 (전체 출력, 라이브 화면은 바뀐 줄만, 조용한 모드는 생략), 출력 여부 반환"""
+        if self.view is None:
+            self.print_cluster_status(pods, nodes)
+            print()
+            for line in footer:
+                print(line)
+            return True
+        return self.view.render(status_lines(pods, nodes, self.scope.single_namespace is None, footer))
     
     def monitor_loop(self, namespace="default", interval=10):
-        """모니터링 메인 루프"""
-        print(f"파드 마이그레이션 모니터링 시작 (네임스페이스: {namespace}, 간격: {interval}초)")
+        """모니터링 메인 루프 (namespace: 네임스페이스, 쉼표 구분 목록 또는 PodScope)
+        - 범위 전체를 kubectl 조회 한 번으로 가져옴
+        """
+        self.scope = PodScope.parse(namespace)
+        print(f"파드 마이그레이션 모니터링 시작 (네임스페이스: {self.scope.describe()}, 간격: {interval}초)")
         print("Ctrl+C를 눌러 중지할 수 있습니다.\n")
         
         while self.monitoring_active:
@@ -222,20 +449,26 @@ class PodMigrationMonitor:
                 # 현재 상태 조회
                 current_pods = [
                     self.get_pod_info(pod) 
-                    for pod in self.get_all_pods(namespace)
+                    for pod in self.get_all_pods(self.scope)
                 ]
                 current_nodes = self.get_node_status()
+                self.node_status = current_nodes
                 
-                # 마이그레이션 감지
+                # 마이그레이션 감지 (노드 상태로 장애로 인한 종료인지 판단)
                 migrations = self.detect_pod_migration(current_pods)
+                self.record_node_metrics(current_pods, current_nodes)
                 
-                # 상태 출력
-                self.print_cluster_status(current_pods, current_nodes)
-                self.print_migration_events(migrations)
-                
-                # 마이그레이션 통계
-                if self.migration_events:
-                    print(f"\n📈 총 마이그레이션 이벤트: {len(self.migration_events)}개")
+                # 상태 출력 (라이브/조용한 모드에서는 마이그레이션을 먼저 이벤트로 전달)
+                if self.view:
+                    self.print_migration_events(migrations)
+                    self.show_status(current_pods, current_nodes, self.status_footer())
+                else:
+                    self.print_cluster_status(current_pods, current_nodes)
+                    self.print_migration_events(migrations)
+                    print()
+                    for line in self.status_footer():
+                        print(line)
+                self.flush_summary()
                 
                 time.sleep(interval)
                 
@@ -243,11 +476,114 @@ class PodMigrationMonitor:
                 print(f"모니터링 오류: {e}")
                 time.sleep(interval)
     
-    def start_monitoring(self, namespace="default", interval=10):
+    def watch_loop(self, namespace="default", interval=10):
+        """watch 모드 메인 루프
+        - 파드/노드 변경 이벤트를 받는 즉시 마이그레이션과 Ready 전환을 감지 (변경 건수만큼만 처리)
+        - 전체 클러스터 상태는 interval마다 메모리의 현재 상태로 출력
+        - 라이브 화면은 상태가 바뀌었을 때만 초당 max_rate회 이내로 다시 그림
+        - 네임스페이스가 여러 개여도 파드 watch는 하나만 사용
+        """
+        self.scope = PodScope.parse(namespace)
+        print(f"파드 마이그레이션 모니터링 시작 (watch 모드, 네임스페이스: {self.scope.describe()}, 상태 출력 간격: {interval}초)")
+        print("Ctrl+C를 눌러 중지할 수 있습니다.\n")
+        
+        # 처음에는 현재 객체가 ADDED 이벤트로 전달되어 기준 상태가 됨
+        # watch가 다시 연결될 때는 목록 조회로 끊긴 사이 삭제된 파드/노드를 정리
+        on_pod, on_node = self.handle_pod_event, self.handle_node_event
+        resync_pods, resync_nodes = self.resync_pods, self.resync_nodes
+        if self.recorder:
+            on_pod, on_node = self.recorder.wrap("pods", on_pod), self.recorder.wrap("nodes", on_node)
+            resync_pods = self.recorder.wrap_resync("pods", resync_pods)
+            resync_nodes = self.recorder.wrap_resync("nodes", resync_nodes)
+        self.watches = [
+            KubeWatch("pods", on_pod, on_resync=resync_pods, **self.scope.watch_options()),
+            KubeWatch("nodes", on_node, on_resync=resync_nodes),
+        ]
+        if self.recorder:
+            # 쿠버네티스 이벤트(축출, 스케줄 실패 등)는 기록만 함
+            self.watches.append(KubeWatch("events", self.recorder.wrap("events"), **self.scope.watch_options()))
+        for watch in self.watches:
+            watch.start()
+        
+        refresh = self.view.refresh_interval if self.view else None
+        tick = min(interval, refresh) if refresh else interval
+        last_periodic = time.time()
+        drawn_version = None
+        footer = []
+        
+        try:
+            while self.monitoring_active:
+                time.sleep(tick)
+                now = time.time()
+                periodic = now - last_periodic >= interval
+                if not periodic and (self.view is None or (self.version == drawn_version and not self.view.dirty)):
+                    continue # 바뀐 것이 없으면 다시 그리지 않음
+                
+                with self.lock:
+                    current_pods = list(self.current_pods.values())
+                    current_nodes = dict(self.node_status)
+                    version = self.version
+                    if periodic:
+                        self.pod_history.evict(now)
+                        self.tracker.expire(now)
+                
+                if periodic:
+                    last_periodic = now
+                    self.record_node_metrics(current_pods, current_nodes)
+                    self.flush_summary()
+                    footer = self.status_footer()
+                
+                if self.show_status(current_pods, current_nodes, footer):
+                    drawn_version = version
+        finally:
+            for watch in self.watches:
+                watch.stop()
+            self.watches = []
+    
+    def replay(self, path, speed=None, interval=10):
+        """기록된 스트림을 감지/리포트 로직으로 다시 처리
+        - speed: 재생 배속 (None 또는 0이면 최대 속도)
+        - 시각은 기록된 수신 시각을 그대로 사용하므로 소요 시간은 원래 실행과 같게 계산됨
+        """
+        print(f"기록 재생: {path} ({f'{speed}배속' if speed else '최대 속도'}, 네임스페이스: {self.scope.describe()})")
+        last_evict = [None]
+        
+        def dispatch(stream, event_type, obj, ts):
+            if event_type == "RESYNC":
+                # watch 모드 재연결 시점의 목록
+                if stream == "pods":
+                    self.resync_pods(obj.get('items', []), ts)
+                else:
+                    self.resync_nodes(obj.get('items', []), ts)
+            elif stream == "pods":
+                if event_type == "LIST":
+                    current_pods = [
+                        self.get_pod_info(pod) for pod in obj.get('items', [])
+                        if self.scope.contains(pod.get('metadata', {}).get('namespace'))
+                    ]
+                    self.print_migration_events(self.detect_pod_migration(current_pods, ts))
+                else:
+                    self.handle_pod_event(event_type, obj, ts)
+            elif event_type == "LIST":
+                self.node_status = self.node_status_from_items(obj.get('items', []))
+            else:
+                self.handle_node_event(event_type, obj, ts)
+            
+            if last_evict[0] is None or ts - last_evict[0] >= interval:
+                self.pod_history.evict(ts)
+                self.tracker.expire(ts)
+                last_evict[0] = ts
+        
+        stats = replay_stream_log(path, dispatch, speed, streams={"pods", "nodes"})
+        print(f"\n재생 완료: {stats['records']}개 레코드, 기록 구간 {stats['recorded_seconds']:.1f}초를 "
+              f"{stats['elapsed_seconds']:.1f}초에 처리")
+        return stats
+    
+    def start_monitoring(self, namespace="default", interval=10, watch=False):
         """백그라운드에서 모니터링 시작"""
         self.monitoring_active = True
         monitor_thread = threading.Thread(
-            target=self.monitor_loop,
+            target=self.watch_loop if watch else self.monitor_loop,
             args=(namespace, interval)
         )
         monitor_thread.daemon = True
@@ -258,73 +594,116 @@ class PodMigrationMonitor:
         """모니터링 중지"""
         self.monitoring_active = False
     
-    def export_migration_report(self, output_file="migration_report.json"):
-        """마이그레이션 리포트 내보내기"""
+    def export_migration_report(self, output_file="migration_report.json", extra=None):
+        """마이그레이션 리포트 내보내기 (extra: 함께 저장할 추가 항목)
+        - 개수와 분석은 리포트 집계에서, 이벤트 목록은 스트리밍 출력 중이면 기록 파일에서 읽어 옮김
+        """
+        summary = self.report.summary()
         report = {
-            'total_migrations': len(self.migration_events),
-            'migration_events': [
-                {
-                    'pod_name': event['pod_name'],
-                    'namespace': event['namespace'],
-                    'from_node': event['from_node'],
-                    'to_node': event['to_node'],
-                    'timestamp': event['timestamp'].isoformat(),
-                    'phase': event['phase'],
-                    'ready': event['ready']
-                }
-                for event in self.migration_events
-            ],
+            'total_migrations': summary['migrations'],
+            'scope': self.scope.to_dict(),
+            'analysis': summary, # 복구 시간 분포, 워크로드별 다운타임, 노드별 축출 속도
             'generated_at': datetime.now().isoformat()
         }
+        if extra:
+            report.update(extra)
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        if self.sink:
+            streams = {'migration_events': self.sink.read("migration"), 'node_events': self.sink.read("node")}
+        else:
+            streams = {'migration_events': self.migration_events, 'node_events': self.node_events}
+        write_report_json(output_file, report, streams)
         
         print(f"마이그레이션 리포트가 저장되었습니다: {output_file}")
 
 def main():
     parser = argparse.ArgumentParser(description="쿠버네티스 파드 마이그레이션 모니터링")
-    parser.add_argument("--namespace", default="default", help="모니터링할 네임스페이스")
-    parser.add_argument("--interval", type=int, default=10, help="모니터링 간격 (초)")
+    parser.add_argument("--namespace", help="모니터링할 네임스페이스 (쉼표로 여러 개 지정, 기본: default)")
+    parser.add_argument("-A", "--all-namespaces", action="store_true", help="모든 네임스페이스 모니터링")
+    parser.add_argument("-l", "--selector", help="파드 레이블 셀렉터 (예: app=web)")
+    parser.add_argument("--interval", type=int, default=10, help="모니터링 간격 (초, watch 모드에서는 상태 출력 간격)")
+    parser.add_argument("--watch", action="store_true", help="주기 조회 대신 watch 스트림으로 변경 즉시 감지")
+    parser.add_argument("--view", choices=["full", "live", "quiet"], default="full",
+                        help="full: 매 주기 전체 출력, live: 바뀐 줄만 다시 그리는 화면, quiet: 상태 전환만 출력")
+    parser.add_argument("--max-rate", type=float, default=2.0, help="라이브 화면의 초당 최대 다시 그리기 횟수")
     parser.add_argument("--output", help="마이그레이션 리포트 출력 파일")
+    parser.add_argument("--stream", help="이벤트를 실행 중에 바로 기록할 경로 (ndjson: 파일, csv: 디렉토리)")
+    parser.add_argument("--stream-format", choices=["ndjson", "csv"], default="ndjson", help="스트리밍 출력 형식")
+    parser.add_argument("--record", help="원본 노드/파드/이벤트 스트림을 기록할 파일 (gzip JSON Lines, 예: results/run.ndjson.gz)")
+    parser.add_argument("--replay", help="클러스터 대신 기록 파일을 재생하여 분석")
+    parser.add_argument("--speed", type=float, default=0, help="재생 배속 (0: 최대 속도)")
+    parser.add_argument("--metrics-url", help="노드 상태/파드 수를 전송할 API 서버 주소 (예: http://localhost:8000)")
     
     args = parser.parse_args()
+    if args.record and not args.replay and Path(args.record).exists():
+        parser.error(f"기록 파일이 이미 있습니다: {args.record} (다른 경로를 지정하세요)")
+    if args.replay and not (args.namespace or args.all_namespaces or args.selector):
+        scope = PodScope.from_dict(read_meta(args.replay).get('scope')) # 기록할 때의 범위
+    else:
+        scope = PodScope.parse(args.namespace or "default", args.all_namespaces, args.selector)
     
     monitor = PodMigrationMonitor()
+    if not args.replay:
+        monitor.view = create_view(args.view, args.max_rate)
+    if args.record and not args.replay:
+        monitor.recorder = StreamRecorder(args.record, meta={
+            'scope': scope.to_dict(),
+            'mode': 'watch' if args.watch else 'poll',
+            'interval': args.interval
+        })
+        print(f"스트림 기록: {args.record}")
+    if args.metrics_url:
+        monitor.metric_publisher = MetricPublisher(args.metrics_url).start()
+    if args.stream:
+        monitor.sink = open_sink(args.stream, args.stream_format)
+        print(f"이벤트 스트리밍 출력: {args.stream} ({args.stream_format}, 요약: {monitor.sink.summary_path})")
     
     try:
         monitor.monitoring_active = True
-        monitor.monitor_loop(args.namespace, args.interval)
+        if args.replay:
+            monitor.scope = scope
+            monitor.replay(args.replay, args.speed, args.interval)
+        elif args.watch:
+            monitor.watch_loop(scope, args.interval)
+        else:
+            monitor.monitor_loop(scope, args.interval)
     except KeyboardInterrupt:
         print("\n모니터링이 중지되었습니다.")
     finally:
         monitor.stop_monitoring()
+        if monitor.view:
+            monitor.view.close()
+        if monitor.recorder:
+            monitor.recorder.close()
+            print(f"스트림 기록 완료: {monitor.recorder.path} ({monitor.recorder.count}개 레코드)")
+        if monitor.metric_publisher:
+            monitor.metric_publisher.stop()
+        if monitor.sink:
+            monitor.flush_summary()
+            monitor.sink.close()
         
         if args.output:
             monitor.export_migration_report(args.output)
         
-        # 요약 출력
-        if monitor.migration_events:
+        # 요약 출력 (노드별 통계는 리포트 집계의 카운터 사용)
+        summary = monitor.report.summary()
+        if summary['migrations']:
             print(f"\n모니터링 요약:")
-            print(f"  - 총 마이그레이션 이벤트: {len(monitor.migration_events)}개")
-            
-            # 노드별 마이그레이션 통계
-            from_nodes = defaultdict(int)
-            to_nodes = defaultdict(int)
+            print(f"  - 총 마이그레이션 이벤트: {summary['migrations']}개")
             
-            for event in monitor.migration_events:
-                from_nodes[event['from_node']] += 1
-                to_nodes[event['to_node']] += 1
-            
-            if from_nodes:
+            if summary['from_nodes']:
                 print("  - 마이그레이션 출발 노드:")
-                for node, count in from_nodes.items():
+                for node, count in summary['from_nodes'].items():
                     print(f"    {node}: {count}개")
             
-            if to_nodes:
+            if summary['to_nodes']:
                 print("  - 마이그레이션 도착 노드:")
-                for node, count in to_nodes.items():
+                for node, count in summary['to_nodes'].items():
                     print(f"    {node}: {count}개")
+        
+        if summary['replacements'] or summary['nodes']:
+            print("\n마이그레이션 분석:")
+            print_report(summary)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+파드 모니터링 범위
+네임스페이스 목록, 레이블 셀렉터, 전체 네임스페이스를 하나의 kubectl 조회/watch 세션으로 처리하고
+네임스페이스별 파드 수를 집계
+"""
+
+from collections import defaultdict
+
+class PodScope:
+    """모니터링할 네임스페이스/레이블 범위
+    - 네임스페이스 하나: -n으로 서버에서 필터링
+    - 여러 네임스페이스 또는 전체: --all-namespaces 세션 하나로 받고 목록에 없는 네임스페이스는 바로 버림
+    - 레이블 셀렉터는 항상 -l로 서버에 전달
+    """
+
+    def __init__(self, namespaces=None, all_namespaces=False, label_selector=None):
+        self.namespaces = frozenset(namespaces or ()) if not all_namespaces else frozenset()
+        self.all_namespaces = all_namespaces or not self.namespaces
+        self.label_selector = label_selector or None
+
+    @classmethod
+    def parse(cls, namespace="default", all_namespaces=False, label_selector=None):
+        """쉼표로 구분한 네임스페이스 문자열 또는 PodScope를 범위로 변환"""
+        if isinstance(namespace, PodScope):
+            return namespace
+        namespaces = [ns.strip() for ns in (namespace or "").split(",") if ns.strip()]
+        return cls(namespaces, all_namespaces, label_selector)
+
+    @classmethod
+    def from_dict(cls, data):
+        """to_dict() 결과로 범위 복원 (없으면 default 네임스페이스)"""
+        if not data:
+            return cls(["default"])
+        return cls(data.get('namespaces'), data.get('all_namespaces', False), data.get('label_selector'))
+
+    def to_dict(self):
+        return {
+            'namespaces': sorted(self.namespaces),
+            'all_namespaces': self.all_namespaces,
+            'label_selector': self.label_selector
+        }
+
+    @property
+    def single_namespace(self):
+        if not self.all_namespaces and len(self.namespaces) == 1:
+            return next(iter(self.namespaces))
+        return None
+
+    def kubectl_args(self):
+        """kubectl get/watch에 붙일 범위 인자"""
+        args = ["-n", self.single_namespace] if self.single_namespace else ["--all-namespaces"]
+        if self.label_selector:
+            args += ["-l", self.label_selector]
+        return args
+
+    def watch_options(self):
+        """KubeWatch 생성 인자"""
+        return {
+            'namespace': self.single_namespace,
+            'all_namespaces': self.single_namespace is None,
+            'label_selector': self.label_selector,
+        }
+
+    def contains(self, namespace):
+        """서버에서 걸러지지 않은 네임스페이스인지 확인 (목록이 여러 개일 때만 의미 있음)"""
+        return self.all_namespaces or namespace in self.namespaces
+
+    def describe(self):
+        target = "전체" if self.all_namespaces else ", ".join(sorted(self.namespaces))
+        if self.label_selector:
+            target += f", 셀렉터: {self.label_selector}"
+        return target
+
+def namespace_summary(pods):
+    """네임스페이스별 파드 수, Ready 수, 스케줄되지 않은 파드 수"""
+    summary = defaultdict(lambda: {'pods': 0, 'ready': 0, 'unscheduled': 0})
+    for pod in pods:
+        counts = summary[pod['namespace']]
+        counts['pods'] += 1
+        counts['ready'] += int(pod['ready'])
+        counts['unscheduled'] += int(pod['node'] == 'Unscheduled')
+    return dict(sorted(summary.items()))
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+파드 Ready 대기
+레이블 셀렉터로 지정한 파드가 모두 Ready가 되는 순간을 watch 이벤트로 감지하고
+파드별 생성/스케줄/Ready 시각과 기동 소요 시간을 기록
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+from datetime import datetime
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from tools.kube_watch import KubeWatch
+from tools.stats import summarize
+from scripts.monitoring.isolation_timeline import is_pod_ready, parse_timestamp
+
+def condition_time(pod, condition_type):
+    """조건이 True로 바뀐 시각 (epoch 초, 없으면 None)"""
+    for condition in pod.get('status', {}).get('conditions') or []:
+        if condition.get('type') == condition_type and condition.get('status') == 'True':
+            return parse_timestamp(condition.get('lastTransitionTime'))
+    return None
+
+class ReadinessWait:
+    """레이블 셀렉터에 해당하는 파드가 expected개 Ready가 될 때까지 대기
+    - watch 시작 시 현재 파드가 ADDED로 전달되므로 이미 Ready인 파드도 바로 반영
+    - 대기 시작 후 생성된 파드는 수신 시각으로, 그 전에 있던 파드는 API 서버의 기록 시각
+      (creationTimestamp, 조건 전환 시각)으로 생성/스케줄/Ready 시각을 기록
+    - source를 지정하면 kubectl watch 대신 해당 소스(예: 시뮬레이션 클러스터)의 이벤트를 구독
+    """
+
+    def __init__(self, label_selector, namespace="default", expected=None, source=None):
+        self.label_selector = label_selector
+        self.namespace = namespace
+        self.expected = expected
+        self.source = source
+        self.pods = {} # 파드 uid -> 파드별 시각 기록
+        self.started_at = None
+        self.finished_at = None
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        self.watches = [] if source else [
+            KubeWatch("pods", self.handle_pod_event, namespace=namespace, label_selector=label_selector)
+        ]
+
+    def start(self):
+        """watch 시작 (배포 명령 실행 전에 호출하면 생성 시점부터 기록됨)"""
+        self.started_at = time.time()
+        if self.source:
+            self.source.subscribe("pods", self.handle_pod_event)
+        for watch in self.watches:
+            watch.start()
+        return self
+
+    def stop(self):
+        if self.source:
+            self.source.unsubscribe("pods", self.handle_pod_event)
+        for watch in self.watches:
+            watch.stop()
+
+    def set_expected(self, expected):
+        """목표 Ready 파드 수 지정 (배포 후 레플리카 수를 알게 되었을 때)"""
+        with self.lock:
+            self.expected = expected
+            self._check_done(time.time())
+
+    def handle_pod_event(self, event_type, pod, received_at):
+        metadata = pod.get('metadata', {})
+        uid = metadata.get('uid') or metadata.get('name')
+        node = pod.get('spec', {}).get('nodeName')
+
+        with self.lock:
+            if event_type == "DELETED" or metadata.get('deletionTimestamp'):
+                self.pods.pop(uid, None)
+                return
+            record = self.pods.get(uid)
+            if record is None:
+                created = parse_timestamp(metadata.get('creationTimestamp'))
+                existing = created is not None and self.started_at and created < int(self.started_at)
+                record = self.pods[uid] = {
+                    'name': metadata.get('name'),
+                    'node': None,
+                    # 대기 중 생성된 파드는 초 단위인 서버 시각보다 수신 시각이 더 정확함
+                    'created_at': created if existing else received_at,
+                    'scheduled_at': condition_time(pod, 'PodScheduled') if existing else None,
+                    'ready_at': condition_time(pod, 'Ready') if existing else None,
+                }
+            if node and record['node'] is None:
+                record['node'] = node
+                if record['scheduled_at'] is None:
+                    record['scheduled_at'] = received_at
+            if is_pod_ready(pod):
+                if record['ready_at'] is None:
+                    record['ready_at'] = received_at
+            else:
+                record['ready_at'] = None # Ready였다가 다시 NotReady
+            self._check_done(received_at)
+
+    def ready_count(self):
+        return sum(1 for record in self.pods.values() if record['ready_at'] is not None)
+
+    def _check_done(self, ts):
+        if self.expected is None or self.done.is_set():
+            return
+        if self.ready_count() >= self.expected:
+            self.finished_at = ts
+            self.done.set()
+
+    def wait(self, timeout):
+        """모두 Ready가 되거나 타임아웃까지 대기, 성공 여부 반환"""
+        return self.done.wait(timeout)
+
+    def pod_timings(self):
+        """파드별 생성/스케줄/Ready 시각과 기동 소요 시간(초)"""
+        with self.lock:
+            records = sorted(self.pods.values(), key=lambda record: record['created_at'])
+        return [
+            {
+                'pod': record['name'],
+                'node': record['node'],
+                'created_at': datetime.fromtimestamp(record['created_at']).isoformat(),
+                'scheduled_at': datetime.fromtimestamp(record['scheduled_at']).isoformat() if record['scheduled_at'] else None,
+                'ready_at': datetime.fromtimestamp(record['ready_at']).isoformat() if record['ready_at'] else None,
+                'startup_latency': round(record['ready_at'] - record['created_at'], 3) if record['ready_at'] else None,
+            }
+            for record in records
+        ]
+
+    def summary(self):
+        timings = self.pod_timings()
+        return {
+            'expected': self.expected,
+            'ready': sum(1 for timing in timings if timing['ready_at']),
+            'wait_seconds': round((self.finished_at or time.time()) - self.started_at, 3) if self.started_at else None,
+            'startup_latency': summarize(t['startup_latency'] for t in timings if t['startup_latency'] is not None),
+            'pods': timings,
+        }
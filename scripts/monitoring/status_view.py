@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+모니터링 상태 화면
+매 주기 전체를 다시 출력하지 않고 바뀐 줄만 다시 그리는 라이브 화면과 상태 전환만 출력하는 조용한 모드
+"""
+
+import sys
+import time
+import shutil
+import unicodedata
+from collections import defaultdict, deque
+from datetime import datetime
+
+# 라이브 화면에서 노드별로 보여줄 Ready가 아닌 파드 최대 수
+MAX_NOT_READY_PODS = 5
+
+def display_width(text):
+    """터미널 표시 폭 (한글 등 전각 문자는 2칸)"""
+    return sum(2 if unicodedata.east_asian_width(ch) in ("W", "F") else 1 for ch in text)
+
+def fit(text, width):
+    """터미널 폭을 넘는 줄을 자름 (줄바꿈되면 줄 위치가 어긋남)"""
+    if display_width(text) <= width:
+        return text
+    result = []
+    used = 0
+    for ch in text:
+        w = 2 if unicodedata.east_asian_width(ch) in ("W", "F") else 1
+        if used + w > width - 1:
+            break
+        result.append(ch)
+        used += w
+    return "".join(result) + "…"
+
+def pad(text, width):
+    return text + " " * max(0, width - display_width(text))
+
+def status_lines(pods, nodes, namespaces=False, footer=()):
+    """노드별 파드 수 중심의 상태 화면 줄 목록
+    - 파드는 노드별 Ready/전체 수로 묶고 Ready가 아닌 파드만 일부 표시
+    - namespaces: 네임스페이스별 집계 표시 여부
+    """
+    by_node = defaultdict(lambda: {'total': 0, 'ready': 0, 'not_ready': []})
+    by_namespace = defaultdict(lambda: [0, 0])
+    for pod in pods:
+        counts = by_node[pod['node']]
+        counts['total'] += 1
+        if pod['ready']:
+            counts['ready'] += 1
+        else:
+            counts['not_ready'].append(pod)
+        by_namespace[pod['namespace']][0] += 1
+        by_namespace[pod['namespace']][1] += int(pod['ready'])
+
+    ready_pods = sum(counts['ready'] for counts in by_node.values())
+    lines = [
+        f"클러스터 상태 - 노드 {len(nodes)}개 (Ready {sum(1 for s in nodes.values() if s['ready'])}), "
+        f"파드 {len(pods)}개 (Ready {ready_pods})",
+        "",
+        f"  {pad('노드', 24)} {pad('상태', 9)} {'Ready/전체':>11}",
+    ]
+    for node_name in sorted(set(nodes) | {n for n in by_node if n != 'Unscheduled'}):
+        status = nodes.get(node_name)
+        state = "Ready" if status and status['ready'] else ("NotReady" if status else "Unknown")
+        counts = by_node.get(node_name, {'total': 0, 'ready': 0, 'not_ready': []})
+        lines.append(f"  {pad(node_name, 24)} {pad(state, 9)} {counts['ready']:>5}/{counts['total']:<5}")
+        for pod in counts['not_ready'][:MAX_NOT_READY_PODS]:
+            lines.append(f"      비정상 {pod['namespace']}/{pod['name']} ({pod['phase']})")
+        if len(counts['not_ready']) > MAX_NOT_READY_PODS:
+            lines.append(f"      ... 외 {len(counts['not_ready']) - MAX_NOT_READY_PODS}개")
+
+    unscheduled = by_node.get('Unscheduled')
+    if unscheduled:
+        lines.append(f"  스케줄되지 않은 파드: {unscheduled['total']}개")
+
+    if namespaces:
+        lines += ["", "네임스페이스별 파드:"]
+        for namespace, (total, ready) in sorted(by_namespace.items()):
+            lines.append(f"  {pad(namespace, 24)} {ready:>5}/{total:<5}")
+
+    if footer:
+        lines += ["", *footer]
+    return lines
+
+class LiveView:
+    """바뀐 줄만 다시 그리는 라이브 화면
+    - 직전에 그린 줄과 비교하여 달라진 줄만 ANSI 커서 이동으로 덮어씀
+    - max_rate: 초당 최대 다시 그리기 횟수 (이벤트가 몰려도 출력량이 제한됨)
+    - full_redraw: 다른 출력으로 화면이 어긋났을 수 있으므로 이 간격(초)마다 전체를 다시 그림
+    """
+
+    def __init__(self, stream=None, max_rate=2.0, event_lines=10, full_redraw=30):
+        self.stream = stream or sys.stdout
+        self.min_interval = 1.0 / max_rate if max_rate > 0 else 0.0
+        self.full_redraw = full_redraw
+        self.events = deque(maxlen=event_lines) # 최근 상태 전환
+        self.previous = [] # 직전에 그린 화면 줄
+        self.last_draw = 0.0
+        self.last_full_draw = 0.0
+        self.dirty = True
+
+    @property
+    def refresh_interval(self):
+        return max(self.min_interval, 0.1)
+
+    def transition(self, message):
+        """상태 전환 메시지를 최근 이벤트 영역에 추가"""
+        self.events.append(message)
+        self.dirty = True
+
+    def render(self, lines, now=None):
+        """화면 갱신 (다시 그리기 간격 전이면 건너뜀), 그렸는지 반환"""
+        now = time.time() if now is None else now
+        if now - self.last_draw < self.min_interval:
+            return False
+
+        columns, rows = shutil.get_terminal_size()
+        # 최근 이벤트는 화면 아래쪽에 남기고 상태 줄이 넘치면 상태 줄을 자름
+        events = ["", "최근 이벤트:", *self.events] if self.events else []
+        screen = [f"{datetime.fromtimestamp(now).strftime('%H:%M:%S')}  (Ctrl+C로 종료)", *lines]
+        screen = screen[:max(1, rows - 1 - len(events))] + events
+        screen = [fit(line, columns) for line in screen[:max(1, rows - 1)]]
+
+        out = []
+        if now - self.last_full_draw >= self.full_redraw:
+            out.append("\x1b[?25l\x1b[2J") # 커서 숨김, 화면 지움
+            self.previous = []
+            self.last_full_draw = now
+        for row, line in enumerate(screen):
+            if row >= len(self.previous) or self.previous[row] != line:
+                out.append(f"\x1b[{row + 1};1H{line}\x1b[K")
+        if len(self.previous) > len(screen):
+            out.append(f"\x1b[{len(screen) + 1};1H\x1b[J") # 줄어든 만큼 아래를 지움
+        if out:
+            self.stream.write("".join(out))
+            self.stream.flush()
+
+        self.previous = screen
+        self.last_draw = now
+        self.dirty = False
+        return True
+
+    def close(self):
+        """커서를 다시 보이게 하고 화면 아래로 이동"""
+        self.stream.write(f"\x1b[{len(self.previous) + 1};1H\x1b[?25h\n")
+        self.stream.flush()
+
+class QuietView:
+    """상태 화면 없이 상태 전환(마이그레이션, 노드/파드 Ready 변화)만 출력"""
+
+    refresh_interval = None
+    dirty = False
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def transition(self, message):
+        self.stream.write(message + "\n")
+        self.stream.flush()
+
+    def render(self, lines, now=None):
+        return False
+
+    def close(self):
+        pass
+
+def create_view(mode, max_rate=2.0):
+    """출력 모드에 맞는 화면 생성 (full은 기존 전체 출력이므로 None)"""
+    if mode == "full":
+        return None
+    if mode == "live":
+        return LiveView(max_rate=max_rate)
+    if mode == "quiet":
+        return QuietView()
+    raise ValueError(f"지원하지 않는 출력 모드: {mode}")
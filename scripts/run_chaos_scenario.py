@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+카오스 시나리오 실행 스크립트
+YAML 시나리오 파일에 정의된 격리 동작을 계획된 시각에 실행하고 실제 실행 시각과의 차이를 기록
+"""
+
+import sys
+import json
+import time
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime
+
+import yaml
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+from tools.stats import summarize
+from scripts.stress.node_isolation import isolate_node, ISOLATION_METHODS
+from scripts.monitoring.isolation_timeline import IsolationTimeline, PHASES
+
+# 정밀 대기 시 마지막 구간을 짧은 sleep으로 나누는 기준(초)
+SPIN_THRESHOLD = 0.02
+
+def load_scenario(path):
+    """시나리오 파일 로드 및 검증"""
+    with open(path, 'r', encoding='utf-8') as f:
+        scenario = yaml.safe_load(f)
+
+    actions = scenario.get('actions') or []
+    if not actions:
+        raise ValueError("시나리오에 actions가 없습니다")
+
+    for i, action in enumerate(actions):
+        for key in ('node', 'method', 'at'):
+            if key not in action:
+                raise ValueError(f"actions[{i}]에 {key} 항목이 없습니다")
+        if action['method'] not in ISOLATION_METHODS:
+            raise ValueError(f"actions[{i}] 지원하지 않는 격리 방법: {action['method']}")
+        action['at'] = float(action['at'])
+        action['duration'] = int(action.get('duration', 60))
+
+    # 같은 노드에 겹치는 동작이 있으면 복구 명령이 서로 간섭하므로 거부
+    by_node = {}
+    for action in sorted(actions, key=lambda a: a['at']):
+        previous = by_node.get(action['node'])
+        if previous and action['at'] < previous['at'] + previous['duration']:
+            raise ValueError(f"노드 {action['node']}에 겹치는 동작이 있습니다 (t={previous['at']}s, t={action['at']}s)")
+        by_node[action['node']] = action
+
+    scenario.setdefault('name', Path(path).stem)
+    scenario['actions'] = actions
+    return scenario
+
+def wait_until(deadline, stop_event=None):
+    """monotonic 기준 시각까지 정밀 대기 (stop_event가 설정되면 False 반환)"""
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return True
+        timeout = remaining - SPIN_THRESHOLD if remaining > SPIN_THRESHOLD else remaining / 2
+        if stop_event is None:
+            time.sleep(timeout)
+        elif stop_event.wait(timeout):
+            return False
+
+class ScenarioScheduler:
+    """시나리오 1회 실행
+    - 모든 동작은 공통 기준 시각(t=0)으로부터의 오프셋에 맞춰 각자의 스레드에서 시작
+    - 장애 해제도 주입 명령 지연과 무관하게 계획된 종료 시각(t=0 + at + duration)에 시작
+    - 장애 주입/해제 명령이 실제로 실행된 시각을 계획 시각과 비교하여 기록
+    - 중단 시 stop_event로 진행 중인 동작을 바로 복구시키고 스레드 종료까지 대기
+    """
+
+    def __init__(self, scenario, record_timeline=False, settle_timeout=600, lead_time=1.0):
+        self.scenario = scenario
+        self.record_timeline = record_timeline
+        self.settle_timeout = settle_timeout
+        self.lead_time = lead_time
+        self.stop_event = threading.Event()
+
+    def run_action(self, index, action, t0, t0_wall, results):
+        """동작 하나 실행"""
+        record = {
+            'index': index,
+            'node': action['node'],
+            'method': action['method'],
+            'planned_start': action['at'],
+            'planned_end': action['at'] + action['duration'],
+            'actual_start': None,
+            'actual_end': None,
+            'start_offset_ms': None,
+            'end_offset_ms': None,
+            'success': False,
+            'error': None,
+            'durations': None,
+        }
+        results[index] = record
+
+        def on_event(name, ts):
+            offset = ts - t0_wall
+            if name == "fault_injected":
+                record['actual_start'] = round(offset, 4)
+                record['start_offset_ms'] = round((offset - record['planned_start']) * 1000, 1)
+            elif name == "fault_removed":
+                record['actual_end'] = round(offset, 4)
+                record['end_offset_ms'] = round((offset - record['planned_end']) * 1000, 1)
+            if timeline:
+                timeline.on_fault_event(name, ts)
+
+        timeline = IsolationTimeline(action['node']) if self.record_timeline else None
+        if not wait_until(t0 + action['at'], self.stop_event):
+            record['error'] = "중단됨"
+            return
+        try:
+            if timeline:
+                timeline.start()
+            isolate_node(
+                action['node'], action['method'], action['duration'], on_event=on_event,
+                stop_event=self.stop_event, deadline=t0 + action['at'] + action['duration']
+            )
+            record['success'] = True
+            if timeline:
+                # 중단 요청 시 복구 완료를 기다리지 않음
+                settle_deadline = time.monotonic() + self.settle_timeout
+                while not timeline.wait_settled(1) and not self.stop_event.is_set():
+                    if time.monotonic() >= settle_deadline:
+                        break
+        except Exception as e:
+            record['error'] = str(e)
+        finally:
+            if timeline:
+                timeline.stop()
+                record['durations'] = timeline.durations()
+
+    def _run_action_thread(self, index, action, t0, t0_wall, results, done):
+        try:
+            self.run_action(index, action, t0, t0_wall, results)
+        finally:
+            done.set()
+
+    def run(self):
+        """시나리오 1회 실행 후 동작별 결과 반환"""
+        actions = self.scenario['actions']
+        results = [None] * len(actions)
+
+        # 스레드 준비 시간을 두고 공통 기준 시각 설정
+        t0 = time.monotonic() + self.lead_time
+        t0_wall = time.time() + self.lead_time
+
+        # 동작별 완료 신호 (중단된 Thread.join은 스레드 상태를 잘못 기록할 수 있어 Event로 대기)
+        done = [threading.Event() for _ in actions]
+        for index, action in enumerate(actions):
+            threading.Thread(
+                target=self._run_action_thread,
+                args=(index, action, t0, t0_wall, results, done[index]),
+                daemon=True
+            ).start()
+
+        try:
+            for event in done:
+                event.wait()
+        except KeyboardInterrupt:
+            # 진행 중인 격리를 복구시키고 복구 명령이 끝날 때까지 대기
+            print("\n중단 요청: 진행 중인 격리를 복구하는 중...")
+            self.stop_event.set()
+            for event in done:
+                event.wait()
+            raise
+        return results
+
+def summarize_runs(scenario, runs):
+    """반복 실행 결과를 동작별로 요약"""
+    summary = []
+    for index, action in enumerate(scenario['actions']):
+        records = [run['results'][index] for run in runs]
+        item = {
+            'index': index,
+            'node': action['node'],
+            'method': action['method'],
+            'planned_start': action['at'],
+            'success_count': sum(1 for r in records if r['success']),
+            'start_offset_ms': summarize(r['start_offset_ms'] for r in records),
+            'end_offset_ms': summarize(r['end_offset_ms'] for r in records),
+        }
+        if any(r['durations'] for r in records):
+            item['phases'] = {
+                phase: summarize((r['durations'] or {}).get(phase) for r in records)
+                for phase in PHASES
+            }
+        summary.append(item)
+    return summary
+
+def format_ms(value):
+    return f"{value:+.1f}ms" if value is not None else "-"
+
+def print_summary(summary, repeat):
+    """동작별 계획 대비 실행 오차 출력"""
+    print("\n" + "="*80)
+    print(f"시나리오 요약 (반복 {repeat}회)")
+    print("="*80)
+    for item in summary:
+        start = item['start_offset_ms']
+        print(f"  [{item['index']}] t={item['planned_start']:.1f}s {item['node']} {item['method']}: "
+              f"성공 {item['success_count']}/{repeat}, "
+              f"시작 오차 p50 {format_ms(start['p50'])} / p99 {format_ms(start['p99'])} / 최대 {format_ms(start['max'])}")
+        for phase, stats in (item.get('phases') or {}).items():
+            if stats['count']:
+                print(f"      {phase}: p50 {stats['p50']:.1f}s, p90 {stats['p90']:.1f}s (n={stats['count']})")
+
+def main():
+    parser = argparse.ArgumentParser(description="카오스 시나리오 실행")
+    parser.add_argument("scenario", help="시나리오 YAML 파일")
+    parser.add_argument("--repeat", type=int, help="반복 횟수 (기본: 시나리오 파일의 repeat 또는 1)")
+    parser.add_argument("--cooldown", type=int, help="반복 사이 대기 시간(초)")
+    parser.add_argument("--timeline", action="store_true", help="동작별 장애 감지/복구 타임라인 기록")
+    parser.add_argument("--settle-timeout", type=int, default=600, help="격리 종료 후 복구 완료 대기 시간(초)")
+    parser.add_argument("--output", help="결과 JSON 파일")
+
+    args = parser.parse_args()
+
+    try:
+        scenario = load_scenario(args.scenario)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        print(f"시나리오 로드 실패: {e}")
+        sys.exit(1)
+
+    repeat = args.repeat or int(scenario.get('repeat', 1))
+    cooldown = args.cooldown if args.cooldown is not None else int(scenario.get('cooldown', 0))
+
+    print(f"시나리오: {scenario['name']} (동작 {len(scenario['actions'])}개, 반복 {repeat}회)")
+    for action in sorted(scenario['actions'], key=lambda a: a['at']):
+        print(f"  t={action['at']:>6.1f}s  {action['node']:<12} {action['method']:<8} {action['duration']}초")
+
+    scheduler = ScenarioScheduler(scenario, record_timeline=args.timeline, settle_timeout=args.settle_timeout)
+    runs = []
+    try:
+        for run_index in range(repeat):
+            if run_index and cooldown:
+                print(f"\n다음 실행까지 대기 중... ({cooldown}초)")
+                time.sleep(cooldown)
+            print(f"\n실행 {run_index + 1}/{repeat} 시작")
+            started_at = datetime.now()
+            results = scheduler.run()
+            runs.append({
+                'run': run_index + 1,
+                'started_at': started_at.isoformat(),
+                'results': results,
+            })
+            for record in results:
+                status = "성공" if record['success'] else f"실패 ({record['error']})"
+                print(f"  [{record['index']}] {record['node']} {record['method']}: "
+                      f"시작 오차 {format_ms(record['start_offset_ms'])}, "
+                      f"종료 오차 {format_ms(record['end_offset_ms'])} - {status}")
+    except KeyboardInterrupt:
+        print("\n사용자에 의해 중단됨 (진행 중이던 격리는 복구되었습니다)")
+
+    if not runs:
+        sys.exit(1)
+
+    summary = summarize_runs(scenario, runs)
+    print_summary(summary, len(runs))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'scenario': scenario,
+                'runs': runs,
+                'summary': summary,
+                'generated_at': datetime.now().isoformat()
+            }, f, indent=2, ensure_ascii=False)
+        print(f"\n결과가 저장되었습니다: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+마이그레이션 테스트 매트릭스 실행 스크립트
+격리 방법 × 노드 × 지속 시간 × 반복 조합을 서로 다른 노드에서 동시에 실행하고
+노드별 쿨다운을 지켜 다음 실험을 배치한 뒤 조합별 복구 구간을 하나의 비교표로 집계
+"""
+
+import sys
+import json
+import time
+import argparse
+import itertools
+import threading
+from pathlib import Path
+from datetime import datetime
+from collections import defaultdict
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+from tools.stats import summarize
+from tools.result_store import TestResultStore, new_test_id, timeline_metrics
+from tools.duration import parse_duration
+from scripts.stress.node_isolation import isolate_node, ISOLATION_METHODS
+from scripts.monitoring.isolation_timeline import IsolationTimeline, PHASES
+
+# 비교표에 표시할 구간
+TABLE_PHASES = ["detection", "rescheduling", "recovery", "node_recovery"]
+
+def split_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+def build_matrix(methods, nodes, durations, repetitions):
+    """실험 목록 생성 (반복 회차 순, 같은 회차 안에서는 긴 실험부터 배치)"""
+    experiments = []
+    for repetition in range(1, repetitions + 1):
+        combos = sorted(itertools.product(methods, nodes, durations), key=lambda combo: -combo[2])
+        for method, node, duration in combos:
+            experiments.append({
+                'id': len(experiments),
+                'method': method,
+                'node': node,
+                'duration': duration,
+                'repetition': repetition,
+            })
+    return experiments
+
+def next_runnable(pending, busy_nodes, node_ready_at, now):
+    """지금 시작할 수 있는 첫 실험 (노드가 비어 있고 쿨다운이 끝난 실험)"""
+    for experiment in pending:
+        node = experiment['node']
+        if node not in busy_nodes and node_ready_at.get(node, 0) <= now:
+            return experiment
+    return None
+
+def estimate_schedule(experiments, max_parallel, cooldown, overhead):
+    """실행 계획 시뮬레이션 (실험당 지속 시간 + overhead초 가정), (예상 총 소요 시간, 순차 실행 시간) 반환"""
+    pending = list(experiments)
+    running = [] # (종료 시각, 노드)
+    node_ready_at = {}
+    now = 0.0
+    makespan = 0.0
+    while pending:
+        busy = {node for _, node in running}
+        experiment = next_runnable(pending, busy, node_ready_at, now) if len(running) < max_parallel else None
+        if experiment:
+            pending.remove(experiment)
+            end = now + experiment['duration'] + overhead
+            running.append((end, experiment['node']))
+            makespan = max(makespan, end)
+            continue
+        # 다음 실험 종료 또는 쿨다운 해제 시각으로 이동
+        candidates = [end for end, _ in running] + [t for t in node_ready_at.values() if t > now]
+        now = min(candidates)
+        for end, node in [item for item in running if item[0] <= now]:
+            running.remove((end, node))
+            node_ready_at[node] = end + cooldown
+    sequential = sum(e['duration'] + overhead for e in experiments) + cooldown * max(0, len(experiments) - 1)
+    return makespan, sequential
+
+class MatrixRunner:
+    """실험 매트릭스 실행
+    - 한 노드에는 한 번에 하나의 실험만 배치하고 실험이 복구까지 끝난 뒤 cooldown초가 지나야 다음 실험 배치
+    - 동시에 격리되는 노드 수는 max_parallel로 제한 (나머지 노드가 대체 파드를 받을 수 있도록)
+    - 각 실험은 IsolationTimeline으로 장애 감지부터 대체 파드 Ready, 노드 복귀까지 기록
+    """
+
+    def __init__(self, experiments, max_parallel=1, cooldown=60, settle_timeout=600, store=None):
+        self.experiments = experiments
+        self.store = store # 실험이 끝날 때마다 결과를 기록할 TestResultStore
+        self.max_parallel = max(1, max_parallel)
+        self.cooldown = cooldown
+        self.settle_timeout = settle_timeout
+        self.results = {}
+        self.threads = []
+        self.busy_nodes = set()
+        self.node_ready_at = {}
+        self.condition = threading.Condition()
+        self.stop_event = threading.Event()
+
+    def run_experiment(self, experiment):
+        """실험 하나 실행 (격리 후 복구 완료 또는 settle_timeout까지 대기)"""
+        record = {
+            **experiment,
+            'started_at': datetime.now().isoformat(),
+            'success': False,
+            'settled': False,
+            'error': None,
+            'durations': None,
+        }
+        timeline = IsolationTimeline(experiment['node'])
+        try:
+            timeline.start()
+            isolate_node(
+                experiment['node'], experiment['method'], experiment['duration'],
+                on_event=timeline.on_fault_event, stop_event=self.stop_event
+            )
+            record['success'] = True
+            if not self.stop_event.is_set():
+                record['settled'] = timeline.wait_settled(self.settle_timeout)
+        except Exception as e:
+            record['error'] = str(e)
+        finally:
+            timeline.stop()
+            record['durations'] = timeline.durations()
+            record['timeline'] = timeline.to_dict()
+            record['finished_at'] = datetime.now().isoformat()
+
+        if self.store:
+            self.save_result(record)
+
+        with self.condition:
+            self.results[experiment['id']] = record
+            self.busy_nodes.discard(experiment['node'])
+            self.node_ready_at[experiment['node']] = time.monotonic() + self.cooldown
+            self.condition.notify_all()
+
+        status = "성공" if record['success'] else f"실패 ({record['error']})"
+        recovery = record['durations']['recovery']
+        print(f"[{len(self.results)}/{len(self.experiments)}] {experiment['method']} {experiment['node']} "
+              f"{experiment['duration']}초 #{experiment['repetition']}: {status}, "
+              f"복구 {f'{recovery:.1f}초' if recovery is not None else '-'}"
+              f"{'' if record['settled'] or not record['success'] else ' (복구 대기 시간 초과)'}")
+
+    def save_result(self, record):
+        """실험 결과를 결과 저장소에 기록 (저장 실패는 실험 진행에 영향 없음)"""
+        try:
+            self.store.save({
+                'test_id': new_test_id(f"matrix-{record['id']}"),
+                'kind': "matrix",
+                'node_name': record['node'],
+                'method': record['method'],
+                'duration': record['duration'],
+                'started_at': record['started_at'],
+                'completed_at': record['finished_at'],
+                'success': record['success'],
+                'error_message': record['error'],
+                **timeline_metrics(record['timeline']),
+                'details': {'repetition': record['repetition'], 'settled': record['settled'], 'timeline': record['timeline']},
+            })
+        except Exception as e:
+            print(f"실험 결과 저장 실패 ({record['id']}): {e}")
+
+    def run(self):
+        """모든 실험 실행 후 실험별 결과 목록 반환"""
+        pending = list(self.experiments)
+        with self.condition:
+            while pending and not self.stop_event.is_set():
+                now = time.monotonic()
+                experiment = None
+                if len(self.busy_nodes) < self.max_parallel:
+                    experiment = next_runnable(pending, self.busy_nodes, self.node_ready_at, now)
+                if experiment is None:
+                    # 실험 종료 알림 또는 가장 빠른 쿨다운 해제까지 대기
+                    waits = [t - now for t in self.node_ready_at.values() if t > now]
+                    self.condition.wait(min(waits) if waits else None)
+                    continue
+
+                pending.remove(experiment)
+                self.busy_nodes.add(experiment['node'])
+                print(f"시작: {experiment['method']} {experiment['node']} {experiment['duration']}초 "
+                      f"#{experiment['repetition']} (동시 실행 {len(self.busy_nodes)}개, 남은 실험 {len(pending)}개)")
+                thread = threading.Thread(target=self.run_experiment, args=(experiment,), daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+        return self.join()
+
+    def join(self):
+        """진행 중인 실험이 끝날 때까지 기다린 뒤 완료된 실험 결과 반환"""
+        for thread in self.threads:
+            thread.join()
+        return [self.results[e['id']] for e in self.experiments if e['id'] in self.results]
+
+    def stop(self):
+        """새 실험 배치를 중단하고 진행 중인 격리는 바로 복구 단계로 진행"""
+        self.stop_event.set()
+        with self.condition:
+            self.condition.notify_all()
+
+def summarize_matrix(results, group_keys=("method", "duration")):
+    """조합별 성공 수와 구간별 소요 시간 요약"""
+    groups = defaultdict(list)
+    for record in results:
+        groups[tuple(record[key] for key in group_keys)].append(record)
+
+    summary = []
+    for key, records in sorted(groups.items()):
+        summary.append({
+            **dict(zip(group_keys, key)),
+            'runs': len(records),
+            'success': sum(1 for r in records if r['success']),
+            'settled': sum(1 for r in records if r['settled']),
+            'phases': {
+                phase: summarize((r['durations'] or {}).get(phase) for r in records)
+                for phase in PHASES
+            },
+        })
+    return summary
+
+def print_table(summary, group_keys):
+    """조합별 비교표 출력 (구간별 p50/최대, 초)"""
+    header = "  ".join(f"{key:<10}" for key in group_keys)
+    phases = "  ".join(f"{phase:>17}" for phase in TABLE_PHASES)
+    print(f"  {header}  {'성공':>5}  {phases}")
+    for item in summary:
+        keys = "  ".join(f"{str(item[key]):<10}" for key in group_keys)
+        cells = []
+        for phase in TABLE_PHASES:
+            stats = item['phases'][phase]
+            cells.append(f"{stats['p50']:>7.1f} / {stats['max']:>7.1f}" if stats['count'] else f"{'-':>17}")
+        print(f"  {keys}  {item['success']:>2}/{item['runs']:<2}  {'  '.join(cells)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="격리 방법 × 노드 × 지속 시간 매트릭스 실험")
+    parser.add_argument("--methods", required=True, help=f"격리 방법 (쉼표 구분: {', '.join(ISOLATION_METHODS)})")
+    parser.add_argument("--nodes", required=True, help="대상 노드 (쉼표 구분)")
+    parser.add_argument("--durations", default="60s", help="격리 지속 시간 (쉼표 구분, 예: 60s,5m)")
+    parser.add_argument("--repetitions", type=int, default=1, help="조합별 반복 횟수")
+    parser.add_argument("--max-parallel", type=int, help="동시에 격리할 최대 노드 수 (기본: 노드 수 - 1)")
+    parser.add_argument("--cooldown", type=int, default=60, help="같은 노드에서 다음 실험까지 대기 시간(초)")
+    parser.add_argument("--settle-timeout", type=int, default=600, help="격리 종료 후 복구 완료 대기 시간(초)")
+    parser.add_argument("--dry-run", action="store_true", help="실행 계획과 예상 소요 시간만 출력")
+    parser.add_argument("--output", help="결과 JSON 파일")
+    parser.add_argument("--result-db", help="테스트 결과 저장소 파일 (기본: results/test_results.db)")
+    parser.add_argument("--no-save", action="store_true", help="실험 결과를 결과 저장소에 기록하지 않음")
+
+    args = parser.parse_args()
+
+    methods = split_list(args.methods)
+    unknown = [method for method in methods if method not in ISOLATION_METHODS]
+    if unknown:
+        print(f"지원하지 않는 격리 방법: {', '.join(unknown)}")
+        sys.exit(1)
+    nodes = split_list(args.nodes)
+    durations = [parse_duration(value) for value in split_list(args.durations)]
+    max_parallel = args.max_parallel or max(1, len(nodes) - 1)
+
+    experiments = build_matrix(methods, nodes, durations, args.repetitions)
+    makespan, sequential = estimate_schedule(experiments, max_parallel, args.cooldown, overhead=60)
+    print(f"실험 {len(experiments)}개: 방법 {len(methods)} × 노드 {len(nodes)} × 지속 시간 {len(durations)} × 반복 {args.repetitions}")
+    print(f"동시 실행 최대 {max_parallel}개, 노드별 쿨다운 {args.cooldown}초")
+    print(f"예상 소요 시간 (실험당 복구 60초 가정): {makespan / 3600:.1f}시간 (순차 실행 시 {sequential / 3600:.1f}시간)")
+    if args.dry_run:
+        for experiment in experiments:
+            print(f"  #{experiment['repetition']} {experiment['method']:<8} {experiment['node']:<12} {experiment['duration']}초")
+        return
+
+    store = None if args.no_save else TestResultStore(args.result_db)
+    runner = MatrixRunner(experiments, max_parallel, args.cooldown, args.settle_timeout, store)
+    started_at = datetime.now()
+    try:
+        results = runner.run()
+    except KeyboardInterrupt:
+        print("\n사용자에 의해 중단됨. 진행 중인 실험을 복구합니다...")
+        runner.stop()
+        results = runner.join()
+
+    if not results:
+        sys.exit(1)
+
+    summary = summarize_matrix(results)
+    by_node = summarize_matrix(results, ("method", "node"))
+    print("\n" + "="*80)
+    print(f"매트릭스 결과 ({len(results)}/{len(experiments)}개 실험, "
+          f"{(datetime.now() - started_at).total_seconds() / 60:.1f}분, 구간별 p50 / 최대 초)")
+    print("="*80)
+    print_table(summary, ("method", "duration"))
+    print("\n노드별:")
+    print_table(by_node, ("method", "node"))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'matrix': {
+                    'methods': methods,
+                    'nodes': nodes,
+                    'durations': durations,
+                    'repetitions': args.repetitions,
+                    'max_parallel': max_parallel,
+                    'cooldown': args.cooldown,
+                },
+                'results': results,
+                'summary': summary,
+                'by_node': by_node,
+                'started_at': started_at.isoformat(),
+                'generated_at': datetime.now().isoformat()
+            }, f, indent=2, ensure_ascii=False, default=str)
+        print(f"\n결과가 저장되었습니다: {args.output}")
+
+if __name__ == "__main__":
+    main()
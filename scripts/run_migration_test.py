@@ -5,6 +5,7 @@
 """
 
 import subprocess
+import json
 import time
 import sys
 import argparse
@@ -16,18 +17,30 @@ from datetime import datetime
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 sys.path.append(str(Path(__file__).parent.parent))
 from tools.env_loader import EnvLoader
+from tools.result_store import TestResultStore, new_test_id
+from tools.stream_log import StreamRecorder, read_meta
+from tools.duration import parse_duration
 from scripts.stress.node_stress_test import NodeStressTest
 from scripts.monitoring.pod_migration_monitor import PodMigrationMonitor
-from scripts.stress.node_isolation import NodeIsolation
+from scripts.monitoring.pod_scope import PodScope
+from scripts.monitoring.migration_report import print_report
+from scripts.monitoring.readiness_wait import ReadinessWait
+from scripts.monitoring.convergence import ConvergenceDetector
+from scripts.stress.node_isolation import isolate_node
 
 class MigrationTestOrchestrator:
     def __init__(self):
         self.env_loader = EnvLoader()
         self.stress_test = NodeStressTest()
         self.migration_monitor = PodMigrationMonitor()
-        self.node_isolation = NodeIsolation()
+        self.isolation_stop = threading.Event() # 설정되면 진행 중인 격리를 바로 복구
         self.test_active = False
         self.threads = []
+        self.readiness = None # 테스트 애플리케이션 파드별 기동 시각 요약
+        self.convergence = None # 장애 종료 후 수렴 감지 결과
+        self.fault_injected_at = None
+        self.fault_removed_at = None
+        self.started_at = None
     
     def setup_signal_handlers(self):
         """시그널 핸들러 설정"""
@@ -54,56 +67,71 @@ class MigrationTestOrchestrator:
             print(f"kubectl 명령 실행 오류: {e}")
             return None
     
-    def deploy_test_application(self):
-        """테스트 애플리케이션 배포"""
+    def expected_replicas(self, label_selector="app=nginx-test", namespace="default"):
+        """레이블에 해당하는 Deployment의 목표 레플리카 수 합계 (조회 실패 시 None)"""
+        result = self.run_kubectl_command(f"get deployments -n {namespace} -l {label_selector} -o json")
+        if not result or result.returncode != 0:
+            return None
+        try:
+            items = json.loads(result.stdout).get('items', [])
+        except json.JSONDecodeError:
+            return None
+        if not items:
+            return None
+        return sum(item.get('spec', {}).get('replicas', 1) for item in items)
+    
+    def deploy_test_application(self, timeout=300):
+        """테스트 애플리케이션 배포
+        - 배포 전에 파드 watch를 시작하여 모든 레플리카가 Ready가 되는 즉시 반환
+        - 파드별 생성/스케줄/Ready 시각과 기동 소요 시간을 self.readiness에 기록
+        """
         print("테스트 애플리케이션 배포 중...")
         
         # 기존 파드가 있는지 확인
         existing_result = self.run_kubectl_command("get pods -l app=nginx-test --no-headers")
-        if existing_result and existing_result.returncode == 0 and existing_result.stdout.strip():
-            print("테스트 애플리케이션이 이미 배포되어 있습니다")
-            return True
-        
-        manifest_path = "manifests/test-apps/nginx-deployment.yaml"
-        result = self.run_kubectl_command(f"apply -f {manifest_path}")
+        already_deployed = existing_result and existing_result.returncode == 0 and existing_result.stdout.strip()
         
-        if not result or result.returncode != 0:
-            print(f"애플리케이션 배포 실패: {result.stderr if result else 'Unknown error'}")
-            return False
-        
-        print("애플리케이션 배포 완료")
-        
-        # 파드가 Ready 상태가 될 때까지 대기 (개선된 로직)
-        print("파드가 Ready 상태가 될 때까지 대기 중...")
-        for i in range(60):  # 최대 5분 대기
-            result = self.run_kubectl_command("get pods -l app=nginx-test --no-headers")
-            if result and result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                if lines and lines[0]:  # 파드가 존재하는 경우
-                    ready_count = 0
-                    total_count = len(lines)
-                    
-                    for line in lines:
-                        if line.strip():
-                            parts = line.split()
-                            if len(parts) >= 2:
-                                ready_status = parts[1]  # READY 컬럼
-                                if '/' in ready_status:
-                                    ready, total = ready_status.split('/')
-                                    if ready == total and ready != '0':
-                                        ready_count += 1
-                    
-                    print(f"Ready 파드: {ready_count}/{total_count}")
-                    
-                    if ready_count == total_count:
-                        print("모든 파드가 Ready 상태입니다")
-                        break
-            time.sleep(5)
-        else:
-            print("일부 파드가 아직 Ready 상태가 아닙니다")
+        waiter = ReadinessWait("app=nginx-test").start()
+        try:
+            if already_deployed:
+                print("테스트 애플리케이션이 이미 배포되어 있습니다")
+            else:
+                manifest_path = "manifests/test-apps/nginx-deployment.yaml"
+                result = self.run_kubectl_command(f"apply -f {manifest_path}")
+                
+                if not result or result.returncode != 0:
+                    print(f"애플리케이션 배포 실패: {result.stderr if result else 'Unknown error'}")
+                    return False
+                
+                print("애플리케이션 배포 완료")
+            
+            expected = self.expected_replicas()
+            if expected is None:
+                print("Deployment 레플리카 수를 확인할 수 없습니다")
+                return True
+            
+            print(f"파드 {expected}개가 Ready 상태가 될 때까지 대기 중... (최대 {timeout}초)")
+            waiter.set_expected(expected)
+            if waiter.wait(timeout):
+                print(f"모든 파드가 Ready 상태입니다 ({waiter.summary()['wait_seconds']:.1f}초)")
+            else:
+                print(f"일부 파드가 아직 Ready 상태가 아닙니다 (Ready 파드: {waiter.ready_count()}/{expected})")
+        finally:
+            waiter.stop()
         
+        self.readiness = waiter.summary()
+        self.print_readiness(self.readiness)
         return True
     
+    def print_readiness(self, readiness):
+        """파드별 기동 소요 시간 출력"""
+        for timing in readiness['pods']:
+            latency = f"{timing['startup_latency']:.1f}초" if timing['startup_latency'] is not None else "Ready 아님"
+            print(f"  {timing['pod']} ({timing['node'] or 'Unscheduled'}): {latency}")
+        stats = readiness['startup_latency']
+        if stats['count']:
+            print(f"  기동 소요 시간: p50 {stats['p50']:.1f}초, 최대 {stats['max']:.1f}초 (n={stats['count']})")
+    
     def check_pod_distribution(self):
         """파드 분포 확인"""
         print("\n현재 파드 분포:")
@@ -152,11 +180,8 @@ class MigrationTestOrchestrator:
                 # 부하 테스트 완료까지 대기
                 while self.stress_test.stress_processes and self.test_active:
                     time.sleep(5)
-                    # 완료된 프로세스 제거
-                    self.stress_test.stress_processes = [
-                        (t, ip, p) for t, ip, p in self.stress_test.stress_processes 
-                        if p.poll() is None
-                    ]
+                    # 완료된 프로세스 제거 및 결과 기록
+                    self.stress_test.reap_finished_stress()
                 
                 print(f"부하 테스트 완료: {target_node}")
             else:
@@ -170,23 +195,16 @@ class MigrationTestOrchestrator:
         try:
             print(f"노드 격리 테스트 시작: {target_node} (방법: {method})")
             
-            # duration이 문자열인 경우 숫자로 변환
-            if isinstance(duration, str):
-                duration_seconds = int(duration.replace('s', ''))
-            else:
-                duration_seconds = duration
-            
-            success = self.node_isolation.isolate_node(target_node, method, duration_seconds)
+            def on_event(name, ts):
+                if name == "fault_injected":
+                    self.fault_injected_at = ts
+                elif name == "fault_removed":
+                    self.fault_removed_at = ts
             
-            if success:
-                print(f"노드 격리 시작됨: {target_node}")
-                
-                # 격리 시간 동안 대기
-                time.sleep(duration_seconds)
-                
-                print(f"노드 격리 완료: {target_node}")
-            else:
-                print(f"노드 격리 시작 실패: {target_node}")
+            # 지속 시간 동안 격리를 유지한 뒤 복구 (중단 시 바로 복구)
+            isolate_node(target_node, method, parse_duration(duration),
+                         on_event=on_event, stop_event=self.isolation_stop)
+            print(f"노드 격리 완료: {target_node}")
                 
         except Exception as e:
             print(f"노드 격리 스레드 오류: {e}")
@@ -201,12 +219,18 @@ class MigrationTestOrchestrator:
             print(f"모니터링 스레드 오류: {e}")
         finally:
             if output_file:
-                self.migration_monitor.export_migration_report(output_file)
+                extra = {'readiness': self.readiness, 'convergence': self.convergence}
+                self.migration_monitor.export_migration_report(
+                    output_file, {key: value for key, value in extra.items() if value}
+                )
     
     def run_integrated_test(self, target_node, duration="300s", cpu_percent=80, 
                           memory_percent=70, namespace="default", monitor_interval=10,
-                          output_file=None, cleanup=True, isolation_method="stress"):
-        """통합 테스트 실행"""
+                          output_file=None, cleanup=True, isolation_method="stress",
+                          quiet_period=30, max_recovery_wait=600):
+        """통합 테스트 실행
+        - 장애 종료 후 파드 분포와 Ready 상태가 quiet_period초 동안 안정되면 관찰 종료 (최대 max_recovery_wait초)
+        """
         print("="*80)
         print("쿠버네티스 파드 마이그레이션 테스트 시작")
         print("="*80)
@@ -220,6 +244,7 @@ class MigrationTestOrchestrator:
         print("="*80)
         
         self.test_active = True
+        self.started_at = datetime.now()
         
         try:
             # 1. 테스트 애플리케이션 배포
@@ -229,6 +254,9 @@ class MigrationTestOrchestrator:
             # 2. 초기 파드 분포 확인
             self.check_pod_distribution()
             
+            # 장애 전 기준 상태를 잡기 위해 수렴 감지를 먼저 시작
+            detector = ConvergenceDetector(namespace, quiet_period, max_recovery_wait, target_node=target_node).start()
+            
             # 3. 모니터링 시작
             monitor_thread = threading.Thread(
                 target=self.run_monitoring_thread,
@@ -267,9 +295,18 @@ class MigrationTestOrchestrator:
             # 5. 테스트 완료까지 대기
             test_thread.join()
             
-            # 6. 추가 모니터링 시간 (복구 과정 관찰)
-            print("\n복구 과정 모니터링 중... (60초)")
-            time.sleep(60)
+            # 6. 복구 과정 관찰 (클러스터가 안정될 때까지)
+            print(f"\n복구 과정 모니터링 중... ({quiet_period}초 동안 변화가 없으면 종료, 최대 {max_recovery_wait}초)")
+            try:
+                self.convergence = detector.wait(since=self.fault_removed_at or time.time())
+            finally:
+                detector.stop()
+            if self.convergence['converged']:
+                print(f"클러스터 수렴: 장애 종료 후 {self.convergence['time_to_convergence']:.1f}초 "
+                      f"(변화 {self.convergence['changes']}건)")
+            else:
+                print(f"{max_recovery_wait}초 안에 수렴하지 않았습니다 "
+                      f"(Ready 파드 {self.convergence['ready_pods']}/{self.convergence['pods']})")
             
             print("\n테스트 완료")
             
@@ -300,7 +337,7 @@ class MigrationTestOrchestrator:
         self.stress_test.stop_all_stress_tests()
         
         # 노드 격리 중지
-        self.node_isolation.stop_isolation()
+        self.isolation_stop.set()
         
         # 모니터링 중지
         self.migration_monitor.stop_monitoring()
@@ -310,12 +347,67 @@ class MigrationTestOrchestrator:
             if thread.is_alive():
                 thread.join(timeout=5)
         
+        # 스트림 기록 종료 (모니터링 스레드가 끝난 뒤)
+        recorder = self.migration_monitor.recorder
+        if recorder:
+            self.migration_monitor.recorder = None
+            recorder.close()
+            print(f"스트림 기록 완료: {recorder.path} ({recorder.count}개 레코드)")
+        
         print("리소스 정리 완료")
+    
+    def save_result(self, store, target_node, method, duration, success):
+        """통합 테스트 결과를 결과 저장소에 기록 (마이그레이션 수, 재스케줄 지연, 수렴 시간)"""
+        if self.started_at is None:
+            return None
+        analysis = self.migration_monitor.report.summary()
+        reschedule_time = analysis['reschedule_time']['mean']
+        convergence = self.convergence or {}
+        recovery_time = None
+        if self.fault_injected_at and convergence.get('converged') and self.fault_removed_at:
+            # 장애 주입부터 수렴 직전 마지막 변화까지
+            recovery_time = round(self.fault_removed_at + convergence['time_to_convergence'] - self.fault_injected_at, 3)
+        result = {
+            'test_id': new_test_id("integrated"),
+            'kind': "integrated",
+            'node_name': target_node,
+            'method': method,
+            'duration': parse_duration(duration),
+            'started_at': self.started_at,
+            'completed_at': datetime.now(),
+            'success': success,
+            'migration_count': analysis['migrations'],
+            'migration_time': round(reschedule_time, 3) if reschedule_time is not None else None,
+            'recovery_time': recovery_time,
+            'convergence_time': convergence.get('time_to_convergence'),
+            'details': {
+                'scope': self.migration_monitor.scope.to_dict(),
+                'readiness': self.readiness,
+                'convergence': self.convergence,
+                'analysis': analysis,
+            },
+        }
+        store.save(result)
+        print(f"테스트 결과가 저장되었습니다: {result['test_id']} ({store.path})")
+        return result['test_id']
+
+def replay_recorded_test(path, output_file=None):
+    """--record로 기록한 통합 테스트의 모니터링 스트림을 다시 분석 (클러스터/부하/격리 없이 리포트만 계산)"""
+    meta = read_meta(path)
+    monitor = PodMigrationMonitor()
+    monitor.scope = PodScope.from_dict(meta.get('scope'))
+    monitor.monitoring_active = True
+    monitor.replay(path, interval=meta.get('interval', 10))
+    if output_file:
+        monitor.export_migration_report(output_file, {'recorded': meta})
+    summary = monitor.report.summary()
+    print("\n마이그레이션 분석:")
+    print_report(summary)
 
 def main():
     parser = argparse.ArgumentParser(description="쿠버네티스 파드 마이그레이션 통합 테스트")
-    parser.add_argument("--target-node", required=True, 
-                       help="부하를 줄 대상 노드명 (예: worker1)")
+    parser.add_argument("--target-node", 
+                       help="부하를 줄 대상 노드명 (예: worker1, --replay에서는 생략)")
     parser.add_argument("--duration", default="300s", 
                        help="부하 테스트 지속 시간 (기본: 300s)")
     parser.add_argument("--cpu-percent", type=int, default=80, 
@@ -330,15 +422,44 @@ def main():
                        help="마이그레이션 리포트 출력 파일")
     parser.add_argument("--no-cleanup", action="store_true", 
                        help="테스트 후 애플리케이션을 정리하지 않음")
+    parser.add_argument("--quiet-period", type=int, default=30,
+                       help="복구 완료로 판단할 무변화 시간 초 (기본: 30)")
+    parser.add_argument("--max-recovery-wait", type=int, default=600,
+                       help="장애 종료 후 최대 관찰 시간 초 (기본: 600)")
     parser.add_argument("--isolation-method", 
                        choices=["stress", "network", "kubelet", "runtime", "drain", "extreme"],
                        default="stress",
                        help="노드 격리 방법 (기본: stress)")
+    parser.add_argument("--result-db",
+                       help="테스트 결과 저장소 파일 (기본: results/test_results.db)")
+    parser.add_argument("--no-save", action="store_true",
+                       help="테스트 결과를 결과 저장소에 기록하지 않음")
+    parser.add_argument("--record",
+                       help="모니터링이 조회한 원본 노드/파드 목록을 기록할 파일 (gzip JSON Lines, 예: results/run.ndjson.gz)")
+    parser.add_argument("--replay",
+                       help="클러스터 대신 --record로 기록한 파일을 재생하여 마이그레이션 리포트만 계산")
     
     args = parser.parse_args()
+    if args.replay:
+        replay_recorded_test(args.replay, args.output)
+        sys.exit(0)
+    if not args.target_node:
+        parser.error("--target-node가 필요합니다 (--replay 제외)")
+    if args.record and Path(args.record).exists():
+        parser.error(f"기록 파일이 이미 있습니다: {args.record} (다른 경로를 지정하세요)")
     
     orchestrator = MigrationTestOrchestrator()
     orchestrator.setup_signal_handlers()
+    if args.record:
+        orchestrator.migration_monitor.recorder = StreamRecorder(args.record, meta={
+            'scope': PodScope.parse(args.namespace).to_dict(),
+            'mode': 'poll',
+            'interval': args.monitor_interval,
+            'target_node': args.target_node,
+            'isolation_method': args.isolation_method,
+            'duration': args.duration,
+        })
+        print(f"스트림 기록: {args.record}")
     
     # 환경변수 파일 생성
     print("환경변수 파일 생성 중...")
@@ -353,9 +474,18 @@ def main():
         monitor_interval=args.monitor_interval,
         output_file=args.output,
         cleanup=not args.no_cleanup,
-        isolation_method=args.isolation_method
+        isolation_method=args.isolation_method,
+        quiet_period=args.quiet_period,
+        max_recovery_wait=args.max_recovery_wait
     )
     
+    if not args.no_save:
+        try:
+            orchestrator.save_result(TestResultStore(args.result_db), args.target_node,
+                                     args.isolation_method, args.duration, success)
+        except Exception as e:
+            print(f"테스트 결과 저장 실패: {e}")
+    
     if success:
         print("\n 테스트가 성공적으로 완료되었습니다!")
         sys.exit(0)
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+격리 실행 백엔드
+실제 노드에 SSH/kubectl로 장애를 주입하는 백엔드와,
+가상 클러스터 상태 위에서 방법별 지연/실패율을 모사하는 시뮬레이션 백엔드
+"""
+
+import sys
+import time
+import uuid
+import random
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from scripts.stress.node_isolation import isolate_node, notify, wait_duration, ISOLATION_METHODS
+
+# 방법별 명령 지연(초, 평균/표준편차)과 실패 확률
+METHOD_PROFILES = {
+    "network": {"inject": (0.15, 0.05), "recover": (0.15, 0.05), "failure_rate": 0.01},
+    "kubelet": {"inject": (0.8, 0.2), "recover": (1.5, 0.4), "failure_rate": 0.02},
+    "runtime": {"inject": (1.0, 0.3), "recover": (2.0, 0.5), "failure_rate": 0.02},
+    "drain": {"inject": (8.0, 3.0), "recover": (0.5, 0.1), "failure_rate": 0.05},
+    "extreme": {"inject": (10.0, 0.5), "recover": (0.0, 0.0), "failure_rate": 0.03},
+}
+
+# 가상 클러스터 반응 시간(초)
+CLUSTER_TIMINGS = {
+    "not_ready_delay": 40, # node-monitor-grace-period
+    "eviction_delay": 300, # NoExecute 기본 toleration
+    "startup_delay": 5, # 대체 파드 Ready까지
+}
+
+# NotReady를 유발하는 방법
+NODE_FAILURE_METHODS = {"network", "kubelet", "runtime"}
+
+class IsolationBackend:
+    """격리 백엔드 인터페이스"""
+    name = "base"
+
+    def isolate(self, node, method, duration, on_event=None, stop_event=None):
+        """격리 실행 (복구까지 블로킹)"""
+        raise NotImplementedError
+
+    def watch_source(self):
+        """타임라인이 구독할 이벤트 소스 (None이면 kubectl watch 사용)"""
+        return None
+
+class SSHIsolationBackend(IsolationBackend):
+    """실제 노드에 장애를 주입하는 백엔드"""
+    name = "ssh"
+
+    def isolate(self, node, method, duration, on_event=None, stop_event=None):
+        isolate_node(node, method, duration, on_event=on_event, stop_event=stop_event)
+
+class FakeClusterState:
+    """가상 클러스터 상태
+    - 노드 장애 시 NotReady 전환, 파드 축출, 다른 노드에 대체 파드 생성을 시간 지연과 함께 모사
+    - 변경 사항은 KubeWatch 콜백과 같은 형식(event_type, obj, received_at)으로 구독자에게 전달
+    - 장애마다 토큰을 발급하여 겹치는 장애 중 하나를 해제해도 나머지 장애의 NotReady/축출 예약은 유지
+    """
+
+    def __init__(self, nodes=("worker1", "worker2", "worker3"), pods_per_node=10,
+                 time_scale=1.0, timings=None):
+        self.time_scale = time_scale
+        self.timings = {**CLUSTER_TIMINGS, **(timings or {})}
+        self.lock = threading.RLock()
+        self.nodes = {
+            name: {"ready": True, "unschedulable": False, "faults": {}} # faults: 토큰 -> 방법
+            for name in nodes
+        }
+        self.pods = {} # uid -> 파드 레코드
+        self.pending = [] # 스케줄할 노드가 없어 대기 중인 파드 uid
+        self.owner = {"kind": "ReplicaSet", "name": "sim-app-6d4b75cb6d", "uid": str(uuid.uuid4()), "controller": True}
+        self._subscribers = {"nodes": [], "pods": []}
+
+        for name in nodes:
+            for _ in range(pods_per_node):
+                self._create_pod(name, ready=True, emit=False)
+
+    # --- 구독 ---
+
+    def subscribe(self, kind, callback):
+        with self.lock:
+            self._subscribers[kind].append(callback)
+
+    def unsubscribe(self, kind, callback):
+        with self.lock:
+            if callback in self._subscribers[kind]:
+                self._subscribers[kind].remove(callback)
+
+    def _emit(self, kind, event_type, obj):
+        received_at = time.time()
+        for callback in list(self._subscribers[kind]):
+            try:
+                callback(event_type, obj, received_at)
+            except Exception as e:
+                print(f"시뮬레이션 이벤트 처리 오류: {e}")
+
+    # --- 쿠버네티스 형식 객체 ---
+
+    def _node_object(self, name):
+        node = self.nodes[name]
+        return {
+            "metadata": {"name": name},
+            "spec": {"unschedulable": node["unschedulable"]},
+            "status": {"conditions": [
+                {"type": "Ready", "status": "True" if node["ready"] else "Unknown"}
+            ]},
+        }
+
+    def _pod_object(self, pod):
+        metadata = {
+            "name": pod["name"],
+            "namespace": "default",
+            "uid": pod["uid"],
+            "creationTimestamp": pod["created"],
+            "ownerReferences": [self.owner],
+        }
+        if pod["deleting"]:
+            metadata["deletionTimestamp"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return {
+            "metadata": metadata,
+            "spec": {"nodeName": pod["node"]},
+            "status": {
+                "phase": "Running" if pod["node"] else "Pending",
+                "conditions": [{"type": "Ready", "status": "True" if pod["ready"] else "False"}],
+            },
+        }
+
+    # --- 상태 변경 ---
+
+    def _after(self, delay, func, *args):
+        """배율이 적용된 지연 후 실행"""
+        timer = threading.Timer(delay * self.time_scale, func, args)
+        timer.daemon = True
+        timer.start()
+
+    def _schedulable_node(self):
+        """파드가 가장 적은 스케줄 가능 노드"""
+        candidates = [
+            name for name, node in self.nodes.items()
+            if node["ready"] and not node["unschedulable"]
+        ]
+        if not candidates:
+            return None
+        counts = {name: 0 for name in candidates}
+        for pod in self.pods.values():
+            if pod["node"] in counts:
+                counts[pod["node"]] += 1
+        return min(candidates, key=counts.get)
+
+    def _create_pod(self, node, ready=False, emit=True):
+        uid = str(uuid.uuid4())
+        pod = {
+            "uid": uid,
+            "name": f"{self.owner['name']}-{uid[:5]}",
+            "node": node,
+            "ready": ready,
+            "deleting": False,
+            "created": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+        self.pods[uid] = pod
+        if node is None:
+            self.pending.append(uid)
+        if emit:
+            self._emit("pods", "ADDED", self._pod_object(pod))
+            if node is not None:
+                self._after(self.timings["startup_delay"], self._set_pod_ready, uid)
+        return pod
+
+    def _set_pod_ready(self, uid):
+        with self.lock:
+            pod = self.pods.get(uid)
+            if not pod or pod["ready"] or pod["node"] is None:
+                return
+            pod["ready"] = True
+            self._emit("pods", "MODIFIED", self._pod_object(pod))
+
+    def _set_node_ready(self, name, ready, token=None):
+        with self.lock:
+            node = self.nodes[name]
+            if token is not None and token not in node["faults"]:
+                return # 이미 해제된 장애
+            if node["ready"] == ready:
+                return
+            node["ready"] = ready
+            self._emit("nodes", "MODIFIED", self._node_object(name))
+            if ready:
+                self._schedule_pending()
+
+    def _evict_node(self, name, token=None):
+        """노드의 파드를 축출하고 다른 노드에 대체 파드 생성"""
+        with self.lock:
+            if token is not None and token not in self.nodes[name]["faults"]:
+                return
+            for pod in [p for p in self.pods.values() if p["node"] == name]:
+                pod["deleting"] = True
+                self._emit("pods", "MODIFIED", self._pod_object(pod))
+                del self.pods[pod["uid"]]
+                self._emit("pods", "DELETED", self._pod_object(pod))
+                self._create_pod(self._schedulable_node())
+
+    def _schedule_pending(self):
+        pending, self.pending = self.pending, []
+        for uid in pending:
+            pod = self.pods.get(uid)
+            target = self._schedulable_node()
+            if not pod:
+                continue
+            if target is None:
+                self.pending.append(uid)
+                continue
+            pod["node"] = target
+            self._emit("pods", "MODIFIED", self._pod_object(pod))
+            self._after(self.timings["startup_delay"], self._set_pod_ready, uid)
+
+    def apply_fault(self, name, method):
+        """장애 주입 (해제할 때 넘길 토큰 반환)"""
+        with self.lock:
+            node = self.nodes[name]
+            token = str(uuid.uuid4())
+            node["faults"][token] = method
+            if method in NODE_FAILURE_METHODS:
+                self._after(self.timings["not_ready_delay"], self._set_node_ready, name, False, token)
+                self._after(
+                    self.timings["not_ready_delay"] + self.timings["eviction_delay"],
+                    self._evict_node, name, token
+                )
+            elif method == "drain":
+                node["unschedulable"] = True
+                self._emit("nodes", "MODIFIED", self._node_object(name))
+                self._evict_node(name)
+            return token
+
+    def clear_fault(self, name, token):
+        """장애 해제 (해당 장애의 대기 중인 NotReady/축출만 취소, 남은 장애가 없을 때만 Ready 복귀)"""
+        with self.lock:
+            node = self.nodes[name]
+            method = node["faults"].pop(token, None)
+            if method is None:
+                return
+            if method == "drain" and "drain" not in node["faults"].values():
+                node["unschedulable"] = False
+                self._emit("nodes", "MODIFIED", self._node_object(name))
+            if not node["faults"]:
+                self._set_node_ready(name, True)
+            self._schedule_pending()
+
+    def snapshot(self):
+        """현재 상태 요약"""
+        with self.lock:
+            counts = {name: {"total": 0, "ready": 0} for name in self.nodes}
+            for pod in self.pods.values():
+                if pod["node"] in counts:
+                    counts[pod["node"]]["total"] += 1
+                    counts[pod["node"]]["ready"] += int(pod["ready"])
+            return {
+                "nodes": [
+                    {
+                        "name": name,
+                        "ready": node["ready"],
+                        "unschedulable": node["unschedulable"],
+                        "faults": sorted(node["faults"].values()),
+                        "pod_count": counts[name]["total"],
+                        "ready_count": counts[name]["ready"],
+                    }
+                    for name, node in self.nodes.items()
+                ],
+                "total_pods": len(self.pods),
+                "pending_pods": len(self.pending),
+            }
+
+class SimulatedIsolationBackend(IsolationBackend):
+    """가상 클러스터에 장애를 모사하는 백엔드
+    - 방법별 명령 지연과 실패 확률을 METHOD_PROFILES로 모사
+    - 모든 시간(명령 지연, 격리 지속 시간, 클러스터 반응)에 time_scale 배율 적용
+    """
+    name = "simulated"
+
+    def __init__(self, cluster=None, profiles=None, time_scale=1.0, seed=None):
+        self.time_scale = time_scale
+        self.cluster = cluster or FakeClusterState(time_scale=time_scale)
+        self.profiles = {**METHOD_PROFILES, **(profiles or {})}
+        self.random = random.Random(seed)
+
+    def _latency(self, spec):
+        mean, stddev = spec
+        return max(0.0, self.random.gauss(mean, stddev)) * self.time_scale
+
+    def isolate(self, node, method, duration, on_event=None, stop_event=None):
+        method = getattr(method, "value", method)
+        if node not in self.cluster.nodes:
+            raise ValueError(f"노드를 찾을 수 없습니다: {node}")
+        if method not in ISOLATION_METHODS:
+            raise ValueError(f"지원하지 않는 격리 방법: {method}")
+        profile = self.profiles[method]
+
+        injected_at = time.time()
+        time.sleep(self._latency(profile["inject"]))
+        if self.random.random() < profile["failure_rate"]:
+            raise Exception(f"{method} 격리 실패: 시뮬레이션된 오류")
+        token = self.cluster.apply_fault(node, method)
+        notify(on_event, "fault_injected", injected_at)
+
+        if method != "extreme": # extreme은 부하 명령이 끝나면 바로 종료
+            wait_duration(duration * self.time_scale, stop_event)
+
+        removed_at = time.time()
+        time.sleep(self._latency(profile["recover"]))
+        notify(on_event, "fault_removed", removed_at)
+        self.cluster.clear_fault(node, token)
+
+    def watch_source(self):
+        return self.cluster
+
+def get_backend(name="ssh", **options):
+    """이름으로 백엔드 생성"""
+    if name == "ssh":
+        return SSHIsolationBackend()
+    if name == "simulated":
+        return SimulatedIsolationBackend(**options)
+    raise ValueError(f"지원하지 않는 격리 백엔드: {name}")
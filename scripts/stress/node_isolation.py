@@ -15,30 +15,53 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.append(str(project_root))
 
 from tools.env_loader import EnvLoader
+from tools.ssh_pool import ssh_pool
+from scripts.monitoring.isolation_timeline import IsolationTimeline, MILESTONES
+
+# 지원하는 격리 방법
+ISOLATION_METHODS = ["network", "kubelet", "runtime", "drain", "extreme"]
 
 def run_command(cmd, node):
-    """원격 노드에서 명령어 실행"""
+    """원격 노드에서 명령어 실행 (노드별 SSH 세션 재사용)"""
     env = EnvLoader(str(project_root / "config" / "env.yaml"))
     node_info = env.get_node_by_name(node)
     
     if not node_info:
         raise ValueError(f"노드를 찾을 수 없습니다: {node}")
     
-    ssh_cmd = [
-        "sshpass",
-        "-p", env.config['ssh']['password'],
-        "ssh",
-        "-o", "StrictHostKeyChecking=no",
-        "-p", str(env.config['ssh']['port']),
-        f"{env.config['ssh']['user']}@{node_info['private_ip']}",
-        cmd
-    ]
-    
-    print(f"실행: {' '.join(ssh_cmd)}")
-    return subprocess.run(ssh_cmd, capture_output=True, text=True)
+    ssh = env.config['ssh']
+    print(f"실행 ({node}): {cmd}")
+    return ssh_pool.run(
+        node_info['private_ip'],
+        cmd,
+        user=ssh['user'],
+        port=ssh['port'],
+        password=ssh.get('password')
+    )
+
+def notify(on_event, name, ts):
+    """격리 단계 콜백 호출"""
+    if on_event:
+        on_event(name, ts)
 
-def isolate_node(node, method, duration):
-    """노드 격리 실행"""
+def wait_duration(duration, stop_event=None, deadline=None):
+    """격리 유지 (stop_event가 설정되면 즉시 복구 단계로 진행)
+    - deadline(time.monotonic 기준)이 있으면 duration 대신 그 시각까지 대기하여
+      장애 주입 명령 지연만큼 복구 시각이 밀리지 않도록 함
+    """
+    if deadline is not None:
+        duration = max(0.0, deadline - time.monotonic())
+    if stop_event is None:
+        time.sleep(duration)
+    else:
+        stop_event.wait(duration)
+
+def isolate_node(node, method, duration, on_event=None, stop_event=None, deadline=None):
+    """노드 격리 실행
+    - on_event(name, ts): 장애 주입/해제 명령을 실행한 시각을 "fault_injected"/"fault_removed"로 전달
+    - stop_event: 설정되면 지속 시간을 채우지 않고 바로 복구
+    - deadline: 복구를 시작할 절대 시각 (time.monotonic 기준, 없으면 주입 완료 후 duration초)
+    """
     print(f"{node}번째 노드 격리 시작..")
     print(f"격리 방법: {method}")
     print(f"지속 시간: {duration}초")
@@ -47,58 +70,74 @@ def isolate_node(node, method, duration):
         if method == "network":
             # iptables로 API 서버 통신 차단
             cmd = "iptables -A OUTPUT -p tcp --dport 6443 -j DROP && echo '네트워크 격리 완료'"
+            injected_at = time.time()
             result = run_command(cmd, node)
             if result.returncode != 0:
                 raise Exception(f"네트워크 격리 실패: {result.stderr}")
+            notify(on_event, "fault_injected", injected_at)
             
             # 지정된 시간 후 복구
-            time.sleep(duration)
+            wait_duration(duration, stop_event, deadline)
             cmd = "iptables -D OUTPUT -p tcp --dport 6443 -j DROP && echo '네트워크 복구 완료'"
+            removed_at = time.time()
             result = run_command(cmd, node)
             if result.returncode != 0:
                 raise Exception(f"네트워크 복구 실패: {result.stderr}")
+            notify(on_event, "fault_removed", removed_at)
             
         elif method == "kubelet":
             # kubelet 서비스 중지
             cmd = "systemctl stop kubelet && echo 'kubelet 중지 완료'"
+            injected_at = time.time()
             result = run_command(cmd, node)
             if result.returncode != 0:
                 raise Exception(f"kubelet 중지 실패: {result.stderr}")
+            notify(on_event, "fault_injected", injected_at)
             
             # 지정된 시간 후 복구
-            time.sleep(duration)
+            wait_duration(duration, stop_event, deadline)
             cmd = "systemctl start kubelet && echo 'kubelet 시작 완료'"
+            removed_at = time.time()
             result = run_command(cmd, node)
             if result.returncode != 0:
                 raise Exception(f"kubelet 시작 실패: {result.stderr}")
+            notify(on_event, "fault_removed", removed_at)
             
         elif method == "runtime":
             # 컨테이너 런타임 중지
             cmd = "systemctl stop containerd && echo '런타임 중지 완료'"
+            injected_at = time.time()
             result = run_command(cmd, node)
             if result.returncode != 0:
                 raise Exception(f"런타임 중지 실패: {result.stderr}")
+            notify(on_event, "fault_injected", injected_at)
             
             # 지정된 시간 후 복구
-            time.sleep(duration)
+            wait_duration(duration, stop_event, deadline)
             cmd = "systemctl start containerd && echo '런타임 시작 완료'"
+            removed_at = time.time()
             result = run_command(cmd, node)
             if result.returncode != 0:
                 raise Exception(f"런타임 시작 실패: {result.stderr}")
+            notify(on_event, "fault_removed", removed_at)
             
         elif method == "drain":
             # 노드 드레인
             cmd = f"kubectl drain {node} --ignore-daemonsets --delete-emptydir-data --force --grace-period=0 --timeout=60s && echo '노드 드레인 완료'"
+            injected_at = time.time()
             result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
             if result.returncode != 0:
                 raise Exception(f"노드 드레인 실패: {result.stderr}")
+            notify(on_event, "fault_injected", injected_at)
             
             # 지정된 시간 후 복구
-            time.sleep(duration)
+            wait_duration(duration, stop_event, deadline)
             cmd = f"kubectl uncordon {node} && echo '노드 복구 완료'"
+            removed_at = time.time()
             result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
             if result.returncode != 0:
                 raise Exception(f"노드 복구 실패: {result.stderr}")
+            notify(on_event, "fault_removed", removed_at)
             
         elif method == "extreme":
             # stress-ng 설치 확인 및 설치
@@ -109,9 +148,12 @@ def isolate_node(node, method, duration):
             
             # CPU와 메모리 부하 생성: CPU 4개, 메모리 2개, 1GB 사용, 10초 동안 실행
             cmd = "stress-ng --cpu 4 --vm 2 --vm-bytes 1G --timeout 10s && echo '부하 생성 완료'"
+            injected_at = time.time()
             result = run_command(cmd, node)
             if result.returncode != 0:
                 raise Exception(f"부하 생성 실패: {result.stderr}")
+            notify(on_event, "fault_injected", injected_at)
+            notify(on_event, "fault_removed", time.time())
             
         else:
             raise ValueError(f"지원하지 않는 격리 방법: {method}")
@@ -125,16 +167,40 @@ def isolate_node(node, method, duration):
 def main():
     parser = argparse.ArgumentParser(description="노드 격리 스크립트")
     parser.add_argument("--node", required=True, help="격리할 노드 이름")
-    parser.add_argument("--method", required=True, choices=["network", "kubelet", "runtime", "drain", "extreme"], help="격리 방법")
+    parser.add_argument("--method", required=True, choices=ISOLATION_METHODS, help="격리 방법")
     parser.add_argument("--duration", type=int, default=300, help="격리 지속 시간(초)")
+    parser.add_argument("--timeline", action="store_true", help="장애 감지/복구 타임라인 기록")
+    parser.add_argument("--settle-timeout", type=int, default=600, help="격리 종료 후 복구 완료 대기 시간(초)")
     
     args = parser.parse_args()
     
+    timeline = IsolationTimeline(args.node) if args.timeline else None
     try:
-        isolate_node(args.node, args.method, args.duration)
+        if timeline:
+            timeline.start()
+        isolate_node(
+            args.node, args.method, args.duration,
+            on_event=timeline.on_fault_event if timeline else None
+        )
+        if timeline:
+            print("복구 완료 대기 중...")
+            timeline.wait_settled(args.settle_timeout)
     except Exception as e:
         print(f"격리 작업 중 오류 발생: {str(e)}")
         sys.exit(1)
+    finally:
+        if timeline:
+            timeline.stop()
+    
+    if timeline:
+        print("\n=== 타임라인 ===")
+        data = timeline.to_dict()
+        for milestone in MILESTONES:
+            value = data[milestone]
+            print(f"  {milestone}: {value.strftime('%H:%M:%S.%f')[:-3] if value else '-'}")
+        print(f"  축출 파드: {data['evicted_pods']}개, 대체 파드: {data['replaced_pods']}개")
+        for phase, seconds in data["durations"].items():
+            print(f"  {phase}: {f'{seconds:.3f}초' if seconds is not None else '-'}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
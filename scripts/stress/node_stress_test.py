@@ -5,38 +5,99 @@
 """
 
 import subprocess
+import asyncio
 import time
 import sys
 import argparse
 import threading
 from pathlib import Path
+from datetime import datetime
 import yaml
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from tools.env_loader import EnvLoader
+from tools.ssh_pool import ssh_pool
+from tools.metric_store import MetricStore, MetricPublisher
+from scripts.stress.resource_stream import NodeResourceStream
+from scripts.stress.stress_results import StressResultStore, build_record
+
+# 노드 정보 조회 (CPU 코어 수, 총 메모리 MB, stress-ng 설치 여부 1/0)를 한 번의 SSH 명령으로 처리
+PROBE_COMMAND = "nproc; free -m | awk 'NR==2{print $2}'; command -v stress-ng >/dev/null 2>&1 && echo 1 || echo 0"
+# stress-ng가 없을 때만 설치
+INSTALL_COMMAND = "which stress-ng >/dev/null 2>&1 || (apt-get update && apt-get install -y stress-ng htop)"
+
+def parse_probe(output):
+    """PROBE_COMMAND 출력 -> (CPU 코어 수, 총 메모리 MB, stress-ng 설치 여부)"""
+    values = output.split()
+    return int(values[0]), int(values[1]), len(values) > 2 and values[2] == "1"
+
+def cpu_workers(cpu_count, cpu_percentage):
+    """목표 사용률에 맞는 CPU 워커 수"""
+    return max(1, int(cpu_count * cpu_percentage / 100))
+
+def memory_target_mb(total_memory, memory_percentage):
+    """목표 사용률에 맞는 메모리 크기(MB)"""
+    return int(total_memory * memory_percentage / 100)
+
+def cpu_stress_command(workers, duration):
+    return f"stress-ng --cpu {workers} --timeout {duration} --metrics-brief"
+
+def memory_stress_command(target_memory, duration):
+    return f"stress-ng --vm 1 --vm-bytes {target_memory}M --timeout {duration} --metrics-brief"
+
+class StressProgress:
+    """여러 노드의 준비 단계를 한 줄로 집계하여 출력"""
+    STAGES = ["대기", "조회", "설치", "실행", "실패"]
+
+    def __init__(self, nodes):
+        self.stages = {node: "대기" for node in nodes}
+        self.errors = {}
+        self.started = time.monotonic()
+        self.interactive = sys.stdout.isatty()
+
+    def update(self, node, stage, error=None):
+        self.stages[node] = stage
+        if error:
+            self.errors[node] = error
+        counts = {name: 0 for name in self.STAGES}
+        for value in self.stages.values():
+            counts[value] += 1
+        done = counts["실행"] + counts["실패"]
+        line = (f"[{done}/{len(self.stages)}] " +
+                ", ".join(f"{name} {count}" for name, count in counts.items() if count) +
+                f" ({time.monotonic() - self.started:.1f}초)")
+        if self.interactive:
+            print(f"\r{line}\033[K", end="", flush=True)
+        else:
+            print(line)
+
+    def finish(self):
+        if self.interactive:
+            print()
+        for node, error in self.errors.items():
+            print(f"  실패 {node}: {error}")
 
 class NodeStressTest:
     def __init__(self):
         self.env_loader = EnvLoader()
         self.stress_processes = []
+        self.stress_runs = {} # 프로세스 -> 부하 파라미터 (결과 기록용)
+        self.run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.result_store = StressResultStore()
         self.monitoring_active = False
+        self.resource_streams = {} # node_ip -> NodeResourceStream (수집된 시계열 보관)
+        self.metric_store = MetricStore() # 노드명 -> 다운샘플링된 지표 시계열
+        self.metric_publisher = None # API 서버로 샘플 전송 (선택)
     
     def run_ssh_command(self, node_ip, command, background=False):
-        """SSH를 통해 원격 노드에서 명령 실행"""
-        ssh_cmd = [
-            "ssh", 
-            "-o", "StrictHostKeyChecking=no",
-            "-o", "UserKnownHostsFile=/dev/null",
-            f"root@{node_ip}",
-            command
-        ]
-        
+        """SSH를 통해 원격 노드에서 명령 실행 (노드별 SSH 세션 재사용)"""
         try:
             if background:
-                return subprocess.Popen(ssh_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                # --metrics-brief 결과를 수집하기 위해 stderr도 stdout으로 합침
+                return ssh_pool.popen(node_ip, command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
             else:
-                result = subprocess.run(ssh_cmd, capture_output=True, text=True, timeout=30)
+                result = ssh_pool.run(node_ip, command, timeout=30)
                 return result
         except subprocess.TimeoutExpired:
             print(f"SSH 명령 타임아웃: {node_ip}")
@@ -73,14 +134,14 @@ class NodeStressTest:
             return False
         
         cpu_count = int(result.stdout.strip())
-        workers = max(1, int(cpu_count * cpu_percentage / 100))
+        workers = cpu_workers(cpu_count, cpu_percentage)
         
         # stress-ng로 CPU 부하 생성
-        stress_cmd = f"stress-ng --cpu {workers} --timeout {duration} --metrics-brief"
+        stress_cmd = cpu_stress_command(workers, duration)
         process = self.run_ssh_command(node_ip, stress_cmd, background=True)
         
         if process:
-            self.stress_processes.append(('cpu', node_ip, process))
+            self.register_stress('cpu', node_ip, process, workers, cpu_percentage=cpu_percentage, duration=duration)
             print(f"CPU 부하 테스트 시작됨: {node_ip} (워커: {workers}개)")
             return True
         else:
@@ -100,14 +161,15 @@ class NodeStressTest:
             return False
         
         total_memory = int(result.stdout.strip())
-        target_memory = int(total_memory * memory_percentage / 100)
+        target_memory = memory_target_mb(total_memory, memory_percentage)
         
         # stress-ng로 메모리 부하 생성
-        stress_cmd = f"stress-ng --vm 1 --vm-bytes {target_memory}M --timeout {duration} --metrics-brief"
+        stress_cmd = memory_stress_command(target_memory, duration)
         process = self.run_ssh_command(node_ip, stress_cmd, background=True)
         
         if process:
-            self.stress_processes.append(('memory', node_ip, process))
+            self.register_stress('memory', node_ip, process, 1, memory_percentage=memory_percentage,
+                                 target_memory_mb=target_memory, duration=duration)
             print(f"메모리 부하 테스트 시작됨: {node_ip} (목표: {target_memory}MB)")
             return True
         else:
@@ -123,39 +185,156 @@ class NodeStressTest:
         
         return cpu_success and memory_success
     
-    def monitor_node_resources(self, node_ip, interval=10):
-        """노드 리소스 모니터링"""
-        print(f"노드 {node_ip} 리소스 모니터링 시작 (간격: {interval}초)")
-        
-        while self.monitoring_active:
-            # CPU 사용률 확인
-            cpu_cmd = "top -bn1 | grep 'Cpu(s)' | awk '{print $2}' | cut -d'%' -f1"
-            cpu_result = self.run_ssh_command(node_ip, cpu_cmd)
+    async def prepare_node_async(self, node_name, node_ip, stress_type, cpu_percentage,
+                                 memory_percentage, duration, install, progress):
+        """노드 하나의 조회 -> 설치 -> 부하 실행 (비동기)"""
+        try:
+            progress.update(node_name, "조회")
+            result = await ssh_pool.run_async(node_ip, PROBE_COMMAND, timeout=30)
+            if result.returncode != 0:
+                raise RuntimeError(f"노드 정보 확인 실패: {result.stderr.strip()}")
+            cpu_count, total_memory, installed = parse_probe(result.stdout)
             
-            # 메모리 사용률 확인
-            mem_cmd = "free | grep Mem | awk '{printf \"%.1f\", $3/$2 * 100.0}'"
-            mem_result = self.run_ssh_command(node_ip, mem_cmd)
+            if install and not installed:
+                progress.update(node_name, "설치")
+                result = await ssh_pool.run_async(node_ip, INSTALL_COMMAND, timeout=600)
+                if result.returncode != 0:
+                    raise RuntimeError(f"스트레스 도구 설치 실패: {result.stderr.strip()[-200:]}")
             
-            # 로드 평균 확인
-            load_cmd = "uptime | awk -F'load average:' '{print $2}'"
-            load_result = self.run_ssh_command(node_ip, load_cmd)
+            commands = []
+            if stress_type in ("cpu", "combined"):
+                workers = cpu_workers(cpu_count, cpu_percentage)
+                commands.append(("cpu", cpu_stress_command(workers, duration), workers,
+                                 {"cpu_percentage": cpu_percentage}))
+            if stress_type in ("memory", "combined"):
+                target_memory = memory_target_mb(total_memory, memory_percentage)
+                commands.append(("memory", memory_stress_command(target_memory, duration), 1,
+                                 {"memory_percentage": memory_percentage, "target_memory_mb": target_memory}))
             
-            if cpu_result and mem_result and load_result:
-                cpu_usage = cpu_result.stdout.strip()
-                mem_usage = mem_result.stdout.strip()
-                load_avg = load_result.stdout.strip()
-                
-                timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-                print(f"[{timestamp}] {node_ip} - CPU: {cpu_usage}%, 메모리: {mem_usage}%, 로드: {load_avg}")
+            for kind, command, workers, params in commands:
+                # 세션 연결이 블로킹이므로 스레드에서 시작하여 다른 노드 준비를 막지 않음
+                process = await asyncio.to_thread(self.run_ssh_command, node_ip, command, True)
+                if not process:
+                    raise RuntimeError(f"{kind} 부하 테스트 시작 실패")
+                self.register_stress(kind, node_ip, process, workers, duration=duration, **params)
             
-            time.sleep(interval)
+            progress.update(node_name, "실행")
+            return True
+        except Exception as e:
+            progress.update(node_name, "실패", str(e))
+            return False
     
-    def start_monitoring(self, node_ip, interval=10):
+    async def start_stress_on_nodes_async(self, nodes, stress_type="combined", cpu_percentage=80,
+                                          memory_percentage=70, duration="300s", install=False,
+                                          concurrency=10):
+        """여러 노드에 동시에 부하 테스트 준비 및 실행 (nodes: 노드명 -> IP)"""
+        progress = StressProgress(nodes.keys())
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def run(node_name, node_ip):
+            async with semaphore:
+                return node_name, await self.prepare_node_async(
+                    node_name, node_ip, stress_type, cpu_percentage,
+                    memory_percentage, duration, install, progress
+                )
+        
+        results = await asyncio.gather(*(run(name, ip) for name, ip in nodes.items()))
+        progress.finish()
+        return dict(results)
+    
+    def start_stress_on_nodes(self, nodes, **kwargs):
+        """start_stress_on_nodes_async의 동기 래퍼"""
+        return asyncio.run(self.start_stress_on_nodes_async(nodes, **kwargs))
+    
+    def node_name(self, node_ip):
+        """IP에 해당하는 노드명 (설정에 없으면 IP)"""
+        node_info = self.env_loader.get_node_by_ip(node_ip)
+        return node_info['hostname'] if node_info else node_ip
+    
+    def register_stress(self, kind, node_ip, process, workers, **params):
+        """실행한 부하 프로세스와 파라미터 등록"""
+        self.stress_processes.append((kind, node_ip, process))
+        self.stress_runs[process] = {'kind': kind, 'node_ip': node_ip, 'workers': workers, **params}
+    
+    def collect_stress_result(self, process):
+        """종료된 부하 프로세스의 --metrics-brief 결과를 파싱하여 저장"""
+        params = self.stress_runs.pop(process, None)
+        if params is None or process.stdout is None:
+            return None
+        try:
+            output = process.stdout.read()
+        except Exception as e:
+            print(f"부하 테스트 출력 읽기 실패: {params['node_ip']} - {e}")
+            return None
+        
+        node_ip = params.pop('node_ip')
+        record = build_record(self.run_id, self.node_name(node_ip), node_ip, output=output, **params)
+        if record is None:
+            print(f"부하 테스트 결과 없음: {node_ip} ({params['kind']})")
+            return None
+        
+        self.result_store.append(record)
+        for result in record['stressors']:
+            print(f"{params['kind']} 부하 결과: {record['node']} {result['stressor']} "
+                  f"{result['bogo_ops_per_sec_real']:.2f} bogo ops/s "
+                  f"(usr {result['usr_time']:.1f}s, sys {result['sys_time']:.1f}s)")
+        return record
+    
+    def reap_finished_stress(self):
+        """완료된 부하 프로세스를 목록에서 제거하고 결과 기록"""
+        running = []
+        for entry in self.stress_processes:
+            if entry[2].poll() is None:
+                running.append(entry)
+            else:
+                self.collect_stress_result(entry[2])
+        self.stress_processes = running
+        return running
+    
+    def record_sample(self, node_ip, sample):
+        """리소스 샘플을 노드명 기준으로 지표 저장소에 기록"""
+        node_name = self.node_name(node_ip)
+        self.metric_store.record(node_name, sample)
+        if self.metric_publisher:
+            self.metric_publisher.add(node_name, sample)
+    
+    def monitor_node_resources(self, node_ip, interval=10, sample_interval=0.5):
+        """노드 리소스 모니터링
+        - 노드당 SSH 세션 하나로 sample_interval 간격의 샘플을 계속 수신하고 interval마다 요약 출력
+        """
+        print(f"노드 {node_ip} 리소스 모니터링 시작 (샘플 간격: {sample_interval}초, 출력 간격: {interval}초)")
+        
+        stream = NodeResourceStream(node_ip, interval=sample_interval, on_sample=self.record_sample)
+        self.resource_streams[node_ip] = stream
+        stream.start()
+        
+        try:
+            while self.monitoring_active:
+                time.sleep(interval)
+                
+                sample = stream.series.latest()
+                if sample is None:
+                    if not stream.is_running():
+                        print(f"리소스 스트림이 종료되었습니다: {node_ip}")
+                        break
+                    continue
+                
+                timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sample['timestamp']))
+                load_avg = f"{sample['load1']}, {sample['load5']}, {sample['load15']}"
+                line = (f"[{timestamp}] {node_ip} - CPU: {sample['cpu_percent']}%, "
+                        f"메모리: {sample['memory_percent']}%, 로드: {load_avg}")
+                if sample['psi_memory_some'] is not None:
+                    line += f", PSI(cpu/mem/io): {sample['psi_cpu_some']}/{sample['psi_memory_some']}/{sample['psi_io_some']}"
+                print(line)
+        finally:
+            stream.stop()
+    
+    def start_monitoring(self, node_ip, interval=10, sample_interval=0.5):
         """백그라운드에서 모니터링 시작"""
         self.monitoring_active = True
         monitor_thread = threading.Thread(
             target=self.monitor_node_resources, 
-            args=(node_ip, interval)
+            args=(node_ip, interval, sample_interval)
         )
         monitor_thread.daemon = True
         monitor_thread.start()
@@ -169,15 +348,23 @@ class NodeStressTest:
         """모든 부하 테스트 중지"""
         print("모든 부하 테스트를 중지합니다...")
         
+        stopped_nodes = set()
         for stress_type, node_ip, process in self.stress_processes:
             try:
-                # 원격 노드에서 stress-ng 프로세스 종료
-                kill_cmd = "pkill -f stress-ng"
-                self.run_ssh_command(node_ip, kill_cmd)
+                # 원격 노드에서 stress-ng 프로세스 종료 (노드당 한 번)
+                # SIGINT로 종료해야 stress-ng가 그때까지의 지표를 출력함
+                if node_ip not in stopped_nodes:
+                    kill_cmd = "pkill -INT -f stress-ng"
+                    self.run_ssh_command(node_ip, kill_cmd)
+                    stopped_nodes.add(node_ip)
                 
-                # 로컬 프로세스 종료
-                process.terminate()
-                process.wait(timeout=5)
+                # 지표 출력 후 SSH가 끝나기를 기다리고, 끝나지 않으면 로컬 프로세스 종료
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.terminate()
+                    process.wait(timeout=5)
+                self.collect_stress_result(process)
                 print(f"{stress_type} 부하 테스트 중지됨: {node_ip}")
             except Exception as e:
                 print(f"부하 테스트 중지 실패: {node_ip} - {e}")
@@ -203,57 +390,59 @@ class NodeStressTest:
 
 def main():
     parser = argparse.ArgumentParser(description="쿠버네티스 노드 부하 테스트")
-    parser.add_argument("--node", required=True, help="테스트할 노드명 (예: worker1)")
+    parser.add_argument("--node", required=True, help="테스트할 노드명, 여러 노드는 쉼표로 구분 (예: worker1,worker2)")
     parser.add_argument("--type", choices=["cpu", "memory", "combined"], default="combined", 
                        help="부하 테스트 유형")
     parser.add_argument("--cpu-percent", type=int, default=80, help="CPU 사용률 (%)")
     parser.add_argument("--memory-percent", type=int, default=70, help="메모리 사용률 (%)")
     parser.add_argument("--duration", default="300s", help="테스트 지속 시간")
     parser.add_argument("--monitor", action="store_true", help="리소스 모니터링 활성화")
+    parser.add_argument("--monitor-interval", type=int, default=10, help="모니터링 출력 간격 (초)")
+    parser.add_argument("--sample-interval", type=float, default=0.5, help="리소스 샘플링 간격 (초)")
     parser.add_argument("--install", action="store_true", help="스트레스 도구 설치")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시에 준비할 노드 수")
+    parser.add_argument("--metrics-url", help="수집한 리소스 샘플을 전송할 API 서버 주소 (예: http://localhost:8000)")
     
     args = parser.parse_args()
     
     stress_test = NodeStressTest()
+    if args.metrics_url:
+        stress_test.metric_publisher = MetricPublisher(args.metrics_url).start()
     
     # 노드 정보 가져오기
-    node_info = stress_test.env_loader.get_node_by_name(args.node)
-    if not node_info:
-        print(f"노드를 찾을 수 없습니다: {args.node}")
-        sys.exit(1)
-    
-    node_ip = node_info['private_ip']
-    print(f"대상 노드: {args.node} ({node_ip})")
+    nodes = {}
+    for node_name in [n.strip() for n in args.node.split(",") if n.strip()]:
+        node_info = stress_test.env_loader.get_node_by_name(node_name)
+        if not node_info:
+            print(f"노드를 찾을 수 없습니다: {node_name}")
+            sys.exit(1)
+        nodes[node_name] = node_info['private_ip']
     
-    # 노드 상태 확인
-    status = stress_test.get_node_status(node_ip)
-    if status != "HEALTHY":
-        print(f"노드 상태 이상: {status}")
-        sys.exit(1)
+    print("대상 노드: " + ", ".join(f"{name} ({ip})" for name, ip in nodes.items()))
     
     try:
-        # 스트레스 도구 설치
-        if args.install:
-            if not stress_test.install_stress_tools(node_ip):
-                sys.exit(1)
-        
-        # 모니터링 시작
-        if args.monitor:
-            stress_test.start_monitoring(node_ip)
-        
-        # 부하 테스트 시작
-        if args.type == "cpu":
-            success = stress_test.start_cpu_stress(node_ip, args.cpu_percent, args.duration)
-        elif args.type == "memory":
-            success = stress_test.start_memory_stress(node_ip, args.memory_percent, args.duration)
-        else:  # combined
-            success = stress_test.start_combined_stress(
-                node_ip, args.cpu_percent, args.memory_percent, args.duration
-            )
+        # 조회/설치/부하 실행을 노드별로 동시에 진행
+        results = stress_test.start_stress_on_nodes(
+            nodes,
+            stress_type=args.type,
+            cpu_percentage=args.cpu_percent,
+            memory_percentage=args.memory_percent,
+            duration=args.duration,
+            install=args.install,
+            concurrency=args.concurrency
+        )
         
-        if not success:
+        succeeded = [name for name, ok in results.items() if ok]
+        if not succeeded:
             print("부하 테스트 시작 실패")
             sys.exit(1)
+        if len(succeeded) < len(nodes):
+            print(f"일부 노드만 부하 테스트가 시작되었습니다: {len(succeeded)}/{len(nodes)}")
+        
+        # 모니터링 시작
+        if args.monitor:
+            for name in succeeded:
+                stress_test.start_monitoring(nodes[name], args.monitor_interval, args.sample_interval)
         
         print(f"부하 테스트가 실행 중입니다. 지속 시간: {args.duration}")
         print("Ctrl+C를 눌러 중지할 수 있습니다.")
@@ -261,11 +450,8 @@ def main():
         # 테스트 완료까지 대기
         while stress_test.stress_processes:
             time.sleep(5)
-            # 완료된 프로세스 제거
-            stress_test.stress_processes = [
-                (t, ip, p) for t, ip, p in stress_test.stress_processes 
-                if p.poll() is None
-            ]
+            # 완료된 프로세스 제거 및 결과 기록
+            stress_test.reap_finished_stress()
         
         print("부하 테스트 완료")
         
@@ -273,6 +459,8 @@ def main():
         print("\n사용자에 의해 중단됨")
     finally:
         stress_test.stop_all_stress_tests()
+        if stress_test.metric_publisher:
+            stress_test.metric_publisher.stop()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+노드 리소스 스트림 수집기
+노드마다 SSH 세션 하나로 /proc/stat, /proc/meminfo, /proc/loadavg, PSI를 주기적으로 출력하게 하고
+수신 측에서 증분 파싱하여 수치 시계열로 변환
+"""
+
+import sys
+import math
+import threading
+import subprocess
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from tools.ssh_pool import ssh_pool
+from tools.metric_store import RingSeries
+
+# 시계열로 기록하는 지표
+METRICS = [
+    "cpu_percent",
+    "memory_percent",
+    "load1",
+    "load5",
+    "load15",
+    "psi_cpu_some",
+    "psi_memory_some",
+    "psi_memory_full",
+    "psi_io_some",
+    "psi_io_full",
+]
+
+# 원격에서 실행할 샘플링 루프 (샘플마다 "@ <epoch>"로 시작해 "#"으로 끝남)
+REMOTE_SAMPLER = (
+    "while :; do "
+    "echo \"@ $(date +%s.%N)\"; "
+    "head -1 /proc/stat; "
+    "grep -E '^(MemTotal|MemAvailable):' /proc/meminfo; "
+    "cat /proc/loadavg; "
+    "for r in cpu memory io; do [ -r /proc/pressure/$r ] && sed \"s/^/psi_$r /\" /proc/pressure/$r; done; "
+    "echo '#'; "
+    "sleep {interval}; "
+    "done"
+)
+
+class ResourceSampleParser:
+    """샘플 스트림 증분 파서
+    - 한 줄씩 feed()하고 샘플이 끝나면 지표 딕셔너리를 반환
+    - CPU 사용률은 직전 샘플과의 /proc/stat 차이로 계산
+    - PSI도 커널의 10초 이동 평균(avg10) 대신 누적 지연 시간(total=, µs)의 차이를
+      샘플 간격으로 나누어 샘플 구간의 지연 비율(%)로 계산
+    """
+
+    def __init__(self):
+        self._current = None
+        self._prev_cpu = None
+        self._prev_psi = {} # 지표 -> (누적 지연 µs, 샘플 시각)
+
+    def feed(self, line):
+        line = line.strip()
+        if not line:
+            return None
+        if line.startswith("@ "):
+            self._current = {"timestamp": float(line[2:])}
+            return None
+        if self._current is None:
+            return None # 첫 샘플 시작 전의 출력은 무시
+        if line == "#":
+            sample, self._current = self._current, None
+            return sample if "cpu_percent" in sample else None
+
+        fields = line.split()
+        sample = self._current
+        try:
+            if fields[0] == "cpu":
+                values = [int(v) for v in fields[1:]]
+                idle = values[3] + (values[4] if len(values) > 4 else 0) # idle + iowait
+                total = sum(values[:8]) # guest는 user에 이미 포함
+                if self._prev_cpu:
+                    d_total = total - self._prev_cpu[0]
+                    d_idle = idle - self._prev_cpu[1]
+                    if d_total > 0:
+                        sample["cpu_percent"] = round(100.0 * (d_total - d_idle) / d_total, 2)
+                self._prev_cpu = (total, idle)
+            elif fields[0] == "MemTotal:":
+                sample["_mem_total"] = int(fields[1])
+            elif fields[0] == "MemAvailable:":
+                total = sample.pop("_mem_total", 0)
+                if total:
+                    sample["memory_percent"] = round(100.0 * (total - int(fields[1])) / total, 2)
+            elif fields[0].startswith("psi_"):
+                # psi_memory some avg10=0.00 avg60=0.00 avg300=0.00 total=0
+                key = f"{fields[0]}_{fields[1]}"
+                stalled = int(next(f for f in fields[2:] if f.startswith("total=")).split("=", 1)[1])
+                previous = self._prev_psi.get(key)
+                if previous and sample["timestamp"] > previous[1]:
+                    elapsed_us = (sample["timestamp"] - previous[1]) * 1e6
+                    sample[key] = round(min(100.0, 100.0 * max(0, stalled - previous[0]) / elapsed_us), 2)
+                self._prev_psi[key] = (stalled, sample["timestamp"])
+            elif len(fields) >= 5 and "/" in fields[3]:
+                # /proc/loadavg
+                sample["load1"], sample["load5"], sample["load15"] = (float(v) for v in fields[:3])
+        except (ValueError, IndexError, StopIteration):
+            pass # 잘린 줄은 해당 지표만 건너뜀
+        return None
+
+class ResourceSeries:
+    """노드 하나의 지표 시계열 (값이 없으면 NaN)
+    - 최근 max_samples개만 링 버퍼에 보관하여 장시간 스트림에서도 메모리 사용량 고정
+    - 샘플 번호와 len()은 지금까지 받은 전체 샘플 기준이며, 보관 범위를 벗어난 샘플은 window에서 제외
+    """
+
+    def __init__(self, max_samples=7200):
+        self.ring = RingSeries(max_samples, len(METRICS))
+        self.count = 0 # 지금까지 받은 샘플 수
+        self.lock = threading.Lock()
+
+    def append(self, sample):
+        with self.lock:
+            self.ring.append(sample["timestamp"], [sample.get(metric, math.nan) for metric in METRICS])
+            self.count += 1
+
+    def latest(self):
+        """가장 최근 샘플"""
+        with self.lock:
+            if not self.count:
+                return None
+            timestamps, columns = self.ring.tail(1)
+            sample = {"timestamp": timestamps[0]}
+            for metric, column in zip(METRICS, columns):
+                value = column[0]
+                sample[metric] = None if math.isnan(value) else round(value, 2)
+            return sample
+
+    def window(self, metric, start=0):
+        """start 번째 샘플부터의 값 (값이 없는 샘플 제외)"""
+        with self.lock:
+            _, (column,) = self.ring.tail(self.count - start, [METRICS.index(metric)])
+            return [v for v in column if not math.isnan(v)]
+
+    def __len__(self):
+        return self.count
+
+class NodeResourceStream:
+    """노드 하나에 대한 장기 실행 샘플링 세션"""
+
+    def __init__(self, node_ip, interval=0.5, on_sample=None, user="root", port=22, password=None,
+                 max_samples=7200):
+        self.node_ip = node_ip
+        self.interval = interval
+        self.on_sample = on_sample
+        self.user = user
+        self.port = port
+        self.password = password
+        self.series = ResourceSeries(max_samples)
+        self.process = None
+        self.thread = None
+
+    def start(self):
+        """원격 샘플링 시작"""
+        self.process = ssh_pool.popen(
+            self.node_ip,
+            REMOTE_SAMPLER.format(interval=self.interval),
+            user=self.user,
+            port=self.port,
+            password=self.password,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+        self.thread = threading.Thread(target=self._read_loop, daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def _read_loop(self):
+        parser = ResourceSampleParser()
+        for line in self.process.stdout:
+            sample = parser.feed(line)
+            if sample is None:
+                continue
+            self.series.append(sample)
+            if self.on_sample:
+                try:
+                    self.on_sample(self.node_ip, sample)
+                except Exception as e:
+                    print(f"리소스 샘플 처리 오류: {e}")
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def stop(self):
+        """원격 샘플링 중지 (ssh 종료 시 원격 루프는 SIGPIPE로 종료됨)"""
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        if self.thread:
+            self.thread.join(timeout=5)
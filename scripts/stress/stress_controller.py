@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+폐루프 부하 제어 스크립트
+노드의 실시간 CPU/메모리 사용률을 읽어 stress-ng 프로세스 수를 조절하고 목표 사용률을 유지
+(노드의 파드와 경쟁하더라도 실제 사용률이 목표에 머물도록 하여 축출 임계값 실험을 재현 가능하게 함)
+"""
+
+import sys
+import json
+import time
+import math
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from tools.env_loader import EnvLoader
+from tools.ssh_pool import ssh_pool
+from tools.stats import tracking_error
+from tools.duration import parse_duration
+from scripts.stress.resource_stream import NodeResourceStream
+from scripts.stress.node_stress_test import PROBE_COMMAND, INSTALL_COMMAND, parse_probe
+
+# 제어 루프가 멈춰도 원격 프로세스가 스스로 종료되도록 지속 시간에 더하는 여유(초)
+UNIT_TIMEOUT_MARGIN = 30
+
+class StressUnitPool:
+    """원격 노드의 stress-ng 단위 프로세스 집합
+    - 단위 하나는 고정 크기의 부하를 내는 독립 프로세스이며 PID로 추가/제거
+    - 모든 단위에 --timeout을 걸어 제어 프로세스가 죽어도 원격에 부하가 남지 않음
+    """
+
+    def __init__(self, node_ip, command):
+        self.node_ip = node_ip
+        self.command = command
+        self.pids = []
+
+    def resize(self, count):
+        """단위 수를 count로 맞춤"""
+        if count > len(self.pids):
+            self._add(count - len(self.pids))
+        elif count < len(self.pids):
+            self._remove(len(self.pids) - count)
+        return len(self.pids)
+
+    def _add(self, count):
+        script = f"for i in $(seq {count}); do nohup {self.command} >/dev/null 2>&1 & echo $!; done"
+        result = ssh_pool.run(self.node_ip, script, timeout=30)
+        if result.returncode != 0:
+            raise RuntimeError(f"부하 단위 시작 실패: {result.stderr.strip()}")
+        self.pids.extend(int(pid) for pid in result.stdout.split() if pid.isdigit())
+
+    def _remove(self, count):
+        pids, self.pids = self.pids[-count:], self.pids[:-count]
+        # 이미 종료된 PID가 섞여 있어도 나머지는 종료되도록 오류 무시
+        ssh_pool.run(self.node_ip, f"kill {' '.join(map(str, pids))} 2>/dev/null; true", timeout=30)
+
+    def stop(self):
+        if self.pids:
+            self._remove(len(self.pids))
+
+class ControlLoop:
+    """지표 하나에 대한 적분 제어 루프
+    - demand: 노드 용량 대비 추가로 만들 부하(%)이며 오차에 gain을 곱해 누적
+    - 첫 단계는 목표와 현재 사용률의 차이로 바로 맞춰 수렴 시간을 줄임
+    - 오차가 허용 오차의 절반 이내면 단위 수를 바꾸지 않아 진동을 막음
+    """
+
+    def __init__(self, metric, target, unit_percent, units, gain=0.6, tolerance=2.0, max_demand=100.0):
+        self.metric = metric
+        self.target = target
+        self.unit_percent = unit_percent
+        self.units = units
+        self.gain = gain
+        self.tolerance = tolerance
+        self.max_demand = max_demand
+        self.demand = None
+        self.trace = []
+
+    def step(self, elapsed, measured):
+        error = self.target - measured
+        if self.demand is None:
+            self.demand = error
+        elif abs(error) > self.tolerance / 2:
+            self.demand += self.gain * error
+        self.demand = min(max(self.demand, 0.0), self.max_demand)
+
+        count = self.units.resize(round(self.demand / self.unit_percent))
+        self.trace.append({
+            "elapsed": round(elapsed, 2),
+            "measured": round(measured, 2),
+            "error": round(error, 2),
+            "demand": round(self.demand, 2),
+            "units": count,
+        })
+        return count
+
+class StressController:
+    """노드 하나의 CPU/메모리 사용률을 목표값으로 유지
+    - CPU 단위: --cpu-load로 부하를 제한한 stress-ng CPU 워커 1개
+    - 메모리 단위: --vm-keep으로 메모리를 계속 점유하는 stress-ng VM 워커 1개
+    - 측정값은 노드당 SSH 스트림 하나(NodeResourceStream)로 수신
+    """
+
+    def __init__(self, node_ip, cpu_target=None, memory_target=None, duration=300,
+                 control_interval=2.0, sample_interval=0.5, gain=0.6, tolerance=2.0,
+                 warmup=30, cpu_unit_load=25, memory_unit_percent=1.0, label=None):
+        if cpu_target is None and memory_target is None:
+            raise ValueError("CPU 또는 메모리 목표 사용률을 지정해야 합니다")
+        self.node_ip = node_ip
+        self.label = label or node_ip
+        self.cpu_target = cpu_target
+        self.memory_target = memory_target
+        self.duration = duration
+        self.control_interval = control_interval
+        self.gain = gain
+        self.tolerance = tolerance
+        self.warmup = warmup
+        self.cpu_unit_load = cpu_unit_load
+        self.memory_unit_percent = memory_unit_percent
+        self.stream = NodeResourceStream(node_ip, interval=sample_interval)
+        self.loops = {}
+        self.warmup_index = None
+        self.started_at = None
+
+    def probe(self):
+        """CPU 코어 수와 총 메모리(MB) 조회"""
+        result = ssh_pool.run(self.node_ip, PROBE_COMMAND, timeout=30)
+        if result.returncode != 0:
+            raise RuntimeError(f"노드 정보 확인 실패: {result.stderr.strip()}")
+        cpu_count, total_memory, _ = parse_probe(result.stdout)
+        return cpu_count, total_memory
+
+    def build_loops(self):
+        cpu_count, total_memory = self.probe()
+        timeout = self.duration + UNIT_TIMEOUT_MARGIN
+        if self.cpu_target is not None:
+            units = StressUnitPool(
+                self.node_ip,
+                f"stress-ng --cpu 1 --cpu-load {self.cpu_unit_load} --timeout {timeout}s"
+            )
+            self.loops["cpu_percent"] = ControlLoop(
+                "cpu_percent", self.cpu_target, self.cpu_unit_load / cpu_count, units,
+                self.gain, self.tolerance
+            )
+        if self.memory_target is not None:
+            unit_mb = max(1, int(total_memory * self.memory_unit_percent / 100))
+            units = StressUnitPool(
+                self.node_ip,
+                f"stress-ng --vm 1 --vm-bytes {unit_mb}M --vm-keep --timeout {timeout}s"
+            )
+            # 목표보다 많은 메모리를 점유하지 않도록 상한 설정
+            self.loops["memory_percent"] = ControlLoop(
+                "memory_percent", self.memory_target, unit_mb * 100 / total_memory, units,
+                self.gain, self.tolerance, max_demand=self.memory_target
+            )
+
+    def wait_first_sample(self, timeout=15):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.stream.series.latest() is not None:
+                return True
+            if not self.stream.is_running():
+                break
+            time.sleep(0.1)
+        return False
+
+    def measure(self, metric, start):
+        """직전 제어 주기 동안의 측정값 (CPU는 평균, 메모리는 최신값)"""
+        values = self.stream.series.window(metric, start)
+        if not values:
+            return None
+        if metric == "cpu_percent":
+            return sum(values) / len(values)
+        return values[-1]
+
+    def run(self, stop_event=None):
+        """제어 루프 실행 (duration 동안 블로킹) 후 추종 결과 반환"""
+        stop_event = stop_event or threading.Event()
+        self.build_loops()
+        self.stream.start()
+        try:
+            if not self.wait_first_sample():
+                raise RuntimeError("리소스 샘플을 수신하지 못했습니다")
+
+            self.started_at = time.time()
+            started = time.monotonic()
+            deadline = started + self.duration
+            start_index = len(self.stream.series)
+            while not stop_event.is_set() and time.monotonic() < deadline:
+                stop_event.wait(min(self.control_interval, max(0.0, deadline - time.monotonic())))
+                elapsed = time.monotonic() - started
+                end_index = len(self.stream.series)
+                if self.warmup_index is None and elapsed >= self.warmup:
+                    self.warmup_index = end_index
+
+                parts = []
+                for metric, loop in self.loops.items():
+                    measured = self.measure(metric, start_index)
+                    if measured is None:
+                        continue
+                    count = loop.step(elapsed, measured)
+                    name = "CPU" if metric == "cpu_percent" else "메모리"
+                    parts.append(f"{name} {measured:.1f}% (목표 {loop.target}%, 단위 {count}개)")
+                start_index = end_index
+                if parts:
+                    print(f"[{elapsed:6.1f}s] {self.label} - " + ", ".join(parts))
+        finally:
+            for loop in self.loops.values():
+                try:
+                    loop.units.stop()
+                except Exception as e:
+                    print(f"부하 단위 정리 실패: {self.label} - {e}")
+            self.stream.stop()
+        return self.report()
+
+    def report(self):
+        """워밍업 이후 샘플 기준의 목표 추종 결과"""
+        start = self.warmup_index if self.warmup_index is not None else len(self.stream.series)
+        return {
+            "node": self.label,
+            "node_ip": self.node_ip,
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat() if self.started_at else None,
+            "duration": self.duration,
+            "warmup": self.warmup,
+            "gain": self.gain,
+            "tolerance": self.tolerance,
+            "loops": {
+                metric: {
+                    "target": loop.target,
+                    "unit_percent": round(loop.unit_percent, 3),
+                    "tracking": tracking_error(self.stream.series.window(metric, start), loop.target, self.tolerance),
+                    "trace": loop.trace,
+                }
+                for metric, loop in self.loops.items()
+            },
+        }
+
+def format_value(value, suffix=""):
+    return f"{value:.2f}{suffix}" if value is not None and not math.isnan(value) else "-"
+
+def print_report(report):
+    print(f"\n{report['node']} 목표 추종 결과 (워밍업 {report['warmup']}초 이후, 허용 오차 ±{report['tolerance']}%)")
+    for metric, loop in report["loops"].items():
+        stats = loop["tracking"]
+        name = "CPU" if metric == "cpu_percent" else "메모리"
+        print(f"  {name}: 목표 {loop['target']}%, 평균 {format_value(stats['mean'], '%')}, "
+              f"MAE {format_value(stats['mae'])}, RMSE {format_value(stats['rmse'])}, "
+              f"최대 오차 {format_value(stats['max_abs_error'])}, "
+              f"허용 오차 내 {format_value(stats['within_tolerance'], '%')} (n={stats['count']})")
+
+def main():
+    parser = argparse.ArgumentParser(description="노드 사용률을 목표값으로 유지하는 폐루프 부하 테스트")
+    parser.add_argument("--node", required=True, help="대상 노드명, 여러 노드는 쉼표로 구분")
+    parser.add_argument("--cpu-target", type=float, help="유지할 노드 CPU 사용률 (%%)")
+    parser.add_argument("--memory-target", type=float, help="유지할 노드 메모리 사용률 (%%)")
+    parser.add_argument("--duration", default="300s", help="테스트 지속 시간 (예: 300s, 10m)")
+    parser.add_argument("--control-interval", type=float, default=2.0, help="제어 주기 (초)")
+    parser.add_argument("--sample-interval", type=float, default=0.5, help="리소스 샘플링 간격 (초)")
+    parser.add_argument("--gain", type=float, default=0.6, help="적분 이득 (오차 1%%당 부하 조정량)")
+    parser.add_argument("--tolerance", type=float, default=2.0, help="허용 오차 (%%p)")
+    parser.add_argument("--warmup", type=float, default=30, help="추종 오차 계산에서 제외할 초기 구간 (초)")
+    parser.add_argument("--cpu-unit-load", type=int, default=25, help="CPU 단위 워커 하나의 부하율 (%%)")
+    parser.add_argument("--memory-unit-percent", type=float, default=1.0, help="메모리 단위 하나의 크기 (총 메모리 대비 %%)")
+    parser.add_argument("--install", action="store_true", help="스트레스 도구 설치")
+    parser.add_argument("--output", help="결과 JSON 파일")
+
+    args = parser.parse_args()
+    if args.cpu_target is None and args.memory_target is None:
+        parser.error("--cpu-target 또는 --memory-target을 지정해야 합니다")
+
+    env_loader = EnvLoader()
+    nodes = {}
+    for node_name in [n.strip() for n in args.node.split(",") if n.strip()]:
+        node_info = env_loader.get_node_by_name(node_name)
+        if not node_info:
+            print(f"노드를 찾을 수 없습니다: {node_name}")
+            sys.exit(1)
+        nodes[node_name] = node_info['private_ip']
+
+    duration = parse_duration(args.duration)
+    stop_event = threading.Event()
+    reports = {}
+
+    def run(node_name, node_ip):
+        try:
+            if args.install:
+                result = ssh_pool.run(node_ip, INSTALL_COMMAND, timeout=600)
+                if result.returncode != 0:
+                    raise RuntimeError("스트레스 도구 설치 실패")
+            controller = StressController(
+                node_ip,
+                cpu_target=args.cpu_target,
+                memory_target=args.memory_target,
+                duration=duration,
+                control_interval=args.control_interval,
+                sample_interval=args.sample_interval,
+                gain=args.gain,
+                tolerance=args.tolerance,
+                warmup=args.warmup,
+                cpu_unit_load=args.cpu_unit_load,
+                memory_unit_percent=args.memory_unit_percent,
+                label=node_name
+            )
+            reports[node_name] = controller.run(stop_event)
+        except Exception as e:
+            print(f"폐루프 부하 테스트 실패: {node_name} - {e}")
+
+    print(f"폐루프 부하 테스트 시작: {', '.join(nodes)} (CPU 목표: {args.cpu_target}%, "
+          f"메모리 목표: {args.memory_target}%, 지속시간: {duration}초)")
+    threads = [threading.Thread(target=run, args=item, daemon=True) for item in nodes.items()]
+    for thread in threads:
+        thread.start()
+    try:
+        while any(thread.is_alive() for thread in threads):
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        print("\n사용자에 의해 중단됨, 부하 단위를 정리합니다...")
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+
+    for node_name in nodes:
+        if node_name in reports:
+            print_report(reports[node_name])
+
+    if args.output and reports:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'reports': reports,
+                'generated_at': datetime.now().isoformat()
+            }, f, indent=2, ensure_ascii=False)
+        print(f"\n결과가 저장되었습니다: {args.output}")
+
+    if len(reports) < len(nodes):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+stress-ng 결과 저장 및 비교 스크립트
+--metrics-brief 출력에서 스트레서별 bogo ops/s와 real/usr/sys 시간을 추출해 노드/실행별로 저장하고
+노드 간 처리량을 비교하여 성능이 떨어진 워커를 표시
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from datetime import datetime
+from collections import defaultdict
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from tools.stats import percentile
+
+# 기본 결과 파일 (실행마다 한 줄씩 추가되는 JSON Lines)
+DEFAULT_RESULTS_FILE = Path(__file__).parent.parent.parent / "results" / "stress_results.jsonl"
+
+# --metrics-brief 표의 열 순서 (버전에 따라 뒤쪽 열은 없을 수 있음)
+METRIC_COLUMNS = [
+    "bogo_ops",
+    "real_time",
+    "usr_time",
+    "sys_time",
+    "bogo_ops_per_sec_real",
+    "bogo_ops_per_sec_cpu",
+    "cpu_used_percent",
+    "rss_max_kb",
+]
+
+def parse_metrics_brief(output):
+    """stress-ng --metrics-brief 출력 파싱
+    - "stress-ng: metrc: [pid] cpu 12345 60.00 ..." 또는 구버전의 "info:" 접두어 모두 처리
+    - 표 머리글 이후의 행만 스트레서 결과로 취급
+    """
+    results = []
+    in_table = False
+    for line in output.splitlines():
+        if "] " not in line or not line.startswith("stress-ng"):
+            continue
+        body = line.split("] ", 1)[1].strip()
+        if body.startswith("stressor") and "bogo ops" in body:
+            in_table = True
+            continue
+        if not in_table or not body or body.startswith("("):
+            continue
+
+        fields = body.split()
+        values = []
+        for field in fields[1:len(METRIC_COLUMNS) + 1]:
+            try:
+                values.append(float(field))
+            except ValueError:
+                break
+        if len(values) < 6:
+            in_table = False # 표가 끝나고 다른 메시지가 시작됨
+            continue
+        result = {"stressor": fields[0]}
+        result.update(zip(METRIC_COLUMNS, values))
+        results.append(result)
+    return results
+
+class StressResultStore:
+    """노드/실행별 stress-ng 결과 저장소 (JSON Lines 파일)"""
+
+    def __init__(self, path=None):
+        self.path = Path(path or DEFAULT_RESULTS_FILE)
+
+    def append(self, record):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def load(self, node=None, kind=None, run_id=None):
+        if not self.path.exists():
+            return []
+        records = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue # 기록 중 중단된 줄
+                if node and record.get('node') != node:
+                    continue
+                if kind and record.get('kind') != kind:
+                    continue
+                if run_id and record.get('run_id') != run_id:
+                    continue
+                records.append(record)
+        return records
+
+def build_record(run_id, node, node_ip, kind, workers, output, **params):
+    """결과 레코드 생성 (파싱된 스트레서가 없으면 None)"""
+    stressors = parse_metrics_brief(output)
+    if not stressors:
+        return None
+    return {
+        'run_id': run_id,
+        'node': node,
+        'node_ip': node_ip,
+        'kind': kind,
+        'workers': workers,
+        'finished_at': datetime.now().isoformat(),
+        **params,
+        'stressors': stressors,
+    }
+
+def per_worker_throughput(record, stressor):
+    """워커 1개당 bogo ops/s (노드마다 워커 수가 다르므로 정규화)"""
+    for result in record['stressors']:
+        if result['stressor'] == stressor:
+            return result['bogo_ops_per_sec_real'] / max(1, record.get('workers') or 1)
+    return None
+
+def compare_nodes(records, stressor, threshold=0.15):
+    """노드별 처리량 중앙값을 전체 중앙값과 비교
+    - 전체 중앙값보다 threshold 비율 이상 낮은 노드를 degraded로 표시
+    """
+    by_node = defaultdict(list)
+    for record in records:
+        value = per_worker_throughput(record, stressor)
+        if value is not None:
+            by_node[record['node']].append(value)
+    if not by_node:
+        return []
+
+    medians = {node: percentile(values, 50) for node, values in by_node.items()}
+    fleet = percentile(medians.values(), 50)
+    rows = []
+    for node, values in sorted(by_node.items()):
+        ratio = medians[node] / fleet if fleet else None
+        rows.append({
+            'node': node,
+            'runs': len(values),
+            'median': medians[node],
+            'min': min(values),
+            'max': max(values),
+            'ratio': ratio,
+            'degraded': ratio is not None and ratio < 1 - threshold,
+        })
+    return rows
+
+def print_comparison(rows, stressor, threshold):
+    print(f"\n노드별 처리량 비교 ({stressor}, 워커당 bogo ops/s, 기준: 전체 중앙값 대비 -{threshold * 100:.0f}%)")
+    print("-"*80)
+    print(f"  {'노드':<16} {'실행':>4} {'중앙값':>12} {'최소':>12} {'최대':>12} {'비율':>7}")
+    for row in rows:
+        mark = "  <- 성능 저하" if row['degraded'] else ""
+        print(f"  {row['node']:<16} {row['runs']:>4} {row['median']:>12.2f} {row['min']:>12.2f} "
+              f"{row['max']:>12.2f} {row['ratio']:>6.2f}x{mark}")
+
+def print_records(records):
+    for record in records:
+        print(f"[{record['finished_at']}] {record['run_id']} {record['node']} {record['kind']} (워커 {record.get('workers')}개)")
+        for result in record['stressors']:
+            print(f"    {result['stressor']:<8} {result['bogo_ops_per_sec_real']:>12.2f} bogo ops/s "
+                  f"(real {result['real_time']:.2f}s, usr {result['usr_time']:.2f}s, sys {result['sys_time']:.2f}s)")
+
+def main():
+    parser = argparse.ArgumentParser(description="stress-ng 결과 조회 및 노드 간 처리량 비교")
+    parser.add_argument("command", choices=["show", "compare"], help="show: 결과 목록, compare: 노드 비교")
+    parser.add_argument("--file", help=f"결과 파일 (기본: {DEFAULT_RESULTS_FILE})")
+    parser.add_argument("--node", help="노드 필터")
+    parser.add_argument("--kind", choices=["cpu", "memory"], help="부하 유형 필터")
+    parser.add_argument("--run-id", help="실행 ID 필터")
+    parser.add_argument("--stressor", default="cpu", help="비교할 스트레서 (예: cpu, vm)")
+    parser.add_argument("--threshold", type=float, default=0.15, help="성능 저하로 판단할 중앙값 대비 감소 비율")
+    parser.add_argument("--last", type=int, help="노드별 최근 N개 실행만 비교")
+
+    args = parser.parse_args()
+
+    store = StressResultStore(args.file)
+    records = store.load(node=args.node, kind=args.kind, run_id=args.run_id)
+    if not records:
+        print(f"결과가 없습니다: {store.path}")
+        sys.exit(1)
+
+    if args.command == "show":
+        print_records(records)
+        return
+
+    if args.last:
+        by_node = defaultdict(list)
+        for record in records:
+            by_node[record['node']].append(record)
+        records = [r for node_records in by_node.values() for r in node_records[-args.last:]]
+
+    rows = compare_nodes(records, args.stressor, args.threshold)
+    if not rows:
+        print(f"{args.stressor} 스트레서 결과가 없습니다")
+        sys.exit(1)
+    print_comparison(rows, args.stressor, args.threshold)
+
+    degraded = [row['node'] for row in rows if row['degraded']]
+    if degraded:
+        print(f"\n성능 저하 노드: {', '.join(degraded)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+지속 시간 변환 유틸리티
+stress-ng 형식의 지속 시간 문자열을 초 단위로 변환
+"""
+
+def parse_duration(value):
+    """stress-ng 형식의 지속 시간(300, 300s, 5m, 1h)을 초로 변환"""
+    value = str(value).strip()
+    units = {"s": 1, "m": 60, "h": 3600}
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(float(value))
@@ -7,42 +7,110 @@ YAML 파일에서 서버 정보를 읽어와 환경변수로 설정
 import yaml
 import os
 import sys
+import threading
 from pathlib import Path
 
 class EnvLoader:
+    """설정 파일별 싱글톤
+    - 같은 경로로 생성하면 기존 인스턴스를 반환
+    - 파일 mtime이 바뀐 경우에만 다시 파싱하고 노드 인덱스를 재구성
+    """
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __new__(cls, config_path="config/env.yaml"):
+        key = os.path.abspath(config_path)
+        with cls._instances_lock:
+            instance = cls._instances.get(key)
+            if instance is None:
+                instance = super(EnvLoader, cls).__new__(cls)
+                instance._initialized = False
+                cls._instances[key] = instance
+        return instance
+
     def __init__(self, config_path="config/env.yaml"):
+        if self._initialized:
+            return
         self.config_path = Path(config_path)
-        self.config = None
+        self._config = None
+        self._mtime = None
+        self._failed_mtime = None # 읽기에 실패한 파일 버전 (다시 바뀔 때까지 재시도하지 않음)
+        self._nodes = {} # hostname -> 노드 정보
+        self._nodes_by_ip = {} # private/public IP -> 노드 정보
+        self._lock = threading.Lock()
         self.load_config()
+        self._initialized = True
+    
+    @property
+    def config(self):
+        """설정 원본 (파일이 바뀌었으면 다시 로드)"""
+        self._refresh()
+        return self._config
     
     def load_config(self):
         """YAML 설정 파일 로드"""
         try:
+            mtime = os.stat(self.config_path).st_mtime_ns
             with open(self.config_path, 'r', encoding='utf-8') as file:
-                self.config = yaml.safe_load(file)
+                config = yaml.safe_load(file)
         except FileNotFoundError:
             print(f"설정 파일을 찾을 수 없습니다: {self.config_path}")
             sys.exit(1)
         except yaml.YAMLError as e:
             print(f"YAML 파일 파싱 오류: {e}")
             sys.exit(1)
+        self._apply(config, mtime)
     
-    def get_all_nodes(self):
-        """모든 노드 정보 반환"""
+    def _apply(self, config, mtime):
+        """설정 교체 및 노드 인덱스 재구성"""
         nodes = {}
         
         # 마스터 노드 추가
-        for name, info in self.config['masters'].items():
+        for name, info in config['masters'].items():
             nodes[info['hostname']] = info
         
         # 워커 노드 추가
-        for name, info in self.config['workers'].items():
+        for name, info in config['workers'].items():
             nodes[info['hostname']] = info
         
         # 로드밸런서 추가
-        nodes[self.config['loadbalancer']['hostname']] = self.config['loadbalancer']
+        nodes[config['loadbalancer']['hostname']] = config['loadbalancer']
+        
+        nodes_by_ip = {}
+        for info in nodes.values():
+            for key in ('private_ip', 'public_ip'):
+                if info.get(key):
+                    nodes_by_ip[info[key]] = info
         
-        return nodes
+        self._config = config
+        self._nodes = nodes
+        self._nodes_by_ip = nodes_by_ip
+        self._mtime = mtime
+    
+    def _refresh(self):
+        """파일 mtime이 바뀐 경우에만 다시 로드"""
+        try:
+            mtime = os.stat(self.config_path).st_mtime_ns
+        except FileNotFoundError:
+            return # 기존 설정 유지
+        if mtime in (self._mtime, self._failed_mtime):
+            return
+        with self._lock:
+            if mtime in (self._mtime, self._failed_mtime):
+                return
+            try:
+                with open(self.config_path, 'r', encoding='utf-8') as file:
+                    config = yaml.safe_load(file)
+                self._apply(config, mtime)
+            except (OSError, yaml.YAMLError, KeyError, TypeError, AttributeError) as e:
+                # 편집 중인 파일 등 읽기에 실패하면 기존 설정을 유지하고 파일이 다시 바뀔 때 재시도
+                self._failed_mtime = mtime
+                print(f"설정 파일 재로드 실패, 기존 설정 유지: {e}")
+    
+    def get_all_nodes(self):
+        """모든 노드 정보 반환"""
+        self._refresh()
+        return dict(self._nodes)
     
     def get_masters(self):
         """마스터 노드 정보만 반환"""
@@ -58,11 +126,13 @@ class EnvLoader:
     
     def get_node_by_name(self, node_name):
         """특정 노드 정보 반환"""
-        all_nodes = self.get_all_nodes()
-        for name, info in all_nodes.items():
-            if info['hostname'] == node_name:
-                return info
-        return None
+        self._refresh()
+        return self._nodes.get(node_name)
+    
+    def get_node_by_ip(self, ip):
+        """IP(비공인/공인)로 노드 정보 반환"""
+        self._refresh()
+        return self._nodes_by_ip.get(ip)
     
     def get_private_ips(self):
         """모든 노드의 비공인 IP 리스트 반환"""
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+kubectl watch 스트림 리더
+`kubectl get ... --watch --output-watch-events -o json` 출력을 이벤트 단위로 파싱하여 콜백으로 전달
+"""
+
+import json
+import time
+import threading
+import subprocess
+
+def parse_json_stream(lines):
+    """여러 줄로 출력되는 JSON 객체 스트림을 객체 단위로 분리
+    - kubectl은 객체마다 최상위 닫는 괄호를 한 줄에 단독으로 출력하므로
+      그 시점에만 파싱하여 재파싱 비용이 없도록 함
+    """
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if line.rstrip("\r\n") != "}":
+            continue
+        try:
+            yield json.loads("".join(buffer))
+        except json.JSONDecodeError:
+            continue # 객체가 아직 끝나지 않음
+        buffer = []
+
+class KubeWatch:
+    """리소스 변경 이벤트를 실시간으로 수신
+    - callback(event_type, obj, received_at) 형태로 호출 (received_at: 수신 시각 epoch 초)
+    - kubectl 프로세스가 종료되면 restart_delay 후 다시 연결
+    - 다시 연결할 때 on_resync(items, received_at)가 있으면 먼저 전체 목록을 조회해 전달
+      (연결이 끊긴 사이 삭제된 객체는 DELETED 이벤트가 오지 않으므로 목록 기준으로 정리하도록 함)
+    """
+
+    def __init__(self, resource, callback, namespace=None, all_namespaces=False,
+                 label_selector=None, field_selector=None, watch_only=False,
+                 restart_delay=1.0, on_resync=None):
+        self.resource = resource
+        self.callback = callback
+        self.namespace = namespace
+        self.all_namespaces = all_namespaces
+        self.label_selector = label_selector
+        self.field_selector = field_selector
+        self.watch_only = watch_only
+        self.restart_delay = restart_delay
+        self.on_resync = on_resync
+        self.process = None
+        self.thread = None
+        self._stopped = threading.Event()
+
+    def list_command(self):
+        """kubectl 목록 조회 명령 구성"""
+        cmd = ["kubectl", "get", self.resource]
+        if self.all_namespaces:
+            cmd.append("--all-namespaces")
+        elif self.namespace:
+            cmd += ["-n", self.namespace]
+        if self.label_selector:
+            cmd += ["-l", self.label_selector]
+        if self.field_selector:
+            cmd += ["--field-selector", self.field_selector]
+        return cmd
+
+    def command(self):
+        """kubectl watch 명령 구성"""
+        cmd = self.list_command()
+        cmd.append("--watch-only" if self.watch_only else "--watch")
+        cmd += ["--output-watch-events", "-o", "json"]
+        return cmd
+
+    def resync(self):
+        """전체 목록을 조회해 on_resync로 전달 (실패하면 이번 재연결은 목록 없이 진행)"""
+        try:
+            result = subprocess.run(
+                self.list_command() + ["-o", "json"],
+                capture_output=True,
+                text=True,
+                timeout=60
+            )
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr.strip())
+            items = json.loads(result.stdout).get("items", [])
+        except Exception as e:
+            print(f"watch 재동기화 실패 ({self.resource}): {e}")
+            return
+        try:
+            self.on_resync(items, time.time())
+        except Exception as e:
+            print(f"watch 재동기화 처리 오류 ({self.resource}): {e}")
+
+    def run(self):
+        """watch 실행 (stop() 호출 전까지 블로킹)"""
+        connected = False
+        while not self._stopped.is_set():
+            if connected and self.on_resync:
+                self.resync()
+            connected = True
+            try:
+                self.process = subprocess.Popen(
+                    self.command(),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    bufsize=1
+                )
+                for event in parse_json_stream(self.process.stdout):
+                    received_at = time.time()
+                    if self._stopped.is_set():
+                        break
+                    try:
+                        self.callback(event.get("type", ""), event.get("object", {}), received_at)
+                    except Exception as e:
+                        print(f"watch 이벤트 처리 오류 ({self.resource}): {e}")
+            except Exception as e:
+                print(f"watch 실행 오류 ({self.resource}): {e}")
+            finally:
+                self._terminate()
+            self._stopped.wait(self.restart_delay)
+
+    def start(self):
+        """백그라운드 스레드에서 watch 시작"""
+        self._stopped.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def stop(self):
+        """watch 중지"""
+        self._stopped.set()
+        self._terminate()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=5)
+
+    def _terminate(self):
+        process = self.process
+        if process and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
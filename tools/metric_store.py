@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+노드 지표 시계열 저장소
+노드별 지표를 고정 크기 배열 링 버퍼에 저장하고 10초/1분 단위로 자동 다운샘플링
+(샘플 하나는 타임스탬프 8바이트 + 지표당 4바이트로, 며칠 분량의 시계열이 수 MB 안에 들어감)
+"""
+
+import json
+import math
+import time
+import threading
+import urllib.request
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, defaultdict
+
+# 저장하는 노드 지표 (리소스 샘플 + 클러스터 상태)
+NODE_METRICS = [
+    "cpu_percent",
+    "memory_percent",
+    "load1",
+    "load5",
+    "load15",
+    "psi_cpu_some",
+    "psi_memory_some",
+    "psi_memory_full",
+    "psi_io_some",
+    "psi_io_full",
+    "node_ready",
+    "pod_count",
+    "ready_pods",
+]
+
+# (해상도 이름, 버킷 크기(초, 0이면 원본), 보관 샘플 수)
+TIERS = [
+    ("raw", 0, 3600), # 0.5초 샘플 기준 30분
+    ("10s", 10, 8640), # 1일
+    ("1m", 60, 10080), # 7일
+]
+
+class RingSeries:
+    """고정 용량 링 버퍼 (타임스탬프는 double, 지표는 float 배열)"""
+
+    def __init__(self, capacity, metric_count):
+        self.capacity = capacity
+        self.timestamps = array("d")
+        self.columns = [array("f") for _ in range(metric_count)]
+        self.head = 0 # 가득 찬 뒤 다음에 덮어쓸 위치
+
+    def append(self, timestamp, values):
+        if len(self.timestamps) < self.capacity:
+            self.timestamps.append(timestamp)
+            for column, value in zip(self.columns, values):
+                column.append(value)
+            return
+        self.timestamps[self.head] = timestamp
+        for column, value in zip(self.columns, values):
+            column[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+
+    def _ordered(self, data):
+        return data[self.head:] + data[:self.head] if self.head else data
+
+    def oldest(self):
+        if not self.timestamps:
+            return None
+        return self.timestamps[self.head]
+
+    def range(self, start=None, end=None, indexes=None):
+        """[start, end] 구간의 타임스탬프와 지표 배열"""
+        timestamps = self._ordered(self.timestamps)
+        lo = bisect_left(timestamps, start) if start is not None else 0
+        hi = bisect_right(timestamps, end) if end is not None else len(timestamps)
+        columns = self.columns if indexes is None else [self.columns[i] for i in indexes]
+        return timestamps[lo:hi], [self._ordered(column)[lo:hi] for column in columns]
+
+    def tail(self, count, indexes=None):
+        """가장 최근 count개의 타임스탬프와 지표 배열"""
+        count = max(0, min(count, len(self.timestamps)))
+        timestamps = self._ordered(self.timestamps)
+        lo = len(timestamps) - count
+        columns = self.columns if indexes is None else [self.columns[i] for i in indexes]
+        return timestamps[lo:], [self._ordered(column)[lo:] for column in columns]
+
+    def count(self, start=None, end=None):
+        timestamps = self._ordered(self.timestamps)
+        lo = bisect_left(timestamps, start) if start is not None else 0
+        hi = bisect_right(timestamps, end) if end is not None else len(timestamps)
+        return hi - lo
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def nbytes(self):
+        return sum(a.buffer_info()[1] * a.itemsize for a in (self.timestamps, *self.columns))
+
+class Downsampler:
+    """버킷 단위 평균 계산기 (NaN은 평균에서 제외)"""
+
+    def __init__(self, step, metric_count):
+        self.step = step
+        self.bucket = None
+        self.sums = [0.0] * metric_count
+        self.counts = [0] * metric_count
+
+    def add(self, timestamp, values):
+        """샘플 누적, 버킷이 바뀌면 직전 버킷의 (시작 시각, 평균값) 반환"""
+        bucket = math.floor(timestamp / self.step) * self.step
+        flushed = None
+        if self.bucket is not None and bucket != self.bucket:
+            flushed = (self.bucket, [
+                s / c if c else math.nan for s, c in zip(self.sums, self.counts)
+            ])
+            self.sums = [0.0] * len(self.sums)
+            self.counts = [0] * len(self.counts)
+        self.bucket = bucket
+        for i, value in enumerate(values):
+            if not math.isnan(value):
+                self.sums[i] += value
+                self.counts[i] += 1
+        return flushed
+
+class NodeSeries:
+    """노드 하나의 해상도별 시계열"""
+
+    def __init__(self, tiers, metric_count):
+        self.tiers = OrderedDict(
+            (name, RingSeries(capacity, metric_count)) for name, _, capacity in tiers
+        )
+        self.downsamplers = {
+            name: Downsampler(step, metric_count) for name, step, _ in tiers if step
+        }
+        self.last_timestamp = None
+
+    def append(self, timestamp, values):
+        # 링 버퍼 구간 탐색을 위해 시각이 역행하는 샘플은 직전 시각으로 맞춤
+        if self.last_timestamp is not None and timestamp < self.last_timestamp:
+            timestamp = self.last_timestamp
+        self.last_timestamp = timestamp
+        for name, ring in self.tiers.items():
+            downsampler = self.downsamplers.get(name)
+            if downsampler is None:
+                ring.append(timestamp, values)
+                continue
+            flushed = downsampler.add(timestamp, values)
+            if flushed:
+                ring.append(*flushed)
+
+    def nbytes(self):
+        return sum(ring.nbytes() for ring in self.tiers.values())
+
+class MetricStore:
+    """노드별 지표 시계열 저장소
+    - 링 버퍼는 쓰는 만큼만 커지고, 노드당 최대 크기는 해상도별 보관 샘플 수로 고정
+    - 메모리 예산으로 보관할 수 있는 노드 수를 넘으면 가장 오래 갱신되지 않은 노드를 제거
+    """
+
+    def __init__(self, metrics=None, tiers=None, memory_budget=16 * 1024 * 1024):
+        self.metrics = list(metrics or NODE_METRICS)
+        self.tiers = list(tiers or TIERS)
+        self.index = {metric: i for i, metric in enumerate(self.metrics)}
+        self.memory_budget = memory_budget
+        per_sample = array("d").itemsize + array("f").itemsize * len(self.metrics)
+        self.node_bytes = sum(capacity for _, _, capacity in self.tiers) * per_sample
+        self.max_nodes = max(1, memory_budget // self.node_bytes)
+        self.nodes = OrderedDict() # 노드명 -> NodeSeries (최근 갱신 순)
+        self.lock = threading.Lock()
+
+    def record(self, node, sample, timestamp=None):
+        """샘플 하나 기록 (sample: 지표명 -> 값, 모르는 지표는 무시)"""
+        timestamp = timestamp or sample.get("timestamp") or time.time()
+        values = [math.nan] * len(self.metrics)
+        for metric, value in sample.items():
+            i = self.index.get(metric)
+            if i is not None and value is not None:
+                values[i] = float(value)
+
+        with self.lock:
+            series = self.nodes.get(node)
+            if series is None:
+                if len(self.nodes) >= self.max_nodes:
+                    self.nodes.popitem(last=False)
+                series = self.nodes[node] = NodeSeries(self.tiers, len(self.metrics))
+            else:
+                self.nodes.move_to_end(node)
+            series.append(float(timestamp), values)
+
+    def select_resolution(self, series, start, end, max_points):
+        """구간을 포함하면서 점 개수가 max_points 이하인 가장 세밀한 해상도"""
+        names = list(series.tiers)
+        for name in names:
+            ring = series.tiers[name]
+            oldest = ring.oldest()
+            if oldest is None:
+                continue
+            if start is not None and oldest > start and name != names[-1]:
+                continue # 요청 구간 앞부분이 이미 덮어써짐
+            if ring.count(start, end) <= max_points:
+                return name
+        return names[-1]
+
+    def query(self, node, start=None, end=None, metrics=None, resolution=None, max_points=1000):
+        """노드 지표 구간 조회 (resolution을 지정하지 않으면 자동 선택)"""
+        metrics = metrics or self.metrics
+        unknown = [metric for metric in metrics if metric not in self.index]
+        if unknown:
+            raise ValueError(f"알 수 없는 지표: {', '.join(unknown)}")
+
+        with self.lock:
+            series = self.nodes.get(node)
+            if series is None:
+                return None
+            if resolution is None:
+                resolution = self.select_resolution(series, start, end, max_points)
+            elif resolution not in series.tiers:
+                raise ValueError(f"지원하지 않는 해상도: {resolution}")
+            timestamps, columns = series.tiers[resolution].range(
+                start, end, [self.index[metric] for metric in metrics]
+            )
+
+        return {
+            "node": node,
+            "resolution": resolution,
+            "timestamps": timestamps.tolist(),
+            "series": {
+                metric: [None if math.isnan(v) else round(v, 3) for v in column]
+                for metric, column in zip(metrics, columns)
+            },
+        }
+
+    def node_names(self):
+        with self.lock:
+            return list(self.nodes)
+
+    def memory_usage(self):
+        """현재 사용 중인 배열 메모리(바이트)"""
+        with self.lock:
+            return sum(series.nbytes() for series in self.nodes.values())
+
+    def stats(self):
+        """저장소 상태 요약"""
+        with self.lock:
+            return {
+                "nodes": {
+                    node: {name: len(ring) for name, ring in series.tiers.items()}
+                    for node, series in self.nodes.items()
+                },
+                "memory_bytes": sum(series.nbytes() for series in self.nodes.values()),
+                "memory_budget": self.memory_budget,
+                "max_nodes": self.max_nodes,
+            }
+
+class MetricPublisher:
+    """스크립트에서 수집한 샘플을 API 서버의 지표 저장소로 주기적으로 전송
+    - POST {base_url}/api/v1/metrics/nodes/{node}로 노드별 샘플을 묶어서 보냄
+    """
+
+    def __init__(self, base_url, interval=5.0, max_pending=10000):
+        self.base_url = base_url.rstrip("/")
+        self.interval = interval
+        self.max_pending = max_pending
+        self.pending = defaultdict(list)
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def add(self, node, sample):
+        with self.lock:
+            queue = self.pending[node]
+            queue.append(sample)
+            if len(queue) > self.max_pending:
+                del queue[:len(queue) - self.max_pending] # 서버가 응답하지 않으면 오래된 샘플부터 버림
+
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, defaultdict(list)
+        for node, samples in pending.items():
+            if not samples:
+                continue
+            request = urllib.request.Request(
+                f"{self.base_url}/api/v1/metrics/nodes/{node}",
+                data=json.dumps({"samples": samples}).encode(),
+                headers={"Content-Type": "application/json"},
+                method="POST"
+            )
+            try:
+                urllib.request.urlopen(request, timeout=10).close()
+            except Exception as e:
+                print(f"지표 전송 실패: {node} - {e}")
+                with self.lock:
+                    self.pending[node][:0] = samples
+
+    def _loop(self):
+        while not self.stop_event.wait(self.interval):
+            self.flush()
+
+    def start(self):
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+        self.flush()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+테스트 결과 저장소
+통합 테스트, 격리 작업, 매트릭스 실험 결과를 SQLite 파일에 저장하고
+필터 조회와 방법/노드/시간 구간별 집계를 SQL로 계산
+"""
+
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import datetime
+
+# 기본 결과 DB (스크립트와 API 서버가 같은 파일을 공유)
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "results" / "test_results.db"
+
+# 숫자 지표 열 (집계 대상)
+METRIC_COLUMNS = ["migration_count", "migration_time", "detection_time", "recovery_time", "convergence_time"]
+
+# 집계 기준 -> SQL 식
+GROUP_EXPRESSIONS = {
+    "method": "method",
+    "node": "node_name",
+    "kind": "kind",
+    "window": "CAST(started_at / :window AS INTEGER) * :window",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS test_results (
+    test_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    node_name TEXT NOT NULL,
+    method TEXT NOT NULL,
+    duration INTEGER,
+    started_at REAL NOT NULL,
+    completed_at REAL,
+    success INTEGER NOT NULL,
+    migration_count INTEGER NOT NULL DEFAULT 0,
+    migration_time REAL,
+    detection_time REAL,
+    recovery_time REAL,
+    convergence_time REAL,
+    error_message TEXT,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_started ON test_results (started_at);
+CREATE INDEX IF NOT EXISTS idx_results_method ON test_results (method, started_at);
+CREATE INDEX IF NOT EXISTS idx_results_node ON test_results (node_name, started_at);
+"""
+
+def to_epoch(value):
+    """datetime/ISO 문자열/epoch 초를 epoch 초로 변환"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp()
+
+class TestResultStore:
+    """SQLite 테스트 결과 저장소
+    - 연결 하나를 잠금으로 공유 (WAL 모드라 다른 프로세스의 읽기와 동시에 쓸 수 있음)
+    - 파일과 연결은 첫 저장/조회 때 생성 (가져오기만 해서는 results/ 디렉토리를 만들지 않음)
+    - 필터와 집계는 모두 인덱스를 타는 SQL로 처리하고 백분위수는 윈도 함수로 계산
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or DEFAULT_DB_PATH)
+        self.conn = None
+        self.lock = threading.Lock()
+
+    def _connect(self):
+        """연결 반환 (처음이면 파일과 스키마 생성, self.lock을 잡은 상태에서 호출)"""
+        if self.conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+            conn.row_factory = sqlite3.Row
+            with conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA)
+            self.conn = conn
+        return self.conn
+
+    def save(self, result):
+        """결과 저장 (같은 test_id는 덮어씀)
+        - 필수: test_id, kind, node_name, method, started_at, success
+        - details: 그 밖의 원본 데이터 (JSON으로 저장)
+        """
+        row = {
+            'test_id': result['test_id'],
+            'kind': result['kind'],
+            'node_name': result['node_name'],
+            'method': result['method'],
+            'duration': result.get('duration'),
+            'started_at': to_epoch(result['started_at']),
+            'completed_at': to_epoch(result.get('completed_at')),
+            'success': int(bool(result['success'])),
+            'migration_count': result.get('migration_count') or 0,
+            'migration_time': result.get('migration_time'),
+            'detection_time': result.get('detection_time'),
+            'recovery_time': result.get('recovery_time'),
+            'convergence_time': result.get('convergence_time'),
+            'error_message': result.get('error_message'),
+            'details': json.dumps(result.get('details'), ensure_ascii=False, default=str) if result.get('details') else None,
+        }
+        columns = ", ".join(row)
+        placeholders = ", ".join(f":{key}" for key in row)
+        with self.lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(f"INSERT OR REPLACE INTO test_results ({columns}) VALUES ({placeholders})", row)
+
+    @staticmethod
+    def _where(method=None, node_name=None, kind=None, success=None, since=None, until=None):
+        clauses, params = [], {}
+        for column, value in (("method", method), ("node_name", node_name), ("kind", kind)):
+            if value is not None:
+                clauses.append(f"{column} = :{column}")
+                params[column] = value
+        if success is not None:
+            clauses.append("success = :success")
+            params['success'] = int(success)
+        if since is not None:
+            clauses.append("started_at >= :since")
+            params['since'] = to_epoch(since)
+        if until is not None:
+            clauses.append("started_at < :until")
+            params['until'] = to_epoch(until)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    @staticmethod
+    def _to_dict(row):
+        result = dict(row)
+        result['success'] = bool(result['success'])
+        result['started_at'] = datetime.fromtimestamp(result['started_at'])
+        if result['completed_at'] is not None:
+            result['completed_at'] = datetime.fromtimestamp(result['completed_at'])
+        result['details'] = json.loads(result['details']) if result['details'] else None
+        return result
+
+    def get(self, test_id):
+        with self.lock:
+            row = self._connect().execute("SELECT * FROM test_results WHERE test_id = ?", (test_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def query(self, limit=100, offset=0, include_details=False, **filters):
+        """조건에 맞는 결과를 최근 순으로 조회, (결과 목록, 전체 개수) 반환"""
+        where, params = self._where(**filters)
+        # 목록 조회에서는 큰 details 열을 읽지 않음
+        columns = "*" if include_details else ", ".join(
+            ["test_id", "kind", "node_name", "method", "duration", "started_at", "completed_at", "success",
+             *METRIC_COLUMNS, "error_message", "NULL AS details"]
+        )
+        with self.lock:
+            conn = self._connect()
+            total = conn.execute(f"SELECT COUNT(*) FROM test_results{where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {columns} FROM test_results{where} ORDER BY started_at DESC LIMIT :limit OFFSET :offset",
+                {**params, 'limit': limit, 'offset': offset}
+            ).fetchall()
+        return [self._to_dict(row) for row in rows], total
+
+    def aggregate(self, group_by=("method",), window=3600, metrics=METRIC_COLUMNS, percentiles=(50, 90), **filters):
+        """그룹별 실행 수, 성공 수, 지표별 평균/최소/최대/백분위수
+        - group_by: method, node, kind, window 조합 (window는 started_at을 window초 단위로 묶음)
+        - 백분위수는 nearest-rank 방식 (그룹 안에서 정렬한 순위가 처음으로 q% 이상이 되는 값)
+        """
+        unknown = [key for key in group_by if key not in GROUP_EXPRESSIONS]
+        if unknown:
+            raise ValueError(f"지원하지 않는 집계 기준: {', '.join(unknown)}")
+        unknown = [metric for metric in metrics if metric not in METRIC_COLUMNS]
+        if unknown:
+            raise ValueError(f"지원하지 않는 지표: {', '.join(unknown)}")
+
+        where, params = self._where(**filters)
+        params['window'] = max(1, int(window))
+        keys = [f"{GROUP_EXPRESSIONS[key]} AS g_{key}" for key in group_by]
+        group_columns = [f"g_{key}" for key in group_by]
+        group_list = ", ".join(group_columns) or "NULL"
+
+        basic = ", ".join(
+            f"AVG({m}) AS {m}_mean, MIN({m}) AS {m}_min, MAX({m}) AS {m}_max, COUNT({m}) AS {m}_count"
+            for m in metrics
+        )
+        with self.lock:
+            conn = self._connect()
+            rows = conn.execute(
+                f"SELECT {', '.join(keys + [''])}COUNT(*) AS runs, SUM(success) AS success, "
+                f"MIN(started_at) AS first_started, MAX(started_at) AS last_started, {basic} "
+                f"FROM test_results{where} GROUP BY {group_list} ORDER BY {group_list}",
+                params
+            ).fetchall()
+            percentile_rows = {}
+            for metric in metrics:
+                partition = f"PARTITION BY {group_list}" if group_by else ""
+                cases = ", ".join(
+                    f"MIN(CASE WHEN rn >= n * {q / 100.0} THEN {metric} END) AS p{q}" for q in percentiles
+                )
+                ranked = conn.execute(
+                    f"WITH grouped AS (SELECT {', '.join(keys + [''])}{metric} FROM test_results{where}"
+                    f"{' AND ' if where else ' WHERE '}{metric} IS NOT NULL), "
+                    f"ranked AS (SELECT *, ROW_NUMBER() OVER ({partition} ORDER BY {metric}) AS rn, "
+                    f"COUNT(*) OVER ({partition}) AS n FROM grouped) "
+                    f"SELECT {', '.join(group_columns + [''])}{cases} FROM ranked GROUP BY {group_list}",
+                    params
+                ).fetchall()
+                for row in ranked:
+                    key = tuple(row[column] for column in group_columns)
+                    percentile_rows.setdefault(key, {})[metric] = {f"p{q}": row[f"p{q}"] for q in percentiles}
+
+        groups = []
+        for row in rows:
+            key = tuple(row[column] for column in group_columns)
+            item = {name: row[f"g_{name}"] for name in group_by}
+            if "window" in item:
+                item['window'] = datetime.fromtimestamp(item['window'])
+            item.update({
+                'runs': row['runs'],
+                'success': row['success'] or 0,
+                'first_started': datetime.fromtimestamp(row['first_started']),
+                'last_started': datetime.fromtimestamp(row['last_started']),
+                'metrics': {
+                    metric: {
+                        'count': row[f"{metric}_count"],
+                        'mean': row[f"{metric}_mean"],
+                        'min': row[f"{metric}_min"],
+                        'max': row[f"{metric}_max"],
+                        **percentile_rows.get(key, {}).get(metric, {f"p{q}": None for q in percentiles}),
+                    }
+                    for metric in metrics
+                },
+            })
+            groups.append(item)
+        return groups
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+def new_test_id(prefix):
+    """스크립트 실행별 결과 ID"""
+    return f"{prefix}-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{int(time.time() * 1000) % 1000:03d}"
+
+def timeline_metrics(timeline):
+    """IsolationTimeline.to_dict() 결과를 저장소 지표 열로 변환"""
+    durations = timeline.get('durations') or {}
+    return {
+        'migration_count': timeline.get('replaced_pods') or 0,
+        'detection_time': durations.get('detection'),
+        'migration_time': durations.get('rescheduling'),
+        'recovery_time': durations.get('recovery'),
+    }
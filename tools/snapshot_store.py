@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+프로세스 간 스냅샷 공유
+한 프로세스가 이름별 JSON 스냅샷을 공유 메모리 디렉토리(/dev/shm)에 원자적으로 기록하고
+여러 프로세스가 파일이 바뀌었을 때만 다시 읽어 같은 상태를 공유
+"""
+
+import os
+import json
+import threading
+from pathlib import Path
+
+class SnapshotWriter:
+    """이름별 스냅샷 기록
+    - 임시 파일에 쓴 뒤 rename하므로 읽는 쪽은 항상 완성된 파일만 봄
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, name):
+        return self.directory / f"{name}.json"
+
+    def publish(self, name, data):
+        path = self.path(name)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"), default=str)
+        os.replace(tmp, path)
+
+    def remove(self, name):
+        try:
+            self.path(name).unlink()
+        except FileNotFoundError:
+            pass
+
+    def clear(self, prefixes):
+        """prefix로 시작하는 스냅샷과 중단된 기록의 임시 파일만 삭제 (디렉토리의 다른 파일은 그대로 둠)"""
+        paths = [path for prefix in prefixes for path in self.directory.glob(f"{prefix}*.json")]
+        paths += self.directory.glob(".*.json.*.tmp")
+        for path in paths:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+class SnapshotReader:
+    """스냅샷 읽기
+    - 요청마다 stat만 하고 (mtime, 크기, inode)가 바뀐 경우에만 파일을 다시 파싱
+    - rename으로 교체되므로 inode 비교만으로도 같은 시각 안의 변경을 구분
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.cache = {} # 이름 -> (버전, 데이터)
+        self.lock = threading.Lock()
+
+    def version(self, name):
+        """파일 버전 (없으면 None)"""
+        try:
+            st = os.stat(self.directory / f"{name}.json")
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def get(self, name, default=None):
+        version = self.version(name)
+        if version is None:
+            return default
+        with self.lock:
+            cached = self.cache.get(name)
+            if cached and cached[0] == version:
+                return cached[1]
+        try:
+            with open(self.directory / f"{name}.json", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return default # 읽는 사이 교체/삭제됨
+        with self.lock:
+            self.cache[name] = (version, data)
+        return data
+
+    def names(self, prefix=""):
+        """prefix로 시작하는 스냅샷 이름 목록"""
+        return sorted(
+            path.name[:-len(".json")]
+            for path in self.directory.glob(f"{prefix}*.json")
+        )
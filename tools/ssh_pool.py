@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+SSH 연결 풀
+노드별로 OpenSSH ControlMaster 세션을 유지하여 원격 명령마다 핸드셰이크하지 않도록 함
+"""
+
+import os
+import time
+import atexit
+import asyncio
+import tempfile
+import threading
+import subprocess
+
+# 모든 SSH 호출에 공통으로 붙는 옵션
+COMMON_SSH_OPTIONS = [
+    "-o", "StrictHostKeyChecking=no",
+    "-o", "UserKnownHostsFile=/dev/null",
+    "-o", "LogLevel=ERROR",
+]
+
+class SSHConnection:
+    """노드 하나에 대한 영구 마스터 세션
+    - 마스터 프로세스가 인증을 한 번만 수행하고 이후 명령은 채널만 새로 연다
+    """
+
+    def __init__(self, host, user, port=22, password=None, control_dir=None, connect_timeout=10):
+        self.host = host
+        self.user = user
+        self.port = int(port)
+        self.password = password
+        self.connect_timeout = connect_timeout
+        self.control_path = os.path.join(control_dir, f"{user}@{host}:{self.port}")
+        self.master = None # 마스터 ssh 프로세스
+        self.last_used = 0.0
+        self.last_checked = 0.0
+        self.active = 0 # 이 세션으로 실행 중인 채널 수 (0보다 크면 유휴 정리 대상 아님)
+        self.failed_at = None # 마지막 마스터 연결 실패 시각 (재시도 대기용)
+        self.lock = threading.Lock()
+
+    @property
+    def target(self):
+        return f"{self.user}@{self.host}"
+
+    def direct_command(self, command):
+        """멀티플렉싱 없이 실행하는 명령 (마스터를 띄울 수 없을 때 사용)"""
+        cmd = []
+        if self.password:
+            cmd += ["sshpass", "-p", self.password]
+        cmd += ["ssh", *COMMON_SSH_OPTIONS, "-p", str(self.port), self.target]
+        if command is not None:
+            cmd.append(command)
+        return cmd
+
+    def mux_command(self, command):
+        """마스터 세션을 재사용하는 명령"""
+        return [
+            "ssh", *COMMON_SSH_OPTIONS,
+            "-o", "BatchMode=yes",
+            "-o", "ControlMaster=no",
+            "-o", f"ControlPath={self.control_path}",
+            "-p", str(self.port),
+            self.target,
+            command,
+        ]
+
+    def acquire_channel(self):
+        with self.lock:
+            self.active += 1
+
+    def release_channel(self):
+        with self.lock:
+            self.active -= 1
+            self.last_used = time.monotonic()
+
+    def is_alive(self):
+        """마스터 프로세스 생존 여부 (프로세스 상태만 확인하므로 비용 없음)"""
+        return (
+            self.master is not None
+            and self.master.poll() is None
+            and os.path.exists(self.control_path)
+        )
+
+    def health_check(self):
+        """마스터 세션에 실제로 채널을 열 수 있는지 확인"""
+        if not self.is_alive():
+            return False
+        result = subprocess.run(
+            ["ssh", "-o", f"ControlPath={self.control_path}", "-O", "check",
+             "-p", str(self.port), self.target],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=self.connect_timeout
+        )
+        self.last_checked = time.monotonic()
+        return result.returncode == 0
+
+    def connect(self):
+        """마스터 세션 시작"""
+        self.close()
+        cmd = self.direct_command(None)
+        # 대상 앞에 마스터 옵션 삽입
+        cmd[-1:-1] = [
+            "-M", "-N",
+            "-o", "ControlMaster=yes",
+            "-o", f"ControlPath={self.control_path}",
+            "-o", "ControlPersist=no",
+            "-o", f"ConnectTimeout={self.connect_timeout}",
+            "-o", "ServerAliveInterval=15",
+            "-o", "ServerAliveCountMax=3",
+        ]
+        try:
+            self.master = subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+        except FileNotFoundError as e:
+            print(f"SSH 마스터 세션 시작 실패: {self.host} - {e}")
+            self.master = None
+            return False
+
+        # 제어 소켓이 생길 때까지 대기
+        deadline = time.monotonic() + self.connect_timeout
+        while time.monotonic() < deadline:
+            if os.path.exists(self.control_path):
+                self.last_checked = time.monotonic()
+                return True
+            if self.master.poll() is not None:
+                break
+            time.sleep(0.05)
+
+        print(f"SSH 마스터 세션 연결 실패: {self.host}")
+        self.close()
+        return False
+
+    def close(self):
+        """마스터 세션 종료"""
+        if self.master is None:
+            return
+        if self.master.poll() is None:
+            subprocess.run(
+                ["ssh", "-o", f"ControlPath={self.control_path}", "-O", "exit",
+                 "-p", str(self.port), self.target],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+            try:
+                self.master.terminate()
+                self.master.wait(timeout=5)
+            except Exception:
+                self.master.kill()
+        self.master = None
+
+class SSHConnectionPool:
+    """노드별 SSH 마스터 세션 풀
+    - 사용 시점에 세션이 없으면 생성하고, 일정 주기로 상태를 점검
+    - idle_timeout 동안 쓰이지 않고 실행 중인 채널도 없는 세션은 정리 스레드가 종료
+    - 마스터 연결에 실패한 노드는 reconnect_backoff초 동안 다시 연결하지 않고 바로 직접 연결 명령 사용
+      (격리 중인 노드처럼 응답하지 않는 노드에 명령마다 connect_timeout씩 막히지 않도록 함)
+    """
+
+    def __init__(self, idle_timeout=300, health_check_interval=30, connect_timeout=10, reconnect_backoff=30):
+        self.idle_timeout = idle_timeout
+        self.reconnect_backoff = reconnect_backoff
+        self.health_check_interval = health_check_interval
+        self.connect_timeout = connect_timeout
+        self._connections = {}
+        self._lock = threading.Lock()
+        self._control_dir = None
+        self._reaper = None
+        self._closed = threading.Event()
+
+    def _ensure_reaper(self):
+        """유휴 세션 정리 스레드 시작"""
+        if self._reaper is None or not self._reaper.is_alive():
+            self._reaper = threading.Thread(target=self._reap_loop, daemon=True)
+            self._reaper.start()
+
+    def _reap_loop(self):
+        interval = max(1, min(self.idle_timeout, 60) / 2)
+        while not self._closed.wait(interval):
+            self.evict_idle()
+
+    def get(self, host, user="root", port=22, password=None):
+        """노드에 대한 연결 반환 (없거나 죽었으면 다시 연결)"""
+        key = (user, host, int(port))
+        with self._lock:
+            if self._control_dir is None:
+                self._control_dir = tempfile.mkdtemp(prefix="iso-ssh-")
+            conn = self._connections.get(key)
+            if conn is None:
+                conn = SSHConnection(
+                    host, user, port, password,
+                    control_dir=self._control_dir,
+                    connect_timeout=self.connect_timeout
+                )
+                self._connections[key] = conn
+            self._ensure_reaper()
+
+        with conn.lock:
+            conn.password = password or conn.password
+            now = time.monotonic()
+            if not conn.is_alive():
+                self._reconnect(conn, now)
+            elif now - conn.last_checked >= self.health_check_interval:
+                if not conn.health_check():
+                    print(f"SSH 세션 상태 점검 실패, 재연결: {host}")
+                    self._reconnect(conn, now)
+            conn.last_used = now
+        return conn
+
+    def _reconnect(self, conn, now):
+        """마스터 재연결 (최근에 실패했으면 대기 시간이 지날 때까지 건너뜀)"""
+        if conn.failed_at is not None and now - conn.failed_at < self.reconnect_backoff:
+            conn.close()
+            return
+        conn.failed_at = None if conn.connect() else time.monotonic()
+
+    def build_command(self, host, command, user="root", port=22, password=None):
+        """원격 명령 실행용 argv 생성 (세션이 없으면 직접 연결 명령으로 대체)"""
+        return self._command(self.get(host, user, port, password), command)
+
+    def _command(self, conn, command):
+        if conn.is_alive():
+            return conn.mux_command(command)
+        return conn.direct_command(command)
+
+    @staticmethod
+    def _mux_failed(conn, cmd, returncode):
+        """멀티플렉싱 채널 자체가 실패했는지 (ssh 오류 코드 255이고 그 사이 마스터가 종료됨)
+        - mux 명령은 BatchMode라 마스터가 없으면 비밀번호 인증으로 넘어가지 못하므로 직접 연결로 한 번 재시도
+        """
+        return returncode == 255 and "ControlMaster=no" in cmd and not conn.is_alive()
+
+    def run(self, host, command, user="root", port=22, password=None, timeout=None):
+        """원격 명령 실행 후 결과 반환"""
+        conn = self.get(host, user, port, password)
+        conn.acquire_channel()
+        try:
+            cmd = self._command(conn, command)
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+            if self._mux_failed(conn, cmd, result.returncode):
+                result = subprocess.run(conn.direct_command(command), capture_output=True, text=True, timeout=timeout)
+            return result
+        finally:
+            conn.release_channel()
+
+    async def run_async(self, host, command, user="root", port=22, password=None, timeout=None):
+        """원격 명령을 asyncio 서브프로세스로 실행 (여러 노드에 동시에 실행할 때 사용)"""
+        # 마스터 세션 연결은 블로킹이므로 스레드에서 처리하여 노드별 연결도 병렬로 진행
+        conn = await asyncio.to_thread(self.get, host, user, port, password)
+        cmd = self._command(conn, command)
+        conn.acquire_channel()
+        try:
+            result = await self._exec_async(cmd, timeout)
+            if self._mux_failed(conn, cmd, result.returncode):
+                result = await self._exec_async(conn.direct_command(command), timeout)
+        finally:
+            conn.release_channel()
+        return result
+
+    @staticmethod
+    async def _exec_async(cmd, timeout):
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        return subprocess.CompletedProcess(
+            cmd, process.returncode,
+            stdout.decode(errors="replace"),
+            stderr.decode(errors="replace")
+        )
+
+    def popen(self, host, command, user="root", port=22, password=None, **kwargs):
+        """원격 명령을 백그라운드 프로세스로 실행 (프로세스가 끝날 때까지 세션을 유지)"""
+        conn = self.get(host, user, port, password)
+        conn.acquire_channel()
+        try:
+            process = subprocess.Popen(self._command(conn, command), **kwargs)
+        except Exception:
+            conn.release_channel()
+            raise
+        threading.Thread(target=self._watch_channel, args=(conn, process), daemon=True).start()
+        return process
+
+    @staticmethod
+    def _watch_channel(conn, process):
+        """백그라운드 채널 종료 시 실행 중 채널 수 감소"""
+        try:
+            process.wait()
+        finally:
+            conn.release_channel()
+
+    def evict_idle(self):
+        """유휴 시간이 지난 세션 종료"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                key for key, conn in self._connections.items()
+                if conn.active == 0 and now - conn.last_used >= self.idle_timeout
+            ]
+            evicted = [self._connections.pop(key) for key in expired]
+        for conn in evicted:
+            with conn.lock:
+                conn.close()
+        return len(evicted)
+
+    def close_all(self):
+        """모든 세션 종료"""
+        self._closed.set()
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            with conn.lock:
+                conn.close()
+
+    def stats(self):
+        """풀 상태 요약"""
+        with self._lock:
+            return {
+                f"{user}@{host}:{port}": {
+                    "alive": conn.is_alive(),
+                    "active_channels": conn.active,
+                    "idle_seconds": round(time.monotonic() - conn.last_used, 1),
+                }
+                for (user, host, port), conn in self._connections.items()
+            }
+
+# 프로세스 전역 풀
+ssh_pool = SSHConnectionPool()
+atexit.register(ssh_pool.close_all)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+통계 유틸리티
+측정값 목록의 백분위수 및 요약 통계 계산
+"""
+
+import math
+
+def percentile(values, q):
+    """백분위수 계산 (선형 보간, q: 0~100)"""
+    data = sorted(v for v in values if v is not None)
+    if not data:
+        return None
+    if len(data) == 1:
+        return data[0]
+    rank = (len(data) - 1) * q / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return data[low]
+    return data[low] + (data[high] - data[low]) * (rank - low)
+
+def summarize(values, percentiles=(50, 90, 99)):
+    """개수/최소/최대/평균 및 백분위수 요약"""
+    data = sorted(v for v in values if v is not None)
+    summary = {
+        "count": len(data),
+        "min": data[0] if data else None,
+        "max": data[-1] if data else None,
+        "mean": sum(data) / len(data) if data else None,
+    }
+    for q in percentiles:
+        summary[f"p{q}"] = percentile(data, q)
+    return summary
+
+def tracking_error(values, target, tolerance):
+    """목표값 대비 추종 오차 (평균 절대 오차, RMSE, 허용 오차 내 비율)"""
+    data = [v for v in values if v is not None]
+    if not data:
+        return {"count": 0, "mean": None, "mae": None, "rmse": None, "max_abs_error": None, "within_tolerance": None}
+    errors = [v - target for v in data]
+    return {
+        "count": len(data),
+        "mean": sum(data) / len(data),
+        "mae": sum(abs(e) for e in errors) / len(errors),
+        "rmse": math.sqrt(sum(e * e for e in errors) / len(errors)),
+        "max_abs_error": max(abs(e) for e in errors),
+        "within_tolerance": 100.0 * sum(1 for e in errors if abs(e) <= tolerance) / len(errors),
+    }
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+kubectl watch 스트림 기록/재생
+노드, 파드, 이벤트 스트림을 수신 시각과 함께 gzip 압축 JSON Lines로 기록하고
+기록된 로그를 원래 속도, 배속 또는 최대 속도로 같은 처리 로직에 다시 전달
+"""
+
+import gzip
+import json
+import time
+import zlib
+import threading
+from pathlib import Path
+
+# 분석에 쓰이지 않으면서 용량이 큰 필드
+LAST_APPLIED = "kubectl.kubernetes.io/last-applied-configuration"
+
+def compact(obj):
+    """기록용으로 managedFields, last-applied 주석, 노드 이미지 목록을 제거한 사본"""
+    metadata = obj.get('metadata')
+    status = obj.get('status')
+    if not metadata and not status:
+        return obj
+    obj = dict(obj)
+    if metadata:
+        metadata = {key: value for key, value in metadata.items() if key != 'managedFields'}
+        annotations = metadata.get('annotations')
+        if annotations and LAST_APPLIED in annotations:
+            metadata['annotations'] = {k: v for k, v in annotations.items() if k != LAST_APPLIED}
+        obj['metadata'] = metadata
+    if isinstance(status, dict) and 'images' in status:
+        obj['status'] = {key: value for key, value in status.items() if key != 'images'}
+    return obj
+
+class StreamRecorder:
+    """watch 이벤트와 목록 조회 결과를 한 파일에 기록
+    - 한 줄 형식: {"t": 수신 시각, "s": 스트림(pods/nodes/events), "e": 이벤트 종류, "o": 객체}
+    - 목록 조회(주기 조회 모드)는 "e": "LIST", "o": {"items": [...]}로 기록
+    - watch 재연결 시의 목록 조회는 "e": "RESYNC"로 같은 형식으로 기록
+    - 첫 줄은 "s": "meta" 로 기록 범위 등 부가 정보를 담음
+    - flush_interval초마다 압축 스트림을 비워 중단되어도 그때까지의 기록은 읽을 수 있음
+    - 기록 파일 하나에 실행 하나만 담도록 이미 있는 파일에는 이어 쓰지 않음 (FileExistsError)
+    """
+
+    def __init__(self, path, meta=None, flush_interval=5.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = gzip.open(self.path, 'xt', encoding='utf-8')
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.count = 0
+        self.last_flush = time.time()
+        self.write("meta", "START", meta or {}, self.last_flush)
+
+    def write(self, stream, event_type, obj, ts):
+        line = json.dumps({"t": round(ts, 3), "s": stream, "e": event_type, "o": obj},
+                          ensure_ascii=False, separators=(",", ":"))
+        with self.lock:
+            self.file.write(line + "\n")
+            self.count += 1
+            if ts - self.last_flush >= self.flush_interval:
+                self.file.flush()
+                self.last_flush = ts
+
+    def record(self, stream, event_type, obj, ts):
+        self.write(stream, event_type, compact(obj), ts)
+
+    def record_list(self, stream, items, ts, event_type="LIST"):
+        self.write(stream, event_type, {"items": [compact(item) for item in items]}, ts)
+
+    def wrap(self, stream, callback=None):
+        """KubeWatch 콜백을 감싸 기록 후 원래 콜백으로 전달"""
+        def handler(event_type, obj, ts):
+            self.record(stream, event_type, obj, ts)
+            if callback:
+                return callback(event_type, obj, ts)
+            return None
+        return handler
+
+    def wrap_resync(self, stream, callback):
+        """KubeWatch on_resync 콜백을 감싸 목록을 RESYNC로 기록 후 원래 콜백으로 전달"""
+        def handler(items, ts):
+            self.record_list(stream, items, ts, "RESYNC")
+            return callback(items, ts)
+        return handler
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+def read_stream_log(path):
+    """기록된 로그를 줄 단위로 읽음 (기록 중 중단되어 끝이 잘린 파일도 읽을 수 있는 데까지 반환)"""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        try:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    return # 마지막 줄이 잘림
+        except (EOFError, zlib.error, gzip.BadGzipFile):
+            return
+
+def replay_stream_log(path, callback, speed=None, streams=None):
+    """기록을 callback(stream, event_type, obj, ts)로 다시 전달
+    - speed: 재생 배속 (None 또는 0이면 대기 없이 최대 속도)
+    - streams: 재생할 스트림 이름 집합 (기본: 전체)
+    - ts는 기록된 수신 시각 그대로 전달되므로 소요 시간 계산은 원래 실행과 같음
+    """
+    started = time.monotonic()
+    first = None
+    stats = {'records': 0, 'start': None, 'end': None}
+
+    for record in read_stream_log(path):
+        stream = record["s"]
+        if stream == "meta" or (streams and stream not in streams):
+            continue
+        ts = record["t"]
+        if first is None:
+            first = stats['start'] = ts
+        if speed:
+            delay = (ts - first) / speed - (time.monotonic() - started)
+            if delay > 0:
+                time.sleep(delay)
+        callback(stream, record["e"], record["o"], ts)
+        stats['records'] += 1
+        stats['end'] = ts
+
+    stats['recorded_seconds'] = round(stats['end'] - stats['start'], 3) if stats['records'] else 0.0
+    stats['elapsed_seconds'] = round(time.monotonic() - started, 3)
+    return stats
+
+def read_meta(path):
+    """기록 시작 시 저장한 부가 정보"""
+    for record in read_stream_log(path):
+        if record["s"] == "meta":
+            return record["o"]
+        break
+    return {}